@@ -8,13 +8,15 @@ import pandas as pd
 import json
 import os
 from datetime import datetime
-import time
 import plotly.graph_objects as go
 
 from screener import StockScreener
 from data_collector import DataCollector
 from main import IntelligenceHub
 from report_manager import ExpertReportManager
+from price_store import get_price_store
+from price_cube import get_price_cube
+from tracing import span, get_tracer
 
 # 페이지 설정
 st.set_page_config(
@@ -88,9 +90,10 @@ def run_screener():
 def create_stock_mini_chart(ticker: str):
     """미니 주가 차트 생성"""
     try:
-        import yfinance as yf
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period="1mo")
+        # 공유 가격 큐브 우선 조회, 없으면 로컬 저장소 경유 (스크리닝 직후에는 네트워크 요청 없음)
+        hist = get_price_cube().history(ticker, period_days=31)
+        if hist is None:
+            hist = get_price_store().get_history(ticker, period_days=31)
 
         if len(hist) == 0:
             return None
@@ -123,52 +126,50 @@ def create_stock_mini_chart(ticker: str):
 
 def analyze_stock(ticker: str, company_name: str):
     """종목 비판적 분석 실행"""
+    with span("app.analyze", ticker=ticker) as root:
+        st.session_state.last_trace_id = root.trace_id
 
-    # 1단계: 데이터 수집
-    st.markdown("### [DATA] 1단계: 데이터 수집")
-    progress_bar = st.progress(0)
-    status = st.empty()
+        # 1단계: 데이터 수집
+        st.markdown("### [DATA] 1단계: 데이터 수집")
+        progress_bar = st.progress(0)
+        status = st.empty()
 
-    status.info("[SEARCH] 주가, 뉴스, 공시 데이터를 수집하고 있습니다...")
+        status.info("[SEARCH] 주가, 뉴스, 공시 데이터를 수집하고 있습니다...")
 
-    try:
-        collector = DataCollector()
-        data_result = collector.collect_all_data(ticker)
-
-        progress_bar.progress(33)
-        status.success("[OK] 데이터 수집 완료")
-
-        # 수집 결과 요약
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("주가 데이터", f"{len(data_result['stock_data'].get('data', []))}일")
-        with col2:
-            st.metric("뉴스", f"{len(data_result['news'])}건")
-        with col3:
-            st.metric("공시", f"{len(data_result['disclosures'])}건")
+        try:
+            collector = DataCollector()
+            data_result, data_file = collector.collect_snapshot(ticker)
 
-        time.sleep(1)
+            progress_bar.progress(33)
+            status.success("[OK] 데이터 수집 완료")
 
-        # 2단계: AI 비판적 분석
-        st.markdown("### [AI] 2단계: AI 비판적 분석")
-        status.info("[AI] AI 분석관이 공시와 뉴스를 대조 중입니다...")
-        progress_bar.progress(66)
-
-        hub = IntelligenceHub()
-
-        # 최신 데이터 파일 찾기
-        import glob
-        data_dir = os.path.join(os.path.dirname(__file__), 'data')
-        json_files = glob.glob(os.path.join(data_dir, f"data_{ticker.replace('.', '_')}*.json"))
-
-        if json_files:
-            latest_file = max(json_files, key=os.path.getmtime)
-            analysis_result = hub.analyze_with_reliability(latest_file)
-
-            progress_bar.progress(100)
-            status.success("[OK] 비판적 분석 완료!")
+            # 수집 결과 요약
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("주가 데이터", f"{len(data_result['stock_data'].get('data', []))}일")
+            with col2:
+                st.metric("뉴스", f"{len(data_result['news'])}건")
+            with col3:
+                st.metric("공시", f"{len(data_result['disclosures'])}건")
+
+            # 2단계: AI 비판적 분석
+            st.markdown("### [AI] 2단계: AI 비판적 분석")
+            status.info("[AI] AI 분석관이 공시와 뉴스를 대조 중입니다...")
+            progress_bar.progress(66)
+
+            hub = IntelligenceHub()
+
+            # 수집 결과를 메모리에서 바로 분석 (분석 텍스트를 생성되는 대로 표시)
+            # 스트림은 이 자리에서 끝까지 소비해 완성된 결과만 세션에 저장
+            with span("analyze", ticker=ticker):
+                analysis_stream = hub.stream_analysis(
+                    data_result,
+                    use_cache=st.session_state.get('use_llm_cache', True),
+                    source_file=data_file
+                )
+                st.write_stream(analysis_stream)
+                analysis_result = analysis_stream.result
 
-            time.sleep(0.5)
             progress_bar.empty()
             status.empty()
 
@@ -176,14 +177,11 @@ def analyze_stock(ticker: str, company_name: str):
                 'data': data_result,
                 'analysis': analysis_result
             }
-        else:
-            st.error("[ERROR] 데이터 파일을 찾을 수 없습니다.")
-            return None
 
-    except Exception as e:
-        status.error(f"[ERROR] 분석 중 오류 발생: {str(e)}")
-        st.exception(e)
-        return None
+        except Exception as e:
+            status.error(f"[ERROR] 분석 중 오류 발생: {str(e)}")
+            st.exception(e)
+            return None
 
 
 def display_analysis_result(result, ticker, company_name):
@@ -365,14 +363,16 @@ def display_analysis_result(result, ticker, company_name):
                         )
 
                     # 전문가급 PDF 생성 및 전송
-                    success = report_manager.generate_and_send_expert_report(
-                        ticker=ticker,
-                        company_name=company_name,
-                        analysis_text=analysis_text,
-                        stock_data=result['data']['stock_data'],
-                        chart_fig=chart_fig,
-                        status_callback=status_callback
-                    )
+                    with span("app.expert_report", ticker=ticker) as root:
+                        st.session_state.last_trace_id = root.trace_id
+                        success = report_manager.generate_and_send_expert_report(
+                            ticker=ticker,
+                            company_name=company_name,
+                            analysis_text=analysis_text,
+                            stock_data=result['data']['stock_data'],
+                            chart_fig=chart_fig,
+                            status_callback=status_callback
+                        )
 
                     progress_bar.progress(1.0)
 
@@ -472,6 +472,16 @@ def main():
 
         st.markdown("---")
 
+        # LLM 응답 캐시 (같은 데이터로 다시 분석하면 저장된 응답 재사용)
+        st.checkbox(
+            "[CACHE] 동일 데이터 분석 결과 재사용",
+            value=True,
+            key="use_llm_cache",
+            help="해제하면 같은 프롬프트의 캐시된 분석이 있어도 AI를 다시 호출합니다."
+        )
+
+        st.markdown("---")
+
         # 스크리너 설정
         st.markdown("### [SEARCH] 스크리닝 조건")
         st.markdown("""
@@ -494,6 +504,19 @@ def main():
 
         st.markdown("---")
 
+        # 최근 실행 트레이스
+        if st.session_state.get('last_trace_id'):
+            trace_rows = get_tracer().summary(st.session_state.last_trace_id)
+            if trace_rows:
+                st.markdown("### [TRACE] 최근 실행 소요 시간")
+                trace_df = pd.DataFrame(trace_rows)[['name', 'count', 'total_ms', 'max_ms', 'errors']]
+                st.dataframe(
+                    trace_df.round(1),
+                    hide_index=True,
+                    use_container_width=True
+                )
+                st.markdown("---")
+
         # 정보
         with st.expander("[INFO] 비용 정보"):
             st.markdown("""
@@ -0,0 +1,526 @@
+"""
+Global Macro Intelligence Hub - Benchmark
+합성 픽스처(오프라인)로 파이프라인 단계별 성능을 측정하는 벤치마크 스크립트
+
+단계:
+- scan_{N}: N개 종목 유니버스 스크리닝 (StockScreener.screen_stocks, 묶음 수집 + 큐브)
+- indicators: 벡터화 지표 계산 (compute_screening_indicators)
+- prompt: IntelligenceHub.create_enhanced_prompt
+- sections: ExpertReportManager.extract_analysis_sections
+- pdf: ExpertReportManager.create_expert_pdf
+- full_run: IntelligenceHub.run (수집 → 분석 → 보고서)
+
+각 단계는 벽시계 시간, tracemalloc 최대 메모리, 처리량을 기록하고 결과를 JSON으로 저장합니다.
+
+사용 예시:
+  python benchmark.py                          # 전체 단계
+  python benchmark.py --stages scan,prompt     # 일부 단계만
+  python benchmark.py --sizes 200 --latency 0.05
+  python benchmark.py --compare benchmarks/results/bench_이전.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import zipfile
+import zlib
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from providers import configure_providers
+from price_loader import OHLCV_COLUMNS
+
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'benchmarks', 'results')
+STAGES = ['scan', 'indicators', 'prompt', 'sections', 'pdf', 'full_run']
+FULL_RUN_TICKER = "005930.KS"
+
+
+# ----------------------------------------------------------------------
+# 합성 데이터 공급자
+# ----------------------------------------------------------------------
+
+def _seed(*parts: Any) -> int:
+    """문자열 인자로부터 결정적 난수 시드"""
+    return zlib.crc32("|".join(str(p) for p in parts).encode('utf-8'))
+
+
+def _business_days(start: Optional[str], period: Optional[str]) -> pd.DatetimeIndex:
+    """요청 기간에 해당하는 영업일 (오늘까지)"""
+    end = pd.Timestamp(datetime.now().date())
+    if start:
+        begin = pd.Timestamp(start)
+    else:
+        days = {"5d": 7, "1mo": 31, "2mo": 62, "3mo": 92, "6mo": 183, "1y": 366, "2y": 731}.get(period, 366)
+        begin = end - pd.Timedelta(days=days)
+    return pd.bdate_range(begin, end, name='Date')
+
+
+def synthetic_history(ticker: str, start: str = None, period: str = None) -> pd.DataFrame:
+    """종목별 결정적 랜덤워크 OHLCV (같은 날짜는 항상 같은 값)"""
+    dates = _business_days(start, period)
+    full = pd.bdate_range(pd.Timestamp('2020-01-01'), dates[-1] if len(dates) else pd.Timestamp('2020-01-01'))
+
+    rng = np.random.default_rng(_seed(ticker))
+    returns = rng.normal(0.0003, 0.02, len(full))
+    close = 50000 * np.exp(np.cumsum(returns))
+    volume = rng.lognormal(13, 0.6, len(full))
+    # 일부 종목/날짜에 거래량 급증
+    volume[rng.random(len(full)) < 0.03] *= 3
+
+    frame = pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.005, len(full))),
+        'High': close * (1 + np.abs(rng.normal(0, 0.01, len(full)))),
+        'Low': close * (1 - np.abs(rng.normal(0, 0.01, len(full)))),
+        'Close': close,
+        'Volume': np.round(volume),
+    }, index=full)
+    frame.index.name = 'Date'
+    return frame.loc[frame.index.isin(dates), OHLCV_COLUMNS]
+
+
+# 합성 LLM 응답에서 이미 캐시에 기록된 system 접두사
+_synthetic_cached_prefixes = set()
+
+
+def synthetic_analysis(prompt: str) -> str:
+    """출력 형식(### 1~5 섹션)을 따르는 합성 분석문"""
+    rng = np.random.default_rng(_seed(prompt[:2000]))
+    filler = "데이터 기반 근거와 수치 비교를 포함한 분석 문장입니다. " * 12
+    score = int(rng.integers(40, 90))
+    return f"""### 1. 데이터-내러티브 괴리 분석
+**발견된 모순:**
+- 뉴스 헤드라인과 실제 주가 흐름 비교: {filler}
+
+### 2. 공시 진위 판별
+**공시 내용 검증:**
+- 실현 가능성 평가: 중간
+- 근거: {filler}
+
+### 3. 강세론 vs 약세론 (5:5 균형)
+
+**강세론 근거 (Bullish Case):**
+1. {filler}
+2. {filler}
+3. {filler}
+
+**약세론 근거 (Bearish Case):**
+1. {filler}
+2. {filler}
+3. {filler}
+
+### 4. 종합 판단
+- {filler}
+
+### 5. 신뢰도 점수 (Reliability Score)
+
+**점수: {score}점**
+
+**총점: {score}점**
+"""
+
+
+def _rss_feed(query: str, count: int = 10) -> bytes:
+    items = "".join(
+        f"<item><title>{query} 관련 뉴스 {i}</title><link>https://news.example.com/{i}</link>"
+        f"<description>&lt;b&gt;{query}&lt;/b&gt; 요약 {i} " + "본문 " * 40 + "</description>"
+        f"<pubDate>Mon, 01 Jan 2024 0{i % 10}:00:00 GMT</pubDate><source>Example</source></item>"
+        for i in range(count)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>{query}</title>{items}</channel></rss>'.encode('utf-8')
+
+
+def _corp_code_zip(stock_codes: List[str]) -> bytes:
+    rows = "".join(
+        f"<list><corp_code>{int(code) + 10000000:08d}</corp_code><corp_name>합성{code}</corp_name>"
+        f"<stock_code>{code}</stock_code><modify_date>20240101</modify_date></list>"
+        for code in stock_codes
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('CORPCODE.xml', f'<?xml version="1.0" encoding="UTF-8"?><result>{rows}</result>')
+    return buffer.getvalue()
+
+
+def _dart_list(params: Dict[str, Any]) -> bytes:
+    corp_code = params.get('corp_code', '00000000')
+    stock_code = f"{int(corp_code) - 10000000:06d}" if corp_code.isdigit() else ''
+    names = ['분기보고서 (2024.03)', '주요사항보고서(자기주식취득결정)', '임원ㆍ주요주주특정증권등소유상황보고서', '유상증자결정']
+    items = [
+        {
+            "corp_code": corp_code, "corp_name": f"합성{stock_code}", "stock_code": stock_code, "corp_cls": "Y",
+            "report_nm": names[i % len(names)], "rcept_no": f"{params.get('end_de', '20240101')}{i:06d}",
+            "rcept_dt": params.get('end_de', '20240101')
+        }
+        for i in range(8)
+    ]
+    return json.dumps({"status": "000", "page_no": 1, "total_page": 1, "total_count": len(items), "list": items}).encode('utf-8')
+
+
+def synthetic_backend(kind: str, key: Dict[str, Any]) -> Any:
+    """providers backend: 외부 호출 대신 합성 응답 생성"""
+    if kind == 'yfinance':
+        op = key['op']
+        if op == 'info':
+            return {"longName": f"Synthetic {key['ticker']}", "currency": "KRW", "heldPercentInstitutions": 0.31}
+        if op == 'history':
+            return synthetic_history(key['ticker'], key.get('start'), key.get('period'))
+        if op == 'download':
+            tickers = key['tickers'] if isinstance(key['tickers'], list) else [key['tickers']]
+            frames = {t: synthetic_history(t, key.get('start'), key.get('period')) for t in tickers}
+            return pd.concat(frames, axis=1)
+
+    if kind == 'http':
+        url, params = key['url'], key.get('params') or {}
+        if 'news.google.com' in url:
+            content, content_type = _rss_feed(url.split('q=')[1].split('&')[0]), 'application/rss+xml'
+        elif url.endswith('corpCode.xml'):
+            content, content_type = _corp_code_zip([FULL_RUN_TICKER.split('.')[0]]), 'application/zip'
+        elif url.endswith('list.json'):
+            content, content_type = _dart_list(params), 'application/json; charset=utf-8'
+        else:
+            return {"url": url, "status_code": 404, "headers": {}, "content": b""}
+        return {"url": url, "status_code": 200, "headers": {"Content-Type": content_type}, "content": content}
+
+    if kind == 'llm':
+        text = synthetic_analysis(key['prompt'])
+        usage = {"input_tokens": len(key['prompt']) // 2, "output_tokens": len(text) // 2}
+        if key.get('system'):
+            # 공급자 측 프롬프트 캐시 흉내: 같은 system 접두사는 두 번째 호출부터 캐시에서 읽음
+            system_tokens = len(key['system']) // 2
+            written = zlib.crc32(key['system'].encode('utf-8')) in _synthetic_cached_prefixes
+            _synthetic_cached_prefixes.add(zlib.crc32(key['system'].encode('utf-8')))
+            usage["cache_creation_input_tokens"] = 0 if written else system_tokens
+            usage["cache_read_input_tokens"] = system_tokens if written else 0
+        return {"text": text, "model": key['model'], "usage": usage}
+
+    raise ValueError(f"No synthetic backend for {kind}")
+
+
+# ----------------------------------------------------------------------
+# 측정
+# ----------------------------------------------------------------------
+
+def isolate_stores(cache_dir: str):
+    """공용 저장소/캐시 싱글톤을 cache_dir 아래 새 인스턴스로 교체 (측정 간 간섭 방지)"""
+    import price_store, price_cube, indicator_state, metadata_cache, http_cache, dart_client, snapshot_store
+
+    os.makedirs(cache_dir, exist_ok=True)
+    db_path = os.path.join(cache_dir, 'prices.sqlite3')
+
+    price_store._default_store = price_store.PriceStore(db_path=db_path)
+    indicator_state._default_state_store = indicator_state.IndicatorStateStore(db_path=db_path)
+    price_cube._default_cube = price_cube.PriceCube(cube_dir=os.path.join(cache_dir, 'cube'))
+    metadata_cache._default_cache = metadata_cache.TickerInfoCache(os.path.join(cache_dir, 'metadata.sqlite3'))
+    http_cache._default_cache = http_cache.HttpCache(os.path.join(cache_dir, 'http_cache.sqlite3'))
+    dart_client._default_index = dart_client.CorpCodeIndex(
+        os.getenv('DART_API_KEY'), os.path.join(cache_dir, 'dart_corp_codes.json')
+    )
+    dart_client._default_disclosure_index = None
+    snapshot_store._default_store = snapshot_store.SnapshotStore(
+        data_dir=os.path.join(cache_dir, 'data'),
+        index_path=os.path.join(cache_dir, 'snapshot_index.sqlite3')
+    )
+
+
+def measure(name: str, func: Callable[[], Any], items: int, unit: str, trace_memory: bool = True) -> Dict[str, Any]:
+    """
+    단계 실행 후 측정값 반환
+
+    Args:
+        name: 단계 이름
+        func: 측정할 함수
+        items: 처리 항목 수 (처리량 계산용)
+        unit: 항목 단위 (예: 'tickers')
+        trace_memory: tracemalloc으로 최대 메모리 측정 여부
+
+    Returns:
+        {"wall_seconds", "peak_memory_mb", "items", "unit", "throughput_per_sec"}
+    """
+    print(f"[INFO] Stage {name} ...", flush=True)
+
+    if trace_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    func()
+    wall = time.perf_counter() - start
+
+    peak_mb = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = peak / (1024 * 1024)
+
+    result = {
+        "wall_seconds": round(wall, 4),
+        "peak_memory_mb": round(peak_mb, 2) if peak_mb is not None else None,
+        "items": items,
+        "unit": unit,
+        "throughput_per_sec": round(items / wall, 2) if wall > 0 else None,
+    }
+    print(f"[OK] {name}: {wall:.3f}s, {result['throughput_per_sec']} {unit}/s"
+          + (f", peak {peak_mb:.1f} MB" if peak_mb is not None else ""))
+    return result
+
+
+class Benchmark:
+    """합성 픽스처 기반 벤치마크 실행기"""
+
+    def __init__(self, work_dir: str, latency: Any = 0.0, trace_memory: bool = True, repeat: int = 20):
+        """
+        Args:
+            work_dir: 픽스처/캐시/출력 작업 디렉토리
+            latency: replay 주입 지연 (초 또는 종류별 설정)
+            trace_memory: tracemalloc 측정 여부
+            repeat: 가벼운 단계(prompt, sections)의 반복 횟수
+        """
+        self.work_dir = work_dir
+        self.fixture_dir = os.path.join(work_dir, 'fixtures')
+        self.latency = latency
+        self.trace_memory = trace_memory
+        self.repeat = repeat
+        self._run_id = 0
+
+    def _fresh_cache(self) -> str:
+        self._run_id += 1
+        return os.path.join(self.work_dir, f'cache_{self._run_id}')
+
+    def _record(self, func: Callable[[], Any]):
+        """합성 backend로 func를 실행해 픽스처 기록 (별도 캐시 사용)"""
+        configure_providers('record', self.fixture_dir, backend=synthetic_backend)
+        isolate_stores(self._fresh_cache())
+        func()
+
+    def _replay(self):
+        """측정용 replay 모드 + 새 캐시"""
+        configure_providers('replay', self.fixture_dir, self.latency)
+        isolate_stores(self._fresh_cache())
+
+    def _sample_data(self) -> Dict[str, Any]:
+        """prompt/pdf 단계용 수집 데이터"""
+        hist = synthetic_history(FULL_RUN_TICKER, period="1mo").tail(7)
+        return {
+            "ticker": FULL_RUN_TICKER,
+            "stock_data": {
+                "ticker": FULL_RUN_TICKER,
+                "company_name": f"Synthetic {FULL_RUN_TICKER}",
+                "currency": "KRW",
+                "data": [
+                    {"date": d.strftime('%Y-%m-%d'), "open": float(r.Open), "high": float(r.High),
+                     "low": float(r.Low), "close": float(r.Close), "volume": int(r.Volume)}
+                    for d, r in hist.iterrows()
+                ]
+            },
+            "news": [
+                {"title": f"뉴스 {i}", "description": "요약 " * 50, "source": "Example", "published": "2024-01-01"}
+                for i in range(5)
+            ],
+            "disclosures": [
+                {"company": "합성", "report_name": "분기보고서", "submitted_date": "20240101", "url": "http://dart"}
+                for _ in range(5)
+            ],
+        }
+
+    def stage_scan(self, size: int) -> Dict[str, Any]:
+        from screener import StockScreener
+
+        tickers = {f"{i:06d}.KS": f"합성{i}" for i in range(size)}
+
+        def run():
+            screener = StockScreener()
+            screener.watch_stocks = tickers
+            screener.screen_stocks(batch=True, use_cube=True)
+
+        self._record(run)
+        self._replay()
+        return measure(f"scan_{size}", run, size, "tickers", self.trace_memory)
+
+    def stage_indicators(self, size: int) -> Dict[str, Any]:
+        from indicators import compute_screening_indicators
+
+        tickers = [f"{i:06d}.KS" for i in range(size)]
+        histories = {t: synthetic_history(t, period="2mo") for t in tickers}
+        close = np.column_stack([histories[t]['Close'].to_numpy() for t in tickers])
+        volume = np.column_stack([histories[t]['Volume'].to_numpy() for t in tickers])
+
+        return measure(
+            f"indicators_{size}",
+            lambda: compute_screening_indicators(close, volume, tickers),
+            size, "tickers", self.trace_memory
+        )
+
+    def _hub(self):
+        from main import IntelligenceHub
+        hub = IntelligenceHub()
+        hub.reports_dir = os.path.join(self.work_dir, 'reports')
+        os.makedirs(hub.reports_dir, exist_ok=True)
+        return hub
+
+    def stage_prompt(self) -> Dict[str, Any]:
+        self._replay()
+        hub = self._hub()
+        data = self._sample_data()
+
+        def run():
+            for _ in range(self.repeat):
+                hub.create_enhanced_prompt(data)
+
+        return measure("prompt", run, self.repeat, "prompts", self.trace_memory)
+
+    def stage_sections(self) -> Dict[str, Any]:
+        from report_manager import ExpertReportManager
+
+        manager = ExpertReportManager()
+        text = synthetic_analysis("sections")
+
+        def run():
+            for _ in range(self.repeat):
+                manager.extract_analysis_sections(text)
+
+        return measure("sections", run, self.repeat, "reports", self.trace_memory)
+
+    def stage_pdf(self) -> Dict[str, Any]:
+        from report_manager import ExpertReportManager, ProfessionalPDFReport
+
+        # 분석문이 한글이므로 한글 폰트가 없는 환경에서는 PDF 생성 자체가 불가능
+        has_font, _ = ProfessionalPDFReport().find_korean_font()
+        if not has_font:
+            print("[WARN] Stage pdf skipped: Korean font not found")
+            return {"skipped": "Korean font not found"}
+
+        manager = ExpertReportManager()
+        manager.reports_dir = os.path.join(self.work_dir, 'reports')
+        os.makedirs(manager.reports_dir, exist_ok=True)
+        data = self._sample_data()
+        text = synthetic_analysis("pdf")
+
+        return measure(
+            "pdf",
+            lambda: manager.create_expert_pdf(FULL_RUN_TICKER, "Synthetic", text, data['stock_data']),
+            1, "reports", self.trace_memory
+        )
+
+    def stage_full_run(self) -> Dict[str, Any]:
+        self._record(lambda: self._hub().run(FULL_RUN_TICKER))
+        self._replay()
+        hub = self._hub()
+        return measure("full_run", lambda: hub.run(FULL_RUN_TICKER), 1, "runs", self.trace_memory)
+
+    def run(self, stages: List[str], sizes: List[int]) -> Dict[str, Any]:
+        """선택한 단계 실행"""
+        results = {}
+        for stage in stages:
+            if stage == 'scan':
+                for size in sizes:
+                    results[f"scan_{size}"] = self.stage_scan(size)
+            elif stage == 'indicators':
+                for size in sizes:
+                    results[f"indicators_{size}"] = self.stage_indicators(size)
+            else:
+                results[stage] = getattr(self, f"stage_{stage}")()
+        return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def compare_results(current: Dict[str, Any], baseline_path: str):
+    """이전 결과 파일과 단계별 비교 출력"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    print(f"\n[COMPARE] vs {baseline.get('revision')} ({baseline_path})")
+    print(f"{'stage':<20} {'before (s)':>12} {'after (s)':>12} {'speedup':>9} {'mem before':>11} {'mem after':>10}")
+    for name, after in current['stages'].items():
+        before = baseline.get('stages', {}).get(name)
+        if 'skipped' in after:
+            print(f"{name:<20} skipped ({after['skipped']})")
+            continue
+        if not before or 'skipped' in before:
+            print(f"{name:<20} {'-':>12} {after['wall_seconds']:>12.3f}")
+            continue
+        speedup = before['wall_seconds'] / after['wall_seconds'] if after['wall_seconds'] else float('nan')
+        print(f"{name:<20} {before['wall_seconds']:>12.3f} {after['wall_seconds']:>12.3f} {speedup:>8.2f}x "
+              f"{before.get('peak_memory_mb') or '-':>11} {after.get('peak_memory_mb') or '-':>10}")
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='Global Macro Intelligence Hub - 오프라인 벤치마크')
+    parser.add_argument('--stages', type=str, default=','.join(STAGES),
+                        help=f"실행할 단계 (쉼표 구분, 기본: {','.join(STAGES)})")
+    parser.add_argument('--sizes', type=str, default='200,2000', help='스캔/지표 단계 종목 수 (쉼표 구분)')
+    parser.add_argument('--latency', type=str, default='0',
+                        help='replay 주입 지연 (초, 또는 "yfinance=0.3,http=0.1,llm=2")')
+    parser.add_argument('--repeat', type=int, default=20, help='prompt/sections 반복 횟수')
+    parser.add_argument('--no-memory', action='store_true', help='tracemalloc 측정 생략 (측정 오버헤드 제거)')
+    parser.add_argument('--output', type=str, default=None, help='결과 JSON 경로 (기본: benchmarks/results/)')
+    parser.add_argument('--compare', type=str, default=None, help='비교할 이전 결과 JSON')
+    parser.add_argument('--keep-work-dir', action='store_true', help='픽스처/캐시 작업 디렉토리 유지')
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(unknown)}")
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+
+    # DART 경로까지 측정하기 위한 더미 키 (합성 backend/replay만 사용하므로 실제 호출 없음)
+    os.environ.setdefault('DART_API_KEY', 'benchmark')
+
+    work_dir = tempfile.mkdtemp(prefix='gmih_bench_')
+    print(f"[INFO] Work dir: {work_dir}")
+
+    try:
+        bench = Benchmark(work_dir, latency=args.latency, trace_memory=not args.no_memory, repeat=args.repeat)
+        stage_results = bench.run(stages, sizes)
+    finally:
+        configure_providers('live')
+        if not args.keep_work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = {
+        "revision": _git_revision(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "stages": stages, "sizes": sizes, "latency": args.latency,
+            "repeat": args.repeat, "trace_memory": not args.no_memory
+        },
+        "stages": stage_results,
+    }
+
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, f"bench_{result['revision'] or 'local'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    print(f"\n[SAVED] Benchmark results: {output}")
+
+    if args.compare:
+        compare_results(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,14 @@ Global Macro Intelligence Hub - Critical Analyzer
 수집된 데이터를 비판적 추론 프레임워크로 분석하는 모듈
 """
 
-import json
 import os
 from datetime import datetime
 from typing import Dict, Any, List
 from dotenv import load_dotenv
-import google.generativeai as genai
+
+from llm_client import LLMClient
+from providers import get_provider_recorder
+import snapshot_format
 
 # .env 파일 로드
 load_dotenv()
@@ -45,22 +47,20 @@ class CriticalAnalyzer:
             gemini_api_key: Gemini API 키 (환경변수 GEMINI_API_KEY로도 설정 가능)
         """
         self.api_key = gemini_api_key or get_api_key('GEMINI_API_KEY')
-        if not self.api_key:
+        # replay/합성 모드는 실제 API를 호출하지 않으므로 API 키 불필요
+        if not self.api_key and not get_provider_recorder().is_offline:
             raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다. Streamlit Secrets 또는 .env 파일에서 API 키를 설정하세요.")
 
-        # Gemini 설정
-        genai.configure(api_key=self.api_key)
-
         # 모델 선택 (gemini-2.0-flash-exp: 최신 실험 버전)
         # 2.0 Flash: 최신 모델, 빠르고 정확함
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        self.model = LLMClient('gemini', 'gemini-2.0-flash-exp', api_key=self.api_key)
 
     def load_data(self, json_file_path) -> Dict[str, Any]:
         """
-        JSON 파일 또는 딕셔너리에서 데이터 로드
+        스냅샷 파일 또는 딕셔너리에서 데이터 로드
 
         Args:
-            json_file_path: JSON 파일 경로 또는 데이터 딕셔너리
+            json_file_path: 스냅샷 파일 경로 (.json, .json.gz, .msgpack.zst, 아카이브 멤버) 또는 데이터 딕셔너리
 
         Returns:
             로드된 데이터 딕셔너리
@@ -70,10 +70,9 @@ class CriticalAnalyzer:
             print("[INFO] Using provided data dictionary")
             return json_file_path
 
-        # 파일 경로인 경우 로드
+        # 파일 경로인 경우 로드 (형식은 확장자로 판별)
         try:
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = snapshot_format.load(json_file_path)
             print(f"[OK] Data loaded: {json_file_path}")
             return data
         except Exception as e:
@@ -248,15 +247,17 @@ class CriticalAnalyzer:
 
         return "\n".join(lines) if lines else "[WARN] No valid disclosures"
 
-    def analyze(self, json_file_path) -> Dict[str, Any]:
+    def analyze(self, json_file_path, use_cache: bool = True, source_file: str = None) -> Dict[str, Any]:
         """
         데이터 분석 실행
 
         Args:
             json_file_path: 분석할 JSON 파일 경로 또는 데이터 딕셔너리
+            use_cache: False면 같은 프롬프트의 캐시된 응답이 있어도 모델을 다시 호출
+            source_file: 결과에 기록할 원본 파일 경로 (기본: json_file_path)
 
         Returns:
-            분석 결과 딕셔너리
+            분석 결과 딕셔너리 (모델 호출 실패 시 error에 오류 메시지, 성공 시 None)
         """
         print(f"\n{'='*70}")
         print(f"[START] Critical Analysis")
@@ -272,32 +273,30 @@ class CriticalAnalyzer:
         # 3. Gemini API 호출
         print("[INFO] Calling Gemini API...")
         try:
-            # Gemini 생성 설정
-            generation_config = {
-                "temperature": 0.3,  # 낮은 temperature로 객관적 분석 유도
-                "max_output_tokens": 4096,
-            }
-
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config
-            )
+            # 낮은 temperature로 객관적 분석 유도
+            response = self.model.generate(prompt, max_tokens=4096, temperature=0.3, use_cache=use_cache)
 
-            analysis_text = response.text
-            print("[OK] Analysis complete!\n")
+            analysis_text = response["text"]
+            cached = response.get("cached", False)
+            error = None
+            print("[OK] Analysis complete! (cached response)\n" if cached else "[OK] Analysis complete!\n")
 
         except Exception as e:
             print(f"[ERROR] Gemini API call failed: {str(e)}")
             analysis_text = f"분석 실패: {str(e)}"
+            cached = False
+            error = str(e)
 
         # 4. 결과 구성
         result = {
             "analyzed_at": datetime.now().isoformat(),
             "ticker": data.get('ticker', 'N/A'),
-            "source_file": json_file_path,
+            "source_file": source_file or json_file_path,
             "analysis": analysis_text,
+            "error": error,
             "metadata": {
                 "model": "gemini-2.0-flash-exp",
+                "cached": cached,
                 "framework": "Critical Reasoning Framework",
                 "rules": [
                     "Data-Narrative Discrepancy Analysis",
@@ -316,6 +315,7 @@ class CriticalAnalyzer:
         Args:
             result: 분석 결과
             output_format: 출력 형식 ("json", "markdown", "both")
+                           json은 snapshot_format 형식으로 저장 (기본: JSON, SNAPSHOT_FORMAT으로 변경)
 
         Returns:
             저장된 파일 경로
@@ -332,16 +332,16 @@ class CriticalAnalyzer:
 
         saved_files = []
 
-        # JSON 저장
+        # 구조화 결과 저장 (SNAPSHOT_FORMAT으로 압축 형식을 지정하지 않으면 들여쓰기 JSON)
         if output_format in ["json", "both"]:
+            fmt = snapshot_format.resolve_format()
             json_path = os.path.join(
                 analysis_dir,
-                f"analysis_{ticker}_{timestamp}.json"
+                f"analysis_{ticker}_{timestamp}{snapshot_format.FORMAT_EXTENSIONS[fmt]}"
             )
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+            snapshot_format.dump(result, json_path)
             saved_files.append(json_path)
-            print(f"[SAVED] JSON: {json_path}")
+            print(f"[SAVED] {fmt}: {json_path}")
 
         # Markdown 저장
         if output_format in ["markdown", "both"]:
@@ -411,10 +411,10 @@ def main():
         print("   먼저 data_collector.py를 실행하여 데이터를 수집하세요.")
         return
 
-    json_files = glob.glob(os.path.join(data_dir, "*.json"))
+    json_files = [path for path in glob.glob(os.path.join(data_dir, "*")) if snapshot_format.is_snapshot_file(path)]
 
     if not json_files:
-        print(f"[ERROR] No JSON files in data folder")
+        print(f"[ERROR] No snapshot files in data folder")
         print("   먼저 data_collector.py를 실행하여 데이터를 수집하세요.")
         return
 
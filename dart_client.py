@@ -0,0 +1,597 @@
+"""
+Global Macro Intelligence Hub - DART Client
+OpenDART 고유번호(corp_code) 색인, 공시 목록 페이지 조회, 시장 전체 주요 공시 색인 모듈
+"""
+
+import re
+import sqlite3
+import xml.etree.ElementTree as ET
+import zipfile
+import threading
+import json
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+from http_client import get_http_client
+from http_cache import get_http_cache
+from rate_limiter import get_source_limiter
+from tracing import span, propagate
+
+
+CORP_CODE_URL = "https://opendart.fss.or.kr/api/corpCode.xml"
+LIST_URL = "https://opendart.fss.or.kr/api/list.json"
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(__file__), 'cache', 'dart_corp_codes.json')
+DEFAULT_DISCLOSURE_DB_PATH = os.path.join(os.path.dirname(__file__), 'cache', 'dart_disclosures.sqlite3')
+
+# 시장 전체 색인에서 조회할 공시 유형 (A: 정기공시, B: 주요사항보고)
+# IMPORTANT_REPORTS의 사업/반기/분기보고서와 주요사항보고서(자기주식, 증자, 합병/분할, 양수도 등)
+INDEX_DISCLOSURE_TYPES = ('A', 'B')
+
+# 주요 공시 보고서명 키워드
+IMPORTANT_REPORTS = [
+    '사업보고서', '반기보고서', '분기보고서',
+    '자기주식취득', '자기주식처분',
+    '주요사항보고서', '합병', '분할',
+    '유상증자', '무상증자', '전환사채',
+    '자산양수도', '영업양수도'
+]
+
+
+def compile_keywords(keywords: List[str]) -> re.Pattern:
+    """키워드 목록을 한 번에 검사하는 정규식으로 컴파일 (긴 키워드 우선)"""
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile('|'.join(re.escape(keyword) for keyword in ordered))
+
+
+IMPORTANT_REPORTS_PATTERN = compile_keywords(IMPORTANT_REPORTS)
+
+
+def classify_report(report_name: str, pattern: re.Pattern = IMPORTANT_REPORTS_PATTERN) -> Optional[str]:
+    """
+    보고서명을 주요 공시 키워드로 분류
+
+    Returns:
+        처음 일치한 키워드 (주요 공시가 아니면 None)
+    """
+    match = pattern.search(report_name or '')
+    return match.group(0) if match else None
+
+
+def format_disclosure(item: Dict[str, Any]) -> Dict[str, str]:
+    """list.json 항목을 수집 데이터 형식으로 변환"""
+    return {
+        "company": item.get('corp_name', 'N/A'),
+        "report_name": item.get('report_nm', ''),
+        "submitted_date": item.get('rcept_dt', 'N/A'),
+        "report_type": item.get('corp_cls', 'N/A'),
+        "url": f"http://dart.fss.or.kr/dsaf001/main.do?rcpNo={item.get('rcept_no', '')}"
+    }
+
+
+class DartApiError(Exception):
+    """OpenDART 응답 오류 (HTTP 오류 또는 status != '000')"""
+
+
+def is_cacheable_dart_response(response: Any) -> bool:
+    """
+    응답 캐시에 저장해도 되는 list.json 응답인지 여부
+
+    OpenDART는 오류(020 요청 제한, 800 점검, 010/011 키 오류 등)도 HTTP 200 본문으로 반환하므로
+    정상(000)과 조회 결과 없음(013)만 저장합니다.
+    """
+    try:
+        return response.json().get('status') in ('000', '013')
+    except ValueError:
+        return False
+
+
+class CorpCodeIndex:
+    """
+    종목코드(6자리) → DART 고유번호(8자리) 색인
+
+    - 최초 조회 시점에 로드 (생성 자체는 네트워크/파일 접근 없음)
+    - refresh_seconds가 지난 캐시는 corpCode.xml을 다시 내려받아 갱신
+    - 갱신 실패 시 기존 캐시 파일을 그대로 사용
+    """
+
+    def __init__(
+        self,
+        api_key: str = None,
+        index_path: str = None,
+        refresh_seconds: int = 24 * 3600,
+        retry_seconds: int = 600
+    ):
+        """
+        Args:
+            api_key: OpenDART API 키
+            index_path: 색인 캐시 파일 경로 (기본: cache/dart_corp_codes.json)
+            refresh_seconds: 색인 갱신 주기 (초, 기본 1일)
+            retry_seconds: 갱신 실패 후 재시도까지 대기 시간 (초)
+        """
+        self.api_key = api_key
+        self.index_path = index_path or DEFAULT_INDEX_PATH
+        self.refresh_seconds = refresh_seconds
+        self.retry_seconds = retry_seconds
+
+        self._codes = None
+        self._fetched_at = None
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()
+
+    def _load_file(self) -> bool:
+        """캐시 파일 로드"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return False
+
+        self._codes = data.get('codes', {})
+        self._fetched_at = data.get('fetched_at', 0)
+        return True
+
+    def _download(self) -> Dict[str, Dict[str, str]]:
+        """corpCode.xml(zip) 다운로드 후 상장사만 색인"""
+        response = get_http_client().get(CORP_CODE_URL, params={"crtfc_key": self.api_key}, timeout=30)
+        response.raise_for_status()
+
+        # 오류 시 zip 대신 JSON/XML 상태 메시지가 반환됨
+        if not zipfile.is_zipfile(io.BytesIO(response.content)):
+            raise ValueError(f"Unexpected corpCode response: {response.content[:200]!r}")
+
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            xml_bytes = archive.read(archive.namelist()[0])
+
+        codes = {}
+        for item in ET.fromstring(xml_bytes).iter('list'):
+            stock_code = (item.findtext('stock_code') or '').strip()
+            if not stock_code:
+                continue
+            codes[stock_code] = {
+                "corp_code": (item.findtext('corp_code') or '').strip(),
+                "corp_name": (item.findtext('corp_name') or '').strip(),
+            }
+
+        return codes
+
+    def _save_file(self):
+        """색인 캐시 파일 원자적 저장"""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"fetched_at": self._fetched_at, "codes": self._codes}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def _is_stale(self) -> bool:
+        """갱신 주기가 지났는지 여부"""
+        return self._fetched_at is None or (time.time() - self._fetched_at) >= self.refresh_seconds
+
+    def refresh(self, force: bool = False):
+        """
+        필요 시 색인 갱신
+
+        Args:
+            force: True면 갱신 주기와 무관하게 다시 내려받기
+        """
+        with self._lock:
+            if self._codes is None:
+                self._load_file()
+
+            if not self.api_key:
+                return
+            if not force and (not self._is_stale() or time.time() < self._next_attempt):
+                return
+
+            try:
+                print("   [INFO] DART corp code index refreshing...")
+                self._codes = self._download()
+                self._fetched_at = time.time()
+                self._save_file()
+                print(f"   [OK] DART corp code index: {len(self._codes)} listed companies")
+            except Exception as e:
+                # 실패 시 기존 색인을 유지하고 retry_seconds 동안 재시도하지 않음
+                self._next_attempt = time.time() + self.retry_seconds
+                print(f"   [WARN] DART corp code refresh failed: {str(e)}")
+
+    def lookup(self, stock_code: str) -> Optional[Dict[str, str]]:
+        """
+        종목코드로 고유번호/회사명 조회
+
+        Args:
+            stock_code: 6자리 종목코드 (예: '005930')
+
+        Returns:
+            {"corp_code", "corp_name"} (없으면 None)
+        """
+        if self._codes is None or self._is_stale():
+            self.refresh()
+        return (self._codes or {}).get(stock_code)
+
+    def get_corp_code(self, stock_code: str) -> Optional[str]:
+        """종목코드 → 8자리 고유번호 (없으면 None)"""
+        entry = self.lookup(stock_code)
+        return entry['corp_code'] if entry else None
+
+
+class DartClient:
+    """
+    OpenDART 공시 목록 조회
+
+    긴 기간은 window_days 단위 구간으로 나눠 동시에 조회하고, 각 구간은 마지막 페이지까지
+    순서대로 따라갑니다. 동시에 진행 중인 요청은 max_workers개로 제한되므로
+    1년 이상의 조회도 메모리를 일정하게 유지합니다.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        http_cache=None,
+        ttl_seconds: float = 1800,
+        rate_limiter=None,
+        window_days: int = 90,
+        max_workers: int = 4,
+        page_count: int = 100
+    ):
+        """
+        Args:
+            api_key: OpenDART API 키
+            http_cache: 응답 캐시 (HttpCache, None이면 공용 HttpClient로 직접 요청)
+            ttl_seconds: 응답 캐시 유효 시간 (초)
+            rate_limiter: 페이지 요청마다 적용할 RateLimiter
+            window_days: 구간 분할 단위 (일)
+            max_workers: 동시 요청 수
+            page_count: 페이지당 건수 (OpenDART 최대 100)
+        """
+        self.api_key = api_key
+        self.http_cache = http_cache
+        self.ttl_seconds = ttl_seconds
+        self.rate_limiter = rate_limiter
+        self.window_days = window_days
+        self.max_workers = max_workers
+        self.page_count = page_count
+
+    def _split_windows(self, start_date: datetime, end_date: datetime) -> List[Tuple[str, str]]:
+        """조회 기간을 window_days 단위 (시작일, 종료일) 구간으로 분할 (최신 구간 우선)"""
+        windows = []
+        window_end = end_date
+        while window_end >= start_date:
+            window_start = max(start_date, window_end - timedelta(days=self.window_days - 1))
+            windows.append((window_start.strftime('%Y%m%d'), window_end.strftime('%Y%m%d')))
+            window_end = window_start - timedelta(days=1)
+        return windows
+
+    def fetch_page(self, params: Dict[str, Any], page_no: int) -> Dict[str, Any]:
+        """
+        공시 목록 한 페이지 조회
+
+        Args:
+            params: corp_code/bgn_de/end_de 등 조회 조건
+            page_no: 페이지 번호 (1부터)
+
+        Returns:
+            list.json 응답 (조회 결과 없음(013)은 빈 목록으로 정규화)
+        """
+        query = dict(params, crtfc_key=self.api_key, page_no=page_no, page_count=self.page_count)
+
+        with span("dart.list_page", page_no=page_no, bgn_de=params.get("bgn_de"), end_de=params.get("end_de")) as s:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            if self.http_cache:
+                response = self.http_cache.get(
+                    LIST_URL, params=query, ttl_seconds=self.ttl_seconds, timeout=10,
+                    cacheable=is_cacheable_dart_response
+                )
+            else:
+                response = get_http_client().get(LIST_URL, params=query, timeout=10)
+
+            if response.status_code != 200:
+                raise DartApiError(f"HTTP {response.status_code}")
+
+            data = response.json()
+            status = data.get('status')
+
+            if status == '013':
+                # 조회된 데이터 없음
+                s.set_attribute("items", 0)
+                return {"status": status, "list": [], "total_page": 0}
+            if status != '000':
+                raise DartApiError(data.get('message', 'Unknown error'))
+
+            s.set_attribute("items", len(data.get('list', [])))
+            return data
+
+    def iter_disclosures(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        corp_code: str = None,
+        keywords: List[str] = None,
+        disclosure_type: str = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        공시 목록을 도착하는 순서대로 반환하는 제너레이터
+
+        Args:
+            start_date: 조회 시작일
+            end_date: 조회 종료일
+            corp_code: 8자리 고유번호 (None이면 전체 회사)
+            keywords: 보고서명 필터 키워드 (None이면 필터 없음)
+            disclosure_type: 공시 유형 (pblntf_ty, 예: 'A' 정기공시, None이면 전체 유형)
+
+        Yields:
+            list.json 항목 (필터 통과분만)
+        """
+        base_params = {"corp_code": corp_code} if corp_code else {}
+        if disclosure_type:
+            base_params["pblntf_ty"] = disclosure_type
+        pattern = compile_keywords(keywords) if keywords else None
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = {}
+
+        try:
+            for bgn_de, end_de in self._split_windows(start_date, end_date):
+                params = dict(base_params, bgn_de=bgn_de, end_de=end_de)
+                pending[executor.submit(propagate(self.fetch_page), params, 1)] = (params, 1)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    params, page_no = pending.pop(future)
+                    data = future.result()
+
+                    # 같은 구간의 다음 페이지 예약
+                    if page_no < int(data.get('total_page', 0) or 0):
+                        pending[executor.submit(propagate(self.fetch_page), params, page_no + 1)] = (params, page_no + 1)
+
+                    for item in data.get('list', []):
+                        if pattern is None or pattern.search(item.get('report_nm', '')):
+                            yield item
+        finally:
+            # 소비자가 중간에 멈춰도 남은 요청은 취소
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class DisclosureIndex:
+    """
+    시장 전체 주요 공시 색인 (종목코드별 조회)
+
+    - 날짜별로 전체 회사 공시를 한 번에 페이지 조회 (corp_code 없이, 주요 공시 유형만)
+    - 보고서명은 주요 공시 정규식 한 번으로 분류하고, 해당 공시만 종목코드별로 저장
+    - 지난 날짜는 한 번 수집하면 다시 요청하지 않고, 오늘은 max_age_seconds마다 갱신
+    """
+
+    def __init__(
+        self,
+        client: DartClient,
+        db_path: str = None,
+        max_age_seconds: int = 1800,
+        disclosure_types: Tuple[str, ...] = INDEX_DISCLOSURE_TYPES
+    ):
+        """
+        Args:
+            client: 공시 목록 조회 클라이언트
+            db_path: SQLite 파일 경로 (기본: cache/dart_disclosures.sqlite3)
+            max_age_seconds: 오늘 공시 재수집 주기 (초)
+            disclosure_types: 수집할 공시 유형 (pblntf_ty)
+        """
+        self.client = client
+        self.disclosure_types = disclosure_types
+        self.db_path = db_path or DEFAULT_DISCLOSURE_DB_PATH
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS disclosures (
+                    rcept_no TEXT PRIMARY KEY,
+                    stock_code TEXT NOT NULL,
+                    corp_name TEXT,
+                    corp_cls TEXT,
+                    report_nm TEXT,
+                    rcept_dt TEXT NOT NULL,
+                    category TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_disclosures_stock ON disclosures (stock_code, rcept_dt)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS synced_days (
+                    day TEXT PRIMARY KEY,
+                    fetched_at REAL NOT NULL,
+                    complete INTEGER NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _days_to_sync(self, days: int) -> List[str]:
+        """수집이 필요한 날짜 ('YYYYMMDD', 오래된 순)"""
+        today = datetime.now()
+        wanted = [(today - timedelta(days=offset)).strftime('%Y%m%d') for offset in range(days, -1, -1)]
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT day, fetched_at, complete FROM synced_days WHERE day >= ?", (wanted[0],)
+            ).fetchall()
+        synced = {day: (fetched_at, complete) for day, fetched_at, complete in rows}
+
+        result = []
+        for day in wanted:
+            if day not in synced:
+                result.append(day)
+                continue
+            fetched_at, complete = synced[day]
+            if not complete and (time.time() - fetched_at) >= self.max_age_seconds:
+                result.append(day)
+        return result
+
+    @staticmethod
+    def _ranges(days: List[str]) -> List[Tuple[str, str]]:
+        """연속된 날짜를 (시작일, 종료일) 구간으로 묶기"""
+        ranges = []
+        for day in days:
+            current = datetime.strptime(day, '%Y%m%d')
+            if ranges and datetime.strptime(ranges[-1][1], '%Y%m%d') + timedelta(days=1) == current:
+                ranges[-1] = (ranges[-1][0], day)
+            else:
+                ranges.append((day, day))
+        return ranges
+
+    def sync(self, days: int = 7) -> int:
+        """
+        최근 days일 시장 전체 주요 공시 수집 (이미 수집한 날짜는 건너뜀)
+
+        Args:
+            days: 색인을 유지할 기간 (일)
+
+        Returns:
+            새로 저장한 주요 공시 건수
+        """
+        with self._lock:
+            missing = self._days_to_sync(days)
+            if not missing:
+                return 0
+
+            print(f"   [INFO] DART market-wide sync: {len(missing)} day(s)")
+            today = datetime.now().strftime('%Y%m%d')
+            stored = 0
+
+            for bgn_de, end_de in self._ranges(missing):
+                rows = []
+                for disclosure_type in self.disclosure_types:
+                    for item in self.client.iter_disclosures(
+                        datetime.strptime(bgn_de, '%Y%m%d'),
+                        datetime.strptime(end_de, '%Y%m%d'),
+                        disclosure_type=disclosure_type
+                    ):
+                        stock_code = (item.get('stock_code') or '').strip()
+                        category = classify_report(item.get('report_nm', ''))
+                        if not stock_code or category is None:
+                            continue
+                        rows.append((
+                            item.get('rcept_no'), stock_code, item.get('corp_name'), item.get('corp_cls'),
+                            item.get('report_nm'), item.get('rcept_dt'), category
+                        ))
+
+                # 구간이 모두 끝난 뒤 날짜를 완료 처리 (중간 실패 시 다음 sync에서 재시도)
+                now = time.time()
+                synced = [
+                    (day, now, int(day < today))
+                    for day in missing if bgn_de <= day <= end_de
+                ]
+                with self._connect() as conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO disclosures "
+                        "(rcept_no, stock_code, corp_name, corp_cls, report_nm, rcept_dt, category) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows
+                    )
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO synced_days (day, fetched_at, complete) VALUES (?, ?, ?)",
+                        synced
+                    )
+                stored += len(rows)
+
+            print(f"   [OK] DART market-wide sync: {stored} important disclosures indexed")
+            return stored
+
+    def get(self, stock_code: str, days: int = 7) -> List[Dict[str, str]]:
+        """
+        종목 주요 공시 조회 (네트워크 요청 없음)
+
+        Args:
+            stock_code: 6자리 종목코드 (티커 '005930.KS'도 허용)
+            days: 조회 기간 (일)
+
+        Returns:
+            공시 리스트 (최신순, get_dart_disclosures와 같은 형식)
+        """
+        stock_code = stock_code.split('.')[0]
+        start = (datetime.now() - timedelta(days=days)).strftime('%Y%m%d')
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT rcept_no, corp_name, corp_cls, report_nm, rcept_dt FROM disclosures "
+                "WHERE stock_code = ? AND rcept_dt >= ? ORDER BY rcept_dt DESC, rcept_no DESC",
+                (stock_code, start)
+            ).fetchall()
+
+        return [
+            format_disclosure({
+                "rcept_no": rcept_no, "corp_name": corp_name, "corp_cls": corp_cls,
+                "report_nm": report_nm, "rcept_dt": rcept_dt
+            })
+            for rcept_no, corp_name, corp_cls, report_nm, rcept_dt in rows
+        ]
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_corp_code_index(api_key: str = None) -> CorpCodeIndex:
+    """
+    프로세스 공용 CorpCodeIndex 반환
+
+    Args:
+        api_key: OpenDART API 키 (처음 키가 주어질 때 설정)
+    """
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = CorpCodeIndex(api_key)
+        elif api_key and not _default_index.api_key:
+            _default_index.api_key = api_key
+        return _default_index
+
+
+_default_disclosure_index = None
+_default_disclosure_index_lock = threading.Lock()
+
+
+def get_disclosure_index(api_key: str = None) -> Optional[DisclosureIndex]:
+    """
+    프로세스 공용 DisclosureIndex 반환
+
+    호출 측과 관계없이 항상 공용 응답 캐시와 DART 공용 RateLimiter를 사용합니다.
+
+    Args:
+        api_key: OpenDART API 키 (없으면 환경변수 DART_API_KEY)
+
+    Returns:
+        DisclosureIndex (API 키가 없으면 None)
+    """
+    global _default_disclosure_index
+    with _default_disclosure_index_lock:
+        if _default_disclosure_index is None:
+            api_key = api_key or os.getenv('DART_API_KEY')
+            if not api_key:
+                return None
+            client = DartClient(api_key, http_cache=get_http_cache(), rate_limiter=get_source_limiter("dart"))
+            _default_disclosure_index = DisclosureIndex(client)
+        return _default_disclosure_index
+
+
+def attach_indexed_disclosures(entries: List[Dict[str, Any]], index: DisclosureIndex, days: int = 7):
+    """
+    스크리닝 결과에 색인된 주요 공시를 추가 (시장 전체 동기화 1회 + 종목별 로컬 조회)
+
+    Args:
+        entries: 'ticker' 키를 가진 결과 딕셔너리 리스트 (제자리 수정)
+        index: 시장 전체 공시 색인
+        days: 조회 기간 (일)
+    """
+    try:
+        index.sync(days)
+    except Exception as e:
+        print(f"   [WARN] DART market-wide sync failed, using indexed data: {str(e)}")
+
+    for entry in entries:
+        entry['disclosures'] = index.get(entry['ticker'], days)
@@ -3,23 +3,42 @@ Global Macro Intelligence Hub - Data Collector
 특정 티커의 주가, 뉴스, 공시 정보를 수집하는 모듈
 """
 
-import yfinance as yf
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-import json
 import os
-import dart_fss as df
-from typing import Dict, List, Any
 import time
+from typing import Dict, List, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import feedparser
 from urllib.parse import quote
 
+from price_store import get_price_store
+from metadata_cache import get_metadata_cache
+from dart_client import (
+    get_corp_code_index, get_disclosure_index, format_disclosure,
+    DartClient, DartApiError, IMPORTANT_REPORTS
+)
+from rate_limiter import SOURCE_RATE_LIMITS, get_source_limiter
+from http_cache import get_http_cache
+from tracing import span, propagate
+from snapshot_store import get_snapshot_store
+
 # .env 파일 로드
 load_dotenv()
 
 
+# 소스별 초당 호출 제한 (DART 공시 색인 등 다른 모듈과 공유)
+_source_limiters = {source: get_source_limiter(source) for source in SOURCE_RATE_LIMITS}
+
+# 소스별 HTTP 응답 캐시 유효 시간 (초, 이후에는 조건부 요청으로 재검증)
+SOURCE_CACHE_TTLS = {
+    "news": 600,
+    "dart": 1800,
+}
+
+
 def get_api_key(key_name: str) -> str:
     """
     Streamlit Secrets 또는 환경변수에서 API 키 가져오기
@@ -50,31 +69,25 @@ class DataCollector:
         Args:
             dart_api_key: OpenDART API 키 (환경변수 DART_API_KEY로도 설정 가능)
         """
+        # 로컬 일봉 저장소 (증분 갱신)
+        self.price_store = get_price_store()
+
+        # 종목 메타데이터 캐시 (Ticker.info 재조회 방지)
+        self.metadata_cache = get_metadata_cache()
+
+        # 공용 HTTP 응답 캐시 (연결 재사용 + 재시도 + 조건부 요청)
+        self.http_cache = get_http_cache()
+
         # Streamlit Secrets 또는 .env에서 API 키 읽기
         self.dart_api_key = dart_api_key or get_api_key('DART_API_KEY')
 
-        # DART API 설정
+        # DART API 설정 (고유번호 색인은 첫 공시 조회 시점에 로드)
         self.dart_initialized = False
         if self.dart_api_key:
-            try:
-                # API 키 설정
-                df.set_api_key(api_key=self.dart_api_key)
-
-                # API 키 정상 작동 테스트 (corp_list 로드)
-                print("   [INFO] DART API initializing...")
-                corp_list = df.get_corp_list()
-
-                if corp_list is not None:
-                    self.dart_initialized = True
-                    print("   [OK] DART API initialized")
-                else:
-                    print("   [WARN] DART API returned None")
-
-            except Exception as e:
-                print(f"   [ERROR] DART API initialization failed: {str(e)}")
-                print("   [INFO] Check DART_API_KEY or network connection")
-                print(f"   [INFO] API key (first 8): {self.dart_api_key[:8] if self.dart_api_key else 'None'}...")
-                self.dart_initialized = False
+            self.corp_codes = get_corp_code_index(self.dart_api_key)
+            self.disclosure_index = get_disclosure_index(self.dart_api_key)
+            self.dart_initialized = True
+            print("   [OK] DART API key configured")
         else:
             print("   [WARN] DART API key not configured (.env file)")
 
@@ -94,24 +107,25 @@ class DataCollector:
         """
         try:
             print(f"[INFO] {ticker} Stock data collection...")
-            stock = yf.Ticker(ticker)
+            # 메타데이터 캐시 경유 조회 (캐시가 유효하면 네트워크 요청 없음)
+            info = self.metadata_cache.get_info(ticker)
 
-            # period 파라미터로 최신 데이터 가져오기 (오늘 종가 포함)
-            # period="1mo"를 사용하여 충분한 데이터 확보 후 tail로 자르기
-            hist = stock.history(period="1mo", interval="1d")
+            # 로컬 저장소 경유 조회 (마지막 저장일 이후 봉만 새로 요청, 오늘 종가 포함)
+            # 최근 1개월 데이터 확보 후 tail로 자르기
+            hist = self.price_store.get_history(ticker, period_days=31)
 
             # 최근 N일 영업일 데이터만 추출
             hist = hist.tail(days)
 
-            # 데이터가 없으면 period를 늘려서 재시도
+            # 데이터가 없으면 기간을 늘려서 재조회
             if len(hist) == 0:
-                hist = stock.history(period="3mo", interval="1d")
+                hist = self.price_store.get_history(ticker, period_days=92)
                 hist = hist.tail(days)
 
             stock_data = {
                 "ticker": ticker,
-                "company_name": stock.info.get('longName', 'N/A'),
-                "currency": stock.info.get('currency', 'KRW'),
+                "company_name": info.get('longName', 'N/A'),
+                "currency": info.get('currency', 'KRW'),
                 "collected_at": datetime.now().isoformat(),
                 "data": []
             }
@@ -128,8 +142,8 @@ class DataCollector:
                 stock_data["data"].append(daily_data)
 
             # 외국인 보유 비율 정보 (가능한 경우)
-            if 'heldPercentInstitutions' in stock.info:
-                stock_data["institutional_holders_pct"] = stock.info.get('heldPercentInstitutions', 0) * 100
+            if info.get('heldPercentInstitutions') is not None:
+                stock_data["institutional_holders_pct"] = info['heldPercentInstitutions'] * 100
 
             print(f"[OK] Stock data collected: {len(stock_data['data'])} days")
             return stock_data
@@ -169,8 +183,12 @@ class DataCollector:
             print(f"   [INFO] Fetching from Google News RSS...")
             print(f"   [INFO] Query: {search_query}")
 
-            # RSS 피드 파싱
-            feed = feedparser.parse(rss_url)
+            # HTTP 캐시 경유로 받은 RSS 피드 파싱 (TTL 이내면 네트워크 요청 없음)
+            response = self.http_cache.get(rss_url, ttl_seconds=SOURCE_CACHE_TTLS["news"])
+            response.raise_for_status()
+            with span("parse.rss", bytes=len(response.content)) as parse_span:
+                feed = feedparser.parse(response.content)
+                parse_span.set_attribute("entries", len(feed.entries))
 
             news_list = []
 
@@ -241,69 +259,41 @@ class DataCollector:
 
             print(f"   [INFO] {ticker} 공시 정보 수집 중...")
 
-            # 티커에서 종목 코드 추출
+            # 티커에서 종목 코드 추출 후 8자리 고유번호로 변환
             stock_code = ticker.split('.')[0]
+            corp_code = self.corp_codes.get_corp_code(stock_code)
+
+            if not corp_code:
+                print(f"   [WARN] {stock_code}에 해당하는 DART 고유번호가 없습니다.")
+                return [{"error": f"DART corp_code not found for {stock_code}"}]
 
             # 날짜 설정
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
 
-            # OpenDART API 호출
-            disclosures = []
-
-            # API 엔드포인트 직접 호출
-            base_url = "https://opendart.fss.or.kr/api/list.json"
-            params = {
-                "crtfc_key": self.dart_api_key,
-                "corp_code": stock_code,
-                "bgn_de": start_date.strftime('%Y%m%d'),
-                "end_de": end_date.strftime('%Y%m%d'),
-                "page_count": 100
-            }
+            # 전체 페이지/기간 구간을 동시에 조회하며 주요 공시만 수집
+            client = DartClient(
+                self.dart_api_key,
+                http_cache=self.http_cache,
+                ttl_seconds=SOURCE_CACHE_TTLS["dart"],
+                rate_limiter=_source_limiters["dart"]
+            )
 
-            response = requests.get(base_url, params=params, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-
-                if data.get('status') == '000':
-                    items = data.get('list', [])
-
-                    # 주요 공시 필터링
-                    important_reports = [
-                        '사업보고서', '반기보고서', '분기보고서',
-                        '자기주식취득', '자기주식처분',
-                        '주요사항보고서', '합병', '분할',
-                        '유상증자', '무상증자', '전환사채',
-                        '자산양수도', '영업양수도'
-                    ]
-
-                    for item in items:
-                        report_name = item.get('report_nm', '')
-
-                        # 주요 공시만 필터링
-                        if any(keyword in report_name for keyword in important_reports):
-                            disclosures.append({
-                                "company": item.get('corp_name', 'N/A'),
-                                "report_name": report_name,
-                                "submitted_date": item.get('rcept_dt', 'N/A'),
-                                "report_type": item.get('corp_cls', 'N/A'),
-                                "url": f"http://dart.fss.or.kr/dsaf001/main.do?rcpNo={item.get('rcept_no', '')}"
-                            })
-
-                else:
-                    error_msg = data.get('message', 'Unknown error')
-                    print(f"   [ERROR] DART API 오류: {error_msg}")
-                    print(f"   [INFO] DART API 키를 확인하거나 네트워크를 점검하세요.")
-                    return [{"error": error_msg}]
-            else:
-                print(f"   [ERROR] DART API HTTP 오류: {response.status_code}")
-                print(f"   [INFO] 네트워크 연결을 확인하거나 잠시 후 다시 시도하세요.")
-                return [{"error": f"HTTP {response.status_code}"}]
+            disclosures = [
+                format_disclosure(item)
+                for item in client.iter_disclosures(start_date, end_date, corp_code=corp_code, keywords=IMPORTANT_REPORTS)
+            ]
+
+            # 구간별 도착 순서와 무관하게 최신 공시 순으로 정렬
+            disclosures.sort(key=lambda d: (d['submitted_date'], d['url']), reverse=True)
 
             print(f"   [OK] 공시 정보 수집 완료: {len(disclosures)}건")
             return disclosures
 
+        except DartApiError as e:
+            print(f"   [ERROR] DART API 오류: {str(e)}")
+            print(f"   [INFO] DART API 키를 확인하거나 네트워크를 점검하세요.")
+            return [{"error": str(e)}]
         except requests.exceptions.RequestException as e:
             print(f"   [ERROR] 네트워크 오류: {str(e)}")
             print(f"   [INFO] 인터넷 연결을 확인하세요.")
@@ -313,32 +303,145 @@ class DataCollector:
             print(f"   [INFO] DART API 키를 확인하거나 네트워크를 점검하세요.")
             return [{"error": str(e)}]
 
-    def collect_all_data(self, ticker: str, output_file: str = None) -> Dict[str, Any]:
+    def _fetch_source(self, source: str, func, *args):
+        """소스별 호출 제한을 적용해 수집 함수 실행"""
+        with span(f"collect.{source}", ticker=args[0]) as s:
+            wait_start = time.perf_counter()
+            _source_limiters[source].acquire()
+            s.set_attribute("rate_limit_wait_ms", round((time.perf_counter() - wait_start) * 1000, 1))
+
+            result = func(*args)
+            items = result if isinstance(result, list) else result.get('data', [])
+            s.set_attribute("items", len(items))
+            return result
+
+    def _collect_disclosures(self, ticker: str, get_disclosures) -> List[Dict[str, str]]:
+        """공시 수집 (호출 제한은 DART 페이지 요청마다 적용)"""
+        with span("collect.dart", ticker=ticker) as s:
+            disclosures = get_disclosures(ticker)
+            s.set_attribute("items", len(disclosures))
+            return disclosures
+
+    def _collect_news(self, ticker: str) -> List[Dict[str, str]]:
+        """회사명을 메타데이터 캐시에서 확인한 뒤 뉴스 수집"""
+        company_name = self.metadata_cache.get_info(ticker).get('longName')
+        return self._fetch_source("news", self.get_news_headlines, ticker, company_name)
+
+    def _collect_sources_concurrently(
+        self,
+        ticker: str,
+        get_disclosures=None
+    ) -> Tuple[Dict[str, Any], List[Dict[str, str]], List[Dict[str, str]]]:
+        """
+        주가/뉴스/공시를 동시에 수집
+
+        뉴스 검색어에 필요한 회사명은 주가 수집과 같은 메타데이터 캐시에서 가져오므로
+        세 소스가 서로를 기다리지 않습니다.
+
+        Args:
+            ticker: 종목 티커
+            get_disclosures: 공시 수집 함수 (None이면 get_dart_disclosures)
+
+        Returns:
+            (주가 데이터, 뉴스 리스트, 공시 리스트)
+        """
+        get_disclosures = get_disclosures or self.get_dart_disclosures
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            # propagate: 각 작업의 스팬이 호출한 쪽 스팬의 자식으로 기록되도록 컨텍스트 전달
+            stock_future = executor.submit(propagate(self._fetch_source), "price", self.get_stock_data, ticker)
+            news_future = executor.submit(propagate(self._collect_news), ticker)
+            dart_future = executor.submit(propagate(self._collect_disclosures), ticker, get_disclosures)
+
+            return stock_future.result(), news_future.result(), dart_future.result()
+
+    def get_indexed_disclosures(self, ticker: str, days: int = 30) -> List[Dict[str, str]]:
+        """
+        시장 전체 공시 색인에서 종목 공시 조회 (종목별 API 호출 없음)
+
+        Args:
+            ticker: 종목 티커 (예: '005930.KS')
+            days: 조회 기간 (일)
+
+        Returns:
+            공시 정보 리스트
+        """
+        if not self.dart_initialized:
+            return self.get_dart_disclosures(ticker, days)
+
+        try:
+            # 이미 수집한 날짜는 건너뛰므로 여러 종목을 연달아 조회해도 시장 전체 요청은 한 번
+            self.disclosure_index.sync(days)
+        except Exception as e:
+            print(f"   [WARN] DART market-wide sync failed, using indexed data: {str(e)}")
+
+        disclosures = self.disclosure_index.get(ticker, days)
+        print(f"   [OK] 공시 정보 (색인): {len(disclosures)}건")
+        return disclosures
+
+    def collect_all_data(
+        self,
+        ticker: str,
+        output_file: str = None,
+        concurrent: bool = True,
+        use_disclosure_index: bool = False
+    ) -> Dict[str, Any]:
         """
         모든 데이터를 수집하고 JSON으로 저장
 
         Args:
             ticker: 종목 티커
             output_file: 저장할 파일명 (None이면 자동 생성)
+            concurrent: True면 주가/뉴스/공시를 동시에 수집
+            use_disclosure_index: True면 종목별 DART 조회 대신 시장 전체 공시 색인 사용
 
         Returns:
             수집된 모든 데이터
         """
+        result, _ = self.collect_snapshot(ticker, output_file, concurrent, use_disclosure_index)
+        return result
+
+    def collect_snapshot(
+        self,
+        ticker: str,
+        output_file: str = None,
+        concurrent: bool = True,
+        use_disclosure_index: bool = False
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        모든 데이터를 수집하고 저장 경로와 함께 반환
+
+        파일 기록은 SnapshotStore 작성 스레드가 백그라운드에서 처리하므로,
+        분석은 반환된 데이터를 바로 사용하면 됩니다 (파일을 다시 읽을 필요 없음).
+
+        Args:
+            ticker: 종목 티커
+            output_file: 저장할 파일명 (None이면 자동 생성)
+            concurrent: True면 주가/뉴스/공시를 동시에 수집
+            use_disclosure_index: True면 종목별 DART 조회 대신 시장 전체 공시 색인 사용
+
+        Returns:
+            (수집된 모든 데이터, 저장될 JSON 파일 경로)
+        """
         print(f"\n{'='*60}")
         print(f"[START] Data collection: {ticker}")
         print(f"{'='*60}\n")
 
-        # 1. 주가 데이터 수집
-        stock_data = self.get_stock_data(ticker)
-        time.sleep(1)  # API 호출 간격
+        get_disclosures = self.get_indexed_disclosures if use_disclosure_index else self.get_dart_disclosures
 
-        # 2. 뉴스 수집
-        company_name = stock_data.get('company_name', None)
-        news_data = self.get_news_headlines(ticker, company_name)
-        time.sleep(2)  # 크롤링 간격
+        with span("collect", ticker=ticker, concurrent=concurrent):
+            if concurrent:
+                stock_data, news_data, disclosure_data = self._collect_sources_concurrently(ticker, get_disclosures)
+            else:
+                # 1. 주가 데이터 수집
+                stock_data = self._fetch_source("price", self.get_stock_data, ticker)
+
+                # 2. 뉴스 수집
+                company_name = stock_data.get('company_name', None)
+                news_data = self._fetch_source("news", self.get_news_headlines, ticker, company_name)
 
-        # 3. 공시 정보 수집
-        disclosure_data = self.get_dart_disclosures(ticker)
+                # 3. 공시 정보 수집 (페이지 요청마다 호출 제한 적용)
+                disclosure_data = self._collect_disclosures(ticker, get_disclosures)
 
         # 전체 데이터 구성
         result = {
@@ -349,31 +452,15 @@ class DataCollector:
             "disclosures": disclosure_data
         }
 
-        # JSON 파일로 저장
-        if output_file is None:
-            # 자동 파일명 생성
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            stock_code = ticker.replace('.', '_')
-            output_file = f"data_{stock_code}_{timestamp}.json"
-
-        output_path = os.path.join(
-            os.path.dirname(__file__),
-            'data',
-            output_file
-        )
-
-        # data 디렉토리 생성
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        # JSON 파일 저장 예약 (백그라운드 기록 + 스냅샷 색인 등록)
+        output_path = get_snapshot_store().save(result, output_file)
 
         print(f"\n{'='*60}")
         print(f"[COMPLETE] Data collection finished!")
         print(f"[SAVED] File: {output_path}")
         print(f"{'='*60}\n")
 
-        return result
+        return result, output_path
 
 
 def main():
@@ -25,7 +25,7 @@ def run_full_analysis(ticker: str):
     print("-" * 80)
 
     collector = DataCollector()
-    data_result = collector.collect_all_data(ticker)
+    data_result, data_file = collector.collect_snapshot(ticker)
 
     # 수집 결과 요약
     print("\n[OK] Data collection complete:")
@@ -41,20 +41,9 @@ def run_full_analysis(ticker: str):
     print("[STEP 2] Critical analysis starting...")
     print("-" * 80)
 
-    # 방금 생성된 JSON 파일 경로 찾기
-    data_dir = os.path.join(os.path.dirname(__file__), 'data')
-    import glob
-    json_files = glob.glob(os.path.join(data_dir, f"data_{ticker.replace('.', '_')}*.json"))
-
-    if not json_files:
-        print("[ERROR] Collected data file not found")
-        return
-
-    latest_file = max(json_files, key=os.path.getmtime)
-
-    # 분석 실행
+    # 분석 실행 (수집 결과를 메모리에서 바로 사용)
     analyzer = CriticalAnalyzer()
-    analysis_result = analyzer.analyze(latest_file)
+    analysis_result = analyzer.analyze(data_result, source_file=data_file)
 
     # 3단계: 결과 저장
     print(f"\n{'='*80}")
@@ -0,0 +1,230 @@
+"""
+Global Macro Intelligence Hub - HTTP Cache
+조건부 요청(ETag/Last-Modified)과 TTL을 지원하는 디스크 HTTP 응답 캐시 모듈
+"""
+
+import requests
+import sqlite3
+import threading
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlencode, urlsplit
+from typing import Dict, Any, Callable, Optional
+
+from http_client import HttpClient, get_http_client
+from providers import get_provider_recorder
+from tracing import span
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), 'cache', 'http_cache.sqlite3')
+
+
+class CachedResponse:
+    """캐시 조회 결과 (requests.Response에서 사용하는 속성만 제공)"""
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Dict[str, str] = None, from_cache: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"HTTP {self.status_code} for {self.url}")
+
+
+class HttpCache:
+    """
+    디스크 HTTP 응답 캐시
+
+    - ttl_seconds 이내의 항목은 네트워크 요청 없이 반환
+    - TTL이 지난 항목은 If-None-Match / If-Modified-Since로 재검증 (304면 본문 재사용)
+    - 전체 본문 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+    - 네트워크 오류나 서버 오류(5xx/429) 시 만료된 항목이라도 있으면 반환
+    - cacheable 검사를 통과한 200 응답만 저장 (본문에 오류를 담아 200으로 응답하는 API 대비)
+    """
+
+    def __init__(self, cache_path: str = None, max_bytes: int = 64 * 1024 * 1024, client: HttpClient = None):
+        """
+        Args:
+            cache_path: SQLite 파일 경로 (기본: cache/http_cache.sqlite3)
+            max_bytes: 캐시 본문 총 크기 상한 (바이트)
+            client: 네트워크 요청에 사용할 HttpClient (None이면 공용 클라이언트)
+        """
+        self.cache_path = cache_path or DEFAULT_CACHE_PATH
+        self.max_bytes = max_bytes
+        self.client = client or get_http_client()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    headers TEXT,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.cache_path, timeout=30)
+
+    @staticmethod
+    def _key(url: str, params: Dict[str, Any] = None) -> str:
+        """URL + 정렬된 쿼리 파라미터 해시 (API 키가 평문으로 저장되지 않음)"""
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f"{url}?{query}".encode('utf-8')).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT url, etag, last_modified, headers, body, stored_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+
+        url, etag, last_modified, headers, body, stored_at = row
+        return {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": json.loads(headers or "{}"),
+            "body": body,
+            "stored_at": stored_at,
+        }
+
+    def _store(self, key: str, url: str, response: requests.Response):
+        now = time.time()
+        headers = {k: v for k, v in response.headers.items() if k.lower() in ('content-type', 'etag', 'last-modified')}
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, etag, last_modified, headers, body, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, url,
+                    response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                    json.dumps(headers), response.content, len(response.content), now, now
+                )
+            )
+            self._evict(conn)
+
+    def _touch(self, key: str):
+        """304 재검증 성공 시 저장 시각 갱신"""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+
+    def _evict(self, conn: sqlite3.Connection):
+        """용량 초과분을 LRU 순서로 삭제"""
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY accessed_at DESC").fetchall()
+        total = 0
+        expired = []
+        for key, size in rows:
+            total += size
+            if total > self.max_bytes:
+                expired.append((key,))
+        if expired:
+            conn.executemany("DELETE FROM responses WHERE key = ?", expired)
+
+    def get(
+        self,
+        url: str,
+        params: Dict[str, Any] = None,
+        ttl_seconds: float = 300,
+        timeout: Optional[float] = None,
+        cacheable: Callable[[requests.Response], bool] = None
+    ) -> CachedResponse:
+        """
+        캐시 경유 GET 요청
+
+        Args:
+            url: 요청 URL
+            params: 쿼리 파라미터
+            ttl_seconds: 재검증 없이 캐시를 사용할 시간 (초)
+            timeout: 요청 타임아웃 (초)
+            cacheable: 200 응답을 저장할지 판단하는 함수 (None이면 200 응답 모두 저장)
+
+        Returns:
+            CachedResponse (from_cache=True면 본문을 캐시에서 가져옴)
+        """
+        with span("http_cache.get", host=urlsplit(url).netloc) as s:
+            response = self._get(url, params, ttl_seconds, timeout, cacheable)
+            s.set_attributes(from_cache=response.from_cache, status=response.status_code, bytes=len(response.content))
+            return response
+
+    def _get(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        ttl_seconds: float,
+        timeout: Optional[float],
+        cacheable: Optional[Callable[[requests.Response], bool]]
+    ) -> CachedResponse:
+        key = self._key(url, params)
+        entry = self._lookup(key)
+
+        if entry and (time.time() - entry['stored_at']) < ttl_seconds:
+            return CachedResponse(url, 200, entry['body'], entry['headers'], from_cache=True)
+
+        # 기록/재생 모드에서는 304 응답이 픽스처를 덮어쓰지 않도록 항상 전체 본문 요청
+        headers = {}
+        if entry and get_provider_recorder().mode == 'live':
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = self.client.get(url, params=params, timeout=timeout, headers=headers)
+        except requests.exceptions.RequestException as e:
+            if entry is None:
+                raise
+            print(f"   [WARN] Request failed, serving stale cache: {str(e)}")
+            return CachedResponse(url, 200, entry['body'], entry['headers'], from_cache=True)
+
+        if response.status_code == 304 and entry:
+            self._touch(key)
+            return CachedResponse(url, 200, entry['body'], entry['headers'], from_cache=True)
+
+        # 재시도를 모두 소진한 서버 오류는 예외 없이 응답으로 돌아옴
+        if entry and (response.status_code >= 500 or response.status_code == 429):
+            print(f"   [WARN] HTTP {response.status_code}, serving stale cache")
+            return CachedResponse(url, 200, entry['body'], entry['headers'], from_cache=True)
+
+        if response.status_code == 200 and (cacheable is None or cacheable(response)):
+            self._store(key, url, response)
+
+        return CachedResponse(url, response.status_code, response.content, dict(response.headers))
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """프로세스 공용 HttpCache 반환"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache()
+        return _default_cache
@@ -0,0 +1,210 @@
+"""
+Global Macro Intelligence Hub - HTTP Client
+연결 재사용(keep-alive), 호스트별 동시 연결 제한, 재시도/백오프를 제공하는 공용 HTTP 모듈
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, quote
+import threading
+import pickle
+from typing import Dict, List, Any, Optional
+
+from providers import get_provider_recorder
+from tracing import span
+
+
+# 일시적 오류로 보고 재시도할 HTTP 상태 코드
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# 픽스처 키와 기록 내용에서 제외할 비밀 쿼리 파라미터
+SECRET_PARAMS = ('crtfc_key',)
+
+
+def _build_retry(max_retries: int, backoff_factor: float, backoff_jitter: float) -> Retry:
+    """지수 백오프 + 지터 재시도 정책 생성"""
+    options = dict(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=backoff_jitter, **options)
+    except TypeError:
+        # urllib3 1.x는 지터 옵션이 없음
+        return Retry(**options)
+
+
+def _redact_url(url: str) -> str:
+    """URL 쿼리에서 비밀 파라미터 제거"""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _redact_text(text: str, secrets: List[str]) -> str:
+    """문자열에 그대로 또는 URL 인코딩되어 들어간 비밀 값 가리기"""
+    for secret in secrets:
+        text = text.replace(secret, '***').replace(quote(secret, safe=''), '***')
+    return text
+
+
+def _response_to_record(response: requests.Response, secrets: List[str] = None) -> Dict[str, Any]:
+    """
+    픽스처 저장용 응답 요약 (URL/헤더의 비밀 값 제거)
+
+    Args:
+        response: 응답 객체
+        secrets: 요청에 사용한 비밀 파라미터 값
+
+    Returns:
+        기록할 응답 딕셔너리
+
+    Raises:
+        ValueError: 제거 후에도 비밀 값이 남아 있으면 (본문에 키가 포함된 경우 등) 기록하지 않음
+    """
+    secrets = [secret for secret in (secrets or []) if secret]
+    record = {
+        "url": _redact_url(response.url),
+        "status_code": response.status_code,
+        "headers": {k: _redact_text(v, secrets) for k, v in response.headers.items()},
+        "content": response.content,
+    }
+
+    payload = pickle.dumps(record)
+    for secret in secrets:
+        if secret.encode('utf-8') in payload or quote(secret, safe='').encode('utf-8') in payload:
+            raise ValueError(f"Refusing to record fixture for {record['url']}: response contains a secret parameter")
+
+    return record
+
+
+def _response_from_record(record: Dict[str, Any]) -> requests.Response:
+    """픽스처로부터 응답 객체 복원"""
+    response = requests.Response()
+    response.url = record["url"]
+    response.status_code = record["status_code"]
+    response.headers = CaseInsensitiveDict(record["headers"])
+    response._content = record["content"]
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+class HttpClient:
+    """
+    공용 HTTP 클라이언트 (스레드 안전)
+
+    - requests.Session 하나로 TCP/TLS 연결을 재사용
+    - 호스트별 세마포어로 동시 요청 수 제한
+    - 연결 오류/429/5xx는 지터가 섞인 지수 백오프로 재시도
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_jitter: float = 0.5,
+        pool_maxsize: int = 16,
+        per_host_limit: int = 4,
+        host_limits: Dict[str, int] = None,
+        user_agent: str = "GlobalMacroIntelligenceHub/1.0"
+    ):
+        """
+        Args:
+            timeout: 기본 요청 타임아웃 (초)
+            max_retries: 최대 재시도 횟수
+            backoff_factor: 지수 백오프 계수 (factor * 2^(시도-1) 초)
+            backoff_jitter: 백오프에 더할 최대 무작위 지연 (초)
+            pool_maxsize: 호스트별 연결 풀 크기
+            per_host_limit: 호스트별 기본 동시 요청 수
+            host_limits: 호스트별 동시 요청 수 재정의 (예: {"news.google.com": 2})
+            user_agent: User-Agent 헤더
+        """
+        self.timeout = timeout
+        self.per_host_limit = per_host_limit
+        self.host_limits = dict(host_limits or {})
+
+        self._host_semaphores = {}
+        self._lock = threading.Lock()
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+            max_retries=_build_retry(max_retries, backoff_factor, backoff_jitter)
+        )
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": user_agent})
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        """호스트별 동시 요청 세마포어"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_semaphores:
+                limit = self.host_limits.get(host, self.per_host_limit)
+                self._host_semaphores[host] = threading.BoundedSemaphore(limit)
+            return self._host_semaphores[host]
+
+    def request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs: Any) -> requests.Response:
+        """
+        HTTP 요청 (재시도 소진 후 연결 오류는 requests 예외로 전달)
+
+        Args:
+            method: HTTP 메서드
+            url: 요청 URL
+            timeout: 요청 타임아웃 (None이면 기본값)
+            **kwargs: requests.Session.request 인자
+
+        Returns:
+            응답 객체
+        """
+        def send() -> requests.Response:
+            with self._host_semaphore(url):
+                return self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+
+        with span("http.request", method=method, host=urlsplit(url).netloc) as s:
+            recorder = get_provider_recorder()
+            if recorder.mode == 'live' and recorder.backend is None:
+                response = send()
+            else:
+                # 기록/재생: 메서드 + URL + (비밀 값을 제외한) 쿼리 파라미터로 식별
+                all_params = kwargs.get('params') or {}
+                params = {k: v for k, v in all_params.items() if k not in SECRET_PARAMS}
+                secrets = [str(v) for k, v in all_params.items() if k in SECRET_PARAMS]
+                record = recorder.call(
+                    'http',
+                    {"method": method, "url": url, "params": params},
+                    lambda: _response_to_record(send(), secrets)
+                )
+                response = _response_from_record(record)
+
+            s.set_attributes(status=response.status_code, bytes=len(response.content))
+            return response
+
+    def get(self, url: str, params: Dict[str, Any] = None, timeout: Optional[float] = None, **kwargs: Any) -> requests.Response:
+        """GET 요청"""
+        return self.request("GET", url, params=params, timeout=timeout, **kwargs)
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """프로세스 공용 HttpClient 반환"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient(host_limits={"news.google.com": 2})
+        return _default_client
@@ -0,0 +1,398 @@
+"""
+Global Macro Intelligence Hub - Indicator State
+종목별 Wilder RSI / 이동평균 상태를 보관하고 새 봉마다 O(1)로 갱신하는 모듈
+"""
+
+import pandas as pd
+import sqlite3
+import threading
+import json
+import math
+import os
+from typing import Dict, List, Any, Optional
+
+from price_store import PriceStore, DEFAULT_DB_PATH, REBASE_TOLERANCE
+
+
+class TickerIndicatorState:
+    """
+    단일 종목 지표 상태
+
+    - RSI: Wilder 평활 (최초 period개 변화량은 단순평균으로 시드)
+    - MA5/MA20: 최근 20개 종가 창과 누적합
+    - prev: 마지막 봉 반영 직전 상태 (같은 날짜 봉이 다시 들어오면 되돌린 뒤 재적용)
+    - revision: 시드에 사용한 PriceStore 이력 revision (바뀌면 다시 시드)
+    """
+
+    def __init__(self, rsi_period: int = 14, ma_windows: List[int] = None):
+        self.rsi_period = rsi_period
+        self.ma_windows = ma_windows or [5, 20]
+
+        self.last_date = None
+        self.last_close = None
+        self.n_deltas = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.closes = []
+        self.sums = {str(w): 0.0 for w in self.ma_windows}
+        self.prev = None
+        self.revision = 0
+
+    def _core(self) -> Dict[str, Any]:
+        """prev를 제외한 상태 값"""
+        return {
+            "rsi_period": self.rsi_period,
+            "ma_windows": self.ma_windows,
+            "last_date": self.last_date,
+            "last_close": self.last_close,
+            "n_deltas": self.n_deltas,
+            "avg_gain": self.avg_gain,
+            "avg_loss": self.avg_loss,
+            "closes": list(self.closes),
+            "sums": dict(self.sums),
+        }
+
+    def _restore(self, core: Dict[str, Any]):
+        """상태 값 복원"""
+        self.rsi_period = core["rsi_period"]
+        self.ma_windows = core["ma_windows"]
+        self.last_date = core["last_date"]
+        self.last_close = core["last_close"]
+        self.n_deltas = core["n_deltas"]
+        self.avg_gain = core["avg_gain"]
+        self.avg_loss = core["avg_loss"]
+        self.closes = list(core["closes"])
+        self.sums = dict(core["sums"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """직렬화"""
+        return dict(self._core(), prev=self.prev, revision=self.revision)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TickerIndicatorState':
+        """역직렬화"""
+        state = cls()
+        state._restore(data)
+        state.prev = data.get("prev")
+        state.revision = data.get("revision", 0)
+        return state
+
+    def matches(self, closes: pd.Series) -> bool:
+        """
+        마지막 반영일 이전 봉이 상태의 종가 창과 일치하는지 여부
+
+        과거 봉이 보충되었거나 수정 기준이 바뀐(분할/배당) 이력이면 False입니다.
+
+        Args:
+            closes: 종가 시리즈 (DatetimeIndex, 오름차순, NaN 제외)
+        """
+        if self.last_date is None:
+            return True
+
+        dates = closes.index.strftime('%Y-%m-%d')
+        earlier = closes.to_numpy(dtype=float)[dates < self.last_date]
+
+        # closes[-1]은 마지막 반영일 종가
+        window = self.closes[:-1]
+        n = min(len(earlier), len(window))
+        return all(
+            math.isclose(a, b, rel_tol=REBASE_TOLERANCE)
+            for a, b in zip(earlier[len(earlier) - n:], window[len(window) - n:])
+        )
+
+    def _apply(self, close: float):
+        """봉 하나 반영 (O(1))"""
+        period = self.rsi_period
+
+        if self.last_close is not None:
+            delta = close - self.last_close
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            self.n_deltas += 1
+
+            if self.n_deltas <= period:
+                # 시드 구간: 단순 누적 후 period개가 모이면 평균
+                self.avg_gain += gain
+                self.avg_loss += loss
+                if self.n_deltas == period:
+                    self.avg_gain /= period
+                    self.avg_loss /= period
+            else:
+                # Wilder 평활
+                self.avg_gain = (self.avg_gain * (period - 1) + gain) / period
+                self.avg_loss = (self.avg_loss * (period - 1) + loss) / period
+
+        self.closes.append(close)
+        for window in self.ma_windows:
+            key = str(window)
+            self.sums[key] += close
+            if len(self.closes) > window:
+                self.sums[key] -= self.closes[-window - 1]
+
+        # 가장 긴 이동평균 창만 유지
+        max_window = max(self.ma_windows)
+        if len(self.closes) > max_window:
+            self.closes = self.closes[-max_window:]
+
+        self.last_close = close
+
+    def update(self, date: str, close: float):
+        """
+        새 봉 반영
+
+        Args:
+            date: 봉 날짜 ('YYYY-MM-DD')
+            close: 종가
+        """
+        if self.last_date is not None and date < self.last_date:
+            # 과거 봉은 matches()로 확인 후 다시 시드해야 반영됨
+            return
+
+        if date == self.last_date:
+            # 장중 갱신: 직전 상태로 되돌린 뒤 다시 반영
+            if self.prev is None:
+                return
+            self._restore(self.prev)
+        else:
+            self.prev = self._core()
+
+        self._apply(close)
+        self.last_date = date
+
+    def rsi(self) -> Optional[float]:
+        """현재 RSI (시드 구간이면 None)"""
+        if self.n_deltas < self.rsi_period:
+            return None
+        if self.avg_loss == 0:
+            return 100.0 if self.avg_gain > 0 else 50.0
+        rs = self.avg_gain / self.avg_loss
+        return 100 - (100 / (1 + rs))
+
+    def ma(self, window: int) -> Optional[float]:
+        """현재 이동평균 (데이터 부족 시 None)"""
+        if len(self.closes) < window:
+            return None
+        return self.sums[str(window)] / window
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        현재 지표 값과 직전 봉 기준 이동평균
+
+        Returns:
+            {"date", "close", "rsi", "ma5", "ma20", "ma5_prev", "ma20_prev"}
+        """
+        result = {
+            "date": self.last_date,
+            "close": self.last_close,
+            "rsi": self.rsi(),
+        }
+
+        previous = TickerIndicatorState.from_dict(self.prev) if self.prev else None
+        for window in self.ma_windows:
+            result[f"ma{window}"] = self.ma(window)
+            result[f"ma{window}_prev"] = previous.ma(window) if previous else None
+
+        return result
+
+
+class IndicatorStateStore:
+    """종목별 지표 상태 저장소 (PriceStore와 같은 SQLite 파일 사용)"""
+
+    def __init__(self, db_path: str = None, rsi_period: int = 14):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (기본: cache/prices.sqlite3)
+            rsi_period: RSI 계산 기간
+        """
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self.rsi_period = rsi_period
+        self._lock = threading.Lock()
+        self._states = {}
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS indicator_state (
+                    ticker TEXT PRIMARY KEY,
+                    state TEXT NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get_many(self, tickers: List[str]) -> Dict[str, TickerIndicatorState]:
+        """여러 종목 상태 조회 (메모리에 없는 종목만 한 번의 쿼리로 로드, 없으면 빈 상태)"""
+        with self._lock:
+            states = {t: self._states[t] for t in tickers if t in self._states}
+        missing = [t for t in tickers if t not in states]
+        if not missing:
+            return states
+
+        rows = []
+        with self._connect() as conn:
+            for i in range(0, len(missing), 500):
+                chunk = missing[i:i + 500]
+                rows += conn.execute(
+                    f"SELECT ticker, state FROM indicator_state WHERE ticker IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+        loaded = {ticker: TickerIndicatorState.from_dict(json.loads(state)) for ticker, state in rows}
+
+        with self._lock:
+            for ticker in missing:
+                states[ticker] = self._states.setdefault(
+                    ticker, loaded.get(ticker) or TickerIndicatorState(self.rsi_period)
+                )
+        return states
+
+    def get(self, ticker: str) -> TickerIndicatorState:
+        """종목 상태 조회 (없으면 빈 상태)"""
+        return self.get_many([ticker])[ticker]
+
+    def save_many(self, states: Dict[str, TickerIndicatorState]):
+        """여러 종목 상태를 한 트랜잭션으로 저장"""
+        if not states:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO indicator_state (ticker, state) VALUES (?, ?)",
+                [(ticker, json.dumps(state.to_dict())) for ticker, state in states.items()]
+            )
+
+    def save(self, ticker: str, state: TickerIndicatorState):
+        """종목 상태 저장"""
+        self.save_many({ticker: state})
+
+    def _reset(self, ticker: str, revision: int) -> TickerIndicatorState:
+        """빈 상태로 교체 (다시 시드할 때, 호출 측에서 _lock 보유)"""
+        state = TickerIndicatorState(self.rsi_period)
+        state.revision = revision
+        self._states[ticker] = state
+        return state
+
+    @staticmethod
+    def _advance(state: TickerIndicatorState, closes: pd.Series) -> bool:
+        """마지막 반영일(장중 갱신 포함) 이후 봉만 반영 (호출 측에서 _lock 보유)"""
+        dates = closes.index.strftime('%Y-%m-%d')
+        values = closes.to_numpy(dtype=float)
+
+        if state.last_date is not None:
+            mask = dates >= state.last_date
+            dates, values = dates[mask], values[mask]
+
+        for date_str, close in zip(dates, values):
+            state.update(date_str, float(close))
+        return len(values) > 0
+
+    def update(self, ticker: str, hist: pd.DataFrame, save: bool = True) -> Dict[str, Any]:
+        """
+        일봉 데이터 중 마지막 반영일 이후 봉만 상태에 반영
+
+        마지막 반영일 이전 봉이 상태와 다르면(과거 봉 보충, 분할/배당) hist 전체로 다시 시드합니다.
+
+        Args:
+            ticker: 종목 티커
+            hist: OHLCV DataFrame (DatetimeIndex, 오름차순)
+            save: 변경 시 저장 여부
+
+        Returns:
+            지표 스냅샷 (TickerIndicatorState.snapshot)
+        """
+        state = self.get(ticker)
+        closes = hist['Close'].dropna()
+
+        with self._lock:
+            reseed = not state.matches(closes)
+            if reseed:
+                print(f"   [INFO] {ticker} price history changed, re-seeding indicator state")
+                state = self._reset(ticker, state.revision)
+
+            changed = self._advance(state, closes) or reseed
+            snapshot = state.snapshot()
+
+        if changed and save:
+            self.save(ticker, state)
+
+        return snapshot
+
+    def update_many_from_store(
+        self,
+        tickers: List[str],
+        price_store: PriceStore,
+        closes: pd.DataFrame = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 종목 상태 일괄 갱신 (상태 로드/저장은 각각 한 번의 쿼리/트랜잭션)
+
+        처음 보는 종목, 저장소 이력 revision이 바뀐 종목, 과거 봉이 상태와 다른 종목은
+        저장소 전체 이력으로 다시 시드합니다.
+
+        Args:
+            tickers: 종목 티커 리스트
+            price_store: 로컬 일봉 저장소
+            closes: 이미 조회한 최근 (날짜 × 종목) 종가 행렬 (마지막 반영일 이후 봉이 없는 종목은 저장소에서 조회)
+
+        Returns:
+            {티커: 지표 스냅샷}
+        """
+        tickers = list(tickers)
+        states = self.get_many(tickers)
+        revisions = price_store.revisions(tickers)
+
+        snapshots = {}
+        changed = {}
+        for ticker in tickers:
+            state = states[ticker]
+            column = closes.get(ticker) if closes is not None else None
+            column = column.dropna() if column is not None else None
+
+            reseed = (
+                state.last_date is None
+                or state.revision != revisions[ticker]
+                or (column is not None and not state.matches(column))
+            )
+            if reseed:
+                if state.last_date is not None:
+                    print(f"   [INFO] {ticker} price history changed, re-seeding indicator state")
+                column = price_store.read(ticker)['Close'].dropna()
+            elif column is None or len(column) == 0 or column.index[0].strftime('%Y-%m-%d') > state.last_date:
+                column = price_store.read(ticker, start=state.last_date)['Close'].dropna()
+
+            with self._lock:
+                if reseed:
+                    state = self._reset(ticker, revisions[ticker])
+                if self._advance(state, column) or reseed:
+                    changed[ticker] = state
+                snapshots[ticker] = state.snapshot()
+
+        self.save_many(changed)
+        return snapshots
+
+    def update_from_store(self, ticker: str, price_store: PriceStore, hist: pd.DataFrame = None) -> Dict[str, Any]:
+        """
+        상태 갱신 (처음 보는 종목이나 이력이 바뀐 종목은 저장소 전체 이력으로 시드)
+
+        Args:
+            ticker: 종목 티커
+            price_store: 로컬 일봉 저장소
+            hist: 이미 조회한 최근 일봉 (마지막 반영일 이후 봉이 포함되어 있어야 함)
+
+        Returns:
+            지표 스냅샷
+        """
+        closes = hist[['Close']].rename(columns={'Close': ticker}) if hist is not None else None
+        return self.update_many_from_store([ticker], price_store, closes)[ticker]
+
+
+_default_state_store = None
+_default_state_store_lock = threading.Lock()
+
+
+def get_indicator_state_store() -> IndicatorStateStore:
+    """프로세스 공용 IndicatorStateStore 반환"""
+    global _default_state_store
+    with _default_state_store_lock:
+        if _default_state_store is None:
+            _default_state_store = IndicatorStateStore()
+        return _default_state_store
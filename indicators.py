@@ -0,0 +1,114 @@
+"""
+Global Macro Intelligence Hub - Indicator Engine
+(날짜 × 종목) 가격/거래량 행렬에서 전 종목 기술적 지표를 한 번에 계산하는 모듈
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+
+def build_field_matrix(histories: Dict[str, pd.DataFrame], field: str) -> pd.DataFrame:
+    """
+    종목별 일봉 데이터를 (날짜 × 종목) 행렬로 변환
+
+    Args:
+        histories: {티커: OHLCV DataFrame}
+        field: 추출할 컬럼 (예: 'Close', 'Volume')
+
+    Returns:
+        날짜 인덱스, 티커 컬럼의 DataFrame (거래 없는 칸은 NaN)
+    """
+    series = {ticker: hist[field] for ticker, hist in histories.items() if field in hist.columns}
+    if not series:
+        return pd.DataFrame()
+
+    return pd.DataFrame(series).sort_index()
+
+
+def _bottom_justify(valid: np.ndarray, *arrays: np.ndarray) -> List[np.ndarray]:
+    """
+    각 열의 유효 봉을 순서를 유지한 채 아래쪽으로 정렬 (모든 배열에 같은 순서 적용)
+
+    종목마다 상장일/거래정지일이 달라도 마지막 행이 곧 각 종목의 최신 봉이 됩니다.
+    배열마다 따로 정렬하면 종가/거래량의 NaN 위치가 다를 때 날짜가 어긋나므로,
+    하나의 유효 마스크로 순서를 한 번만 계산하고 무효 칸은 모든 배열에서 NaN으로 둡니다.
+
+    Args:
+        valid: (날짜 × 종목) 유효 봉 마스크
+        arrays: 같은 모양의 값 배열들
+
+    Returns:
+        정렬된 배열 리스트 (arrays 순서)
+    """
+    order = np.argsort(valid, axis=0, kind='stable')
+    return [np.take_along_axis(np.where(valid, values, np.nan), order, axis=0) for values in arrays]
+
+
+def compute_screening_indicators(
+    close: np.ndarray,
+    volume: np.ndarray,
+    tickers: List[str],
+    rsi_period: int = 14,
+    volume_window: int = 20
+) -> pd.DataFrame:
+    """
+    전 종목 스크리닝 지표를 NumPy 연산 한 번으로 계산
+
+    StockScreener.analyze_stock과 동일한 정의를 사용합니다.
+    - RSI: 최근 rsi_period일 상승폭/하락폭 단순평균 기반
+    - 평균 거래량: 최근 volume_window일 (당일 포함)
+
+    Args:
+        close: (날짜 × 종목) 종가 행렬
+        volume: (날짜 × 종목) 거래량 행렬
+        tickers: 열 순서에 대응하는 티커 리스트
+        rsi_period: RSI 계산 기간
+        volume_window: 평균 거래량 계산 기간
+
+    Returns:
+        티커 인덱스의 지표 테이블 (유효 봉이 2개 미만인 종목은 제외)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    # 종가와 거래량이 모두 있는 봉만 유효 봉으로 사용
+    close, volume = _bottom_justify(~np.isnan(close) & ~np.isnan(volume), close, volume)
+
+    bars = np.count_nonzero(~np.isnan(close), axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 1. 현재가 및 등락률
+        current_price = close[-1]
+        previous_close = close[-2] if len(close) >= 2 else np.full(close.shape[1], np.nan)
+        price_change_pct = (current_price - previous_close) / previous_close * 100
+
+        # 2. 거래량 분석
+        current_volume = volume[-1]
+        avg_volume = np.nanmean(volume[-volume_window:], axis=0)
+        has_volume = avg_volume > 0
+        volume_change_pct = np.where(has_volume, (current_volume - avg_volume) / avg_volume * 100, 0.0)
+        volume_ratio = np.where(has_volume, current_volume / avg_volume, 1.0)
+
+        # 3. RSI (최근 rsi_period개 변화량의 평균 상승폭/하락폭)
+        delta = np.diff(close[-(rsi_period + 1):], axis=0)
+        gain = np.where(delta > 0, delta, 0.0).mean(axis=0)
+        loss = np.where(delta < 0, -delta, 0.0).mean(axis=0)
+        rs = gain / loss
+        rsi = 100 - (100 / (1 + rs))
+
+        # 변화량 개수가 부족하면 RSI 미정 (NaN 구간 포함)
+        rsi = np.where(np.isnan(delta).any(axis=0) | (delta.shape[0] < rsi_period), np.nan, rsi)
+
+    table = pd.DataFrame({
+        "current_price": current_price,
+        "previous_close": previous_close,
+        "price_change_pct": price_change_pct,
+        "current_volume": np.nan_to_num(current_volume).astype(np.int64),
+        "avg_volume_20d": avg_volume,
+        "volume_change_pct": volume_change_pct,
+        "volume_ratio": volume_ratio,
+        "rsi": rsi,
+        "bars": bars,
+    }, index=pd.Index(tickers, name="ticker"))
+
+    return table[table["bars"] >= 2]
@@ -0,0 +1,140 @@
+"""
+Global Macro Intelligence Hub - Local Batch Endpoint
+Anthropic Message Batches API(client.messages.batches)와 같은 인터페이스의 로컬 대체 엔드포인트
+
+기록/재생/합성 모드나 배치 API가 없는 공급자(Gemini)에서 배치 모드를 그대로 쓰기 위한 모듈입니다.
+요청은 백그라운드 작업자가 LLMClient.generate로 처리하므로 픽스처 기록/재생이 동일하게 적용됩니다.
+"""
+
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List, Any, Iterator
+
+from tracing import propagate
+
+
+class LocalBatchEndpoint:
+    """
+    로컬 메시지 배치 엔드포인트 (create / retrieve / results)
+
+    반환 객체는 SDK 응답과 같은 속성을 가진 SimpleNamespace입니다.
+    - batch: id, processing_status ('in_progress' | 'ended'), request_counts, created_at, ended_at
+    - results: custom_id, result.type ('succeeded' | 'errored'), result.message / result.error
+    배치 상태는 프로세스 메모리에만 있으므로, 다른 프로세스에서는 같은 배치를 조회할 수 없습니다.
+    """
+
+    def __init__(self, llm: Any, workers: int = 4):
+        """
+        Args:
+            llm: 요청을 처리할 LLMClient
+            workers: 동시에 처리할 요청 수
+        """
+        self.llm = llm
+        self.workers = workers
+        self._batches: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, requests: List[Dict[str, Any]]) -> SimpleNamespace:
+        """
+        배치 제출 (즉시 반환, 처리는 백그라운드)
+
+        Args:
+            requests: [{"custom_id", "params": messages.create 인자}, ...]
+
+        Returns:
+            batch 객체
+        """
+        batch_id = f"local_batch_{uuid.uuid4().hex[:16]}"
+        state = {
+            "id": batch_id,
+            "created_at": datetime.now().isoformat(),
+            "ended_at": None,
+            "requests": list(requests),
+            "results": {},
+        }
+        with self._lock:
+            self._batches[batch_id] = state
+
+        thread = threading.Thread(
+            target=propagate(self._process), args=(state,), name=f"{batch_id}-runner", daemon=True
+        )
+        thread.start()
+        return self.retrieve(batch_id)
+
+    def _process(self, state: Dict[str, Any]):
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for request in state["requests"]:
+                executor.submit(propagate(self._run_request), state, request)
+
+        with self._lock:
+            state["ended_at"] = datetime.now().isoformat()
+
+    def _run_request(self, state: Dict[str, Any], request: Dict[str, Any]):
+        params = request["params"]
+        system = params.get("system")
+        if isinstance(system, list):
+            system = "".join(block.get("text", "") for block in system)
+
+        try:
+            result = self.llm.generate(
+                params["messages"][0]["content"],
+                max_tokens=params["max_tokens"],
+                temperature=params.get("temperature", 1.0),
+                use_cache=False,
+                system=system
+            )
+            entry = SimpleNamespace(
+                type="succeeded",
+                message=SimpleNamespace(
+                    model=result.get("model"),
+                    content=[SimpleNamespace(type="text", text=result["text"])],
+                    usage=SimpleNamespace(**result.get("usage", {}))
+                )
+            )
+        except Exception as e:
+            entry = SimpleNamespace(
+                type="errored",
+                error=SimpleNamespace(type=type(e).__name__, message=str(e))
+            )
+
+        with self._lock:
+            state["results"][request["custom_id"]] = entry
+
+    def retrieve(self, batch_id: str) -> SimpleNamespace:
+        """배치 상태 조회"""
+        with self._lock:
+            state = self._batches.get(batch_id)
+            if state is None:
+                raise KeyError(f"Unknown batch: {batch_id}")
+
+            results = list(state["results"].values())
+            succeeded = sum(1 for entry in results if entry.type == "succeeded")
+            ended = state["ended_at"] is not None
+
+            return SimpleNamespace(
+                id=batch_id,
+                processing_status="ended" if ended else "in_progress",
+                request_counts=SimpleNamespace(
+                    processing=len(state["requests"]) - len(results),
+                    succeeded=succeeded,
+                    errored=len(results) - succeeded,
+                    canceled=0,
+                    expired=0
+                ),
+                created_at=state["created_at"],
+                ended_at=state["ended_at"]
+            )
+
+    def results(self, batch_id: str) -> Iterator[SimpleNamespace]:
+        """완료된 배치의 요청별 결과"""
+        with self._lock:
+            state = self._batches[batch_id]
+            if state["ended_at"] is None:
+                raise RuntimeError(f"Batch {batch_id} is still in progress")
+            entries = list(state["results"].items())
+
+        for custom_id, result in entries:
+            yield SimpleNamespace(custom_id=custom_id, result=result)
@@ -0,0 +1,157 @@
+"""
+Global Macro Intelligence Hub - LLM Response Cache
+모델/온도/프롬프트 해시로 LLM 응답을 재사용하는 디스크 캐시 모듈
+"""
+
+import sqlite3
+import threading
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Any, Optional
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), 'cache', 'llm_cache.sqlite3')
+
+
+class LLMCache:
+    """
+    LLM 응답 캐시 (내용 주소 방식)
+
+    - 키: provider + model + temperature + max_tokens + (system +) 프롬프트 원문의 SHA-256
+    - max_age_seconds가 지난 항목은 조회 시 무시하고 저장 시 삭제
+    - 전체 응답 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+    """
+
+    def __init__(
+        self,
+        cache_path: str = None,
+        max_bytes: int = 32 * 1024 * 1024,
+        max_age_seconds: float = 7 * 24 * 3600
+    ):
+        """
+        Args:
+            cache_path: SQLite 파일 경로 (기본: cache/llm_cache.sqlite3)
+            max_bytes: 캐시 응답 총 크기 상한 (바이트)
+            max_age_seconds: 응답 재사용 최대 기간 (초)
+        """
+        self.cache_path = cache_path or DEFAULT_CACHE_PATH
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    provider TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.cache_path, timeout=30)
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        prompt: str,
+        system: str = None
+    ) -> str:
+        """요청 파라미터 + (system +) 프롬프트 해시 (system이 없으면 기존 키와 동일)"""
+        header = json.dumps(
+            {"provider": provider, "model": model, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True
+        )
+        digest = hashlib.sha256(header.encode('utf-8'))
+        if system:
+            digest.update(b'\0system\0')
+            digest.update(system.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(prompt.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 응답 조회
+
+        Args:
+            key: make_key로 만든 키
+
+        Returns:
+            저장된 응답 (없거나 만료되면 None)
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            response, created_at = row
+            if (time.time() - created_at) >= self.max_age_seconds:
+                return None
+
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+
+        return json.loads(response)
+
+    def put(self, key: str, provider: str, model: str, response: Dict[str, Any]):
+        """
+        응답 저장 (저장 후 만료/용량 초과 항목 정리)
+
+        Args:
+            key: make_key로 만든 키
+            provider: LLM 공급자
+            model: 모델명
+            response: LLMClient.generate 결과
+        """
+        payload = json.dumps(response, ensure_ascii=False)
+        now = time.time()
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, provider, model, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, payload, len(payload.encode('utf-8')), now, now)
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """만료 항목 삭제 후 용량 초과분을 LRU 순서로 삭제"""
+        conn.execute("DELETE FROM responses WHERE created_at <= ?", (time.time() - self.max_age_seconds,))
+
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY accessed_at DESC").fetchall()
+        total = 0
+        expired = []
+        for key, size in rows:
+            total += size
+            if total > self.max_bytes:
+                expired.append((key,))
+        if expired:
+            conn.executemany("DELETE FROM responses WHERE key = ?", expired)
+
+    def clear(self):
+        """전체 캐시 삭제"""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """프로세스 공용 LLMCache 반환"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
@@ -0,0 +1,537 @@
+"""
+Global Macro Intelligence Hub - LLM Client
+Anthropic(Claude) / Gemini 호출을 한 곳으로 모은 모듈 (기록/재생 공급자 경유)
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Any, Callable, Iterator, Generator, Optional
+
+from providers import get_provider_recorder, ProviderRecorder
+from llm_cache import LLMCache, get_llm_cache
+from tracing import span, get_tracer, Span
+
+
+class TextStream:
+    """
+    스트리밍 생성 결과
+
+    반복하면 텍스트 조각을 도착 순서대로 반환하고, 반복이 끝나면
+    result에 전체 결과 딕셔너리가 채워집니다 (st.write_stream에 그대로 전달 가능).
+    """
+
+    def __init__(self, chunks: Generator[str, None, Dict[str, Any]]):
+        """
+        Args:
+            chunks: 텍스트 조각을 yield하고 전체 결과를 return하는 제너레이터
+        """
+        self._chunks = chunks
+        self.result: Optional[Dict[str, Any]] = None
+
+    def __iter__(self) -> Iterator[str]:
+        self.result = yield from self._chunks
+
+    def collect(self) -> Dict[str, Any]:
+        """남은 조각을 모두 소비하고 전체 결과 반환"""
+        for _ in self:
+            pass
+        return self.result
+
+
+def _anthropic_usage(usage: Any) -> Dict[str, Any]:
+    """Anthropic 사용량 (input_tokens는 캐시에서 읽거나 캐시에 쓴 토큰을 제외한 값)"""
+    return {
+        "input_tokens": getattr(usage, 'input_tokens', None),
+        "output_tokens": getattr(usage, 'output_tokens', None),
+        "cache_creation_input_tokens": getattr(usage, 'cache_creation_input_tokens', None),
+        "cache_read_input_tokens": getattr(usage, 'cache_read_input_tokens', None),
+    }
+
+
+def _gemini_usage(usage: Any) -> Dict[str, Any]:
+    """Gemini 사용량 (암묵적 캐시 적중 토큰은 cached_content_token_count, prompt_token_count에 포함)"""
+    cached_tokens = getattr(usage, 'cached_content_token_count', None)
+    prompt_tokens = getattr(usage, 'prompt_token_count', None)
+    if cached_tokens and prompt_tokens is not None:
+        prompt_tokens -= cached_tokens
+    return {
+        "input_tokens": prompt_tokens,
+        "output_tokens": getattr(usage, 'candidates_token_count', None),
+        "cache_creation_input_tokens": None,
+        "cache_read_input_tokens": cached_tokens,
+    }
+
+
+class LLMClient:
+    """
+    LLM 텍스트 생성 클라이언트
+
+    SDK 클라이언트는 첫 실제 호출 시점에 생성하므로, replay 모드에서는
+    API 키나 네트워크 없이도 동작합니다.
+
+    system에는 호출마다 바뀌지 않는 지시문(분석 프레임워크 등)을 넣습니다.
+    Anthropic은 system 블록에 cache_control을 지정해 공급자 측 프롬프트 캐시를 사용하고,
+    Gemini는 system을 프롬프트 앞에 고정 배치해 암묵적 캐시가 적용되도록 합니다.
+    캐시 적중/기록 토큰은 usage의 cache_read_input_tokens / cache_creation_input_tokens에 기록됩니다.
+    (Anthropic 캐시는 접두사가 모델별 최소 길이(Sonnet 1024 토큰) 이상일 때만 적용)
+    """
+
+    PROVIDERS = ('anthropic', 'gemini')
+
+    def __init__(self, provider: str, model: str, api_key: str = None):
+        """
+        Args:
+            provider: 'anthropic' | 'gemini'
+            model: 모델명 (예: 'claude-sonnet-4-20250514')
+            api_key: API 키 (None이면 ANTHROPIC_API_KEY / GEMINI_API_KEY 환경변수)
+        """
+        if provider not in self.PROVIDERS:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+
+        self.provider = provider
+        self.model = model
+        self.api_key = api_key
+        self._client = None
+        self._local_batches = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        """SDK 클라이언트 지연 생성"""
+        with self._lock:
+            if self._client is not None:
+                return self._client
+
+            if self.provider == 'anthropic':
+                from anthropic import Anthropic
+                self._client = Anthropic(api_key=self.api_key or os.getenv('ANTHROPIC_API_KEY'))
+            else:
+                import google.generativeai as genai
+                genai.configure(api_key=self.api_key or os.getenv('GEMINI_API_KEY'))
+                self._client = genai.GenerativeModel(self.model)
+
+            return self._client
+
+    def _anthropic_request(self, prompt: str, max_tokens: int, temperature: float, system: Optional[str]) -> Dict[str, Any]:
+        """messages.create / messages.stream 공용 요청 인자"""
+        request = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }
+        if system:
+            # 고정 접두사 캐시 (5분 TTL, 적중 시 입력 단가 1/10)
+            request["system"] = [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+        return request
+
+    @staticmethod
+    def _gemini_contents(prompt: str, system: Optional[str]) -> Any:
+        """고정 지시문을 앞에 두어 호출 간 공통 접두사 유지"""
+        return [system, prompt] if system else prompt
+
+    def _call_anthropic(self, prompt: str, max_tokens: int, temperature: float, system: Optional[str]) -> Dict[str, Any]:
+        message = self._get_client().messages.create(**self._anthropic_request(prompt, max_tokens, temperature, system))
+
+        return {
+            "text": message.content[0].text,
+            "model": self.model,
+            "usage": _anthropic_usage(getattr(message, 'usage', None))
+        }
+
+    def _call_gemini(self, prompt: str, max_tokens: int, temperature: float, system: Optional[str]) -> Dict[str, Any]:
+        response = self._get_client().generate_content(
+            self._gemini_contents(prompt, system),
+            generation_config={
+                "temperature": temperature,
+                "max_output_tokens": max_tokens,
+            }
+        )
+
+        return {
+            "text": response.text,
+            "model": self.model,
+            "usage": _gemini_usage(getattr(response, 'usage_metadata', None))
+        }
+
+    def _request_key(self, prompt: str, max_tokens: int, temperature: float, system: Optional[str]) -> Dict[str, Any]:
+        """픽스처 키 (generate/stream 공용, system이 없으면 기존 픽스처와 같은 키)"""
+        key = {
+            "provider": self.provider,
+            "model": self.model,
+            "prompt": prompt,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        if system:
+            key["system"] = system
+        return key
+
+    @staticmethod
+    def _response_cache(recorder: ProviderRecorder) -> Optional[LLMCache]:
+        """캐시는 실제 응답만 보관 (record는 모든 호출을 픽스처로 남기고, 재생/합성 응답은 캐시에 섞지 않음)"""
+        return get_llm_cache() if recorder.mode == 'live' and not recorder.is_offline else None
+
+    def generate(
+        self,
+        prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.3,
+        use_cache: bool = True,
+        system: str = None
+    ) -> Dict[str, Any]:
+        """
+        텍스트 생성
+
+        Args:
+            prompt: 사용자 프롬프트 (호출마다 바뀌는 부분)
+            max_tokens: 최대 출력 토큰 수
+            temperature: 샘플링 온도
+            use_cache: False면 응답 캐시를 조회하지 않고 모델을 다시 호출 (새 응답은 캐시에 저장)
+            system: 호출 간 공통 지시문 (공급자 측 프롬프트 캐시 대상)
+
+        Returns:
+            {"text", "model", "usage": {"input_tokens", "output_tokens",
+             "cache_creation_input_tokens", "cache_read_input_tokens"}, "cached"}
+        """
+        if self.provider == 'anthropic':
+            call = lambda: self._call_anthropic(prompt, max_tokens, temperature, system)
+        else:
+            call = lambda: self._call_gemini(prompt, max_tokens, temperature, system)
+
+        recorder = get_provider_recorder()
+        cache = self._response_cache(recorder)
+        cache_key = LLMCache.make_key(self.provider, self.model, temperature, max_tokens, prompt, system)
+
+        with span("llm.generate", provider=self.provider, model=self.model, prompt_chars=len(prompt),
+                  system_chars=len(system or '')) as s:
+            if cache and use_cache:
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    s.set_attributes(cached=True, **cached.get("usage", {}))
+                    return dict(cached, cached=True)
+
+            result = recorder.call('llm', self._request_key(prompt, max_tokens, temperature, system), call)
+            if cache:
+                cache.put(cache_key, self.provider, self.model, result)
+
+            s.set_attributes(cached=False, **result.get("usage", {}))
+            return dict(result, cached=False)
+
+    def _stream_anthropic(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        system: Optional[str],
+        usage: Dict[str, Any]
+    ) -> Iterator[str]:
+        with self._get_client().messages.stream(**self._anthropic_request(prompt, max_tokens, temperature, system)) as stream:
+            for text in stream.text_stream:
+                yield text
+
+            usage.update(_anthropic_usage(getattr(stream.get_final_message(), 'usage', None)))
+
+    def _stream_gemini(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        system: Optional[str],
+        usage: Dict[str, Any]
+    ) -> Iterator[str]:
+        response = self._get_client().generate_content(
+            self._gemini_contents(prompt, system),
+            generation_config={
+                "temperature": temperature,
+                "max_output_tokens": max_tokens,
+            },
+            stream=True
+        )
+
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+            # 사용량은 마지막 조각에 누적값으로 들어옴
+            chunk_usage = getattr(chunk, 'usage_metadata', None)
+            if chunk_usage is not None:
+                usage.update(_gemini_usage(chunk_usage))
+
+    def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.3,
+        use_cache: bool = True,
+        system: str = None
+    ) -> TextStream:
+        """
+        스트리밍 텍스트 생성
+
+        캐시 적중 시에는 저장된 응답을 한 조각으로 반환합니다. record/replay 모드는
+        완성된 응답 단위로 픽스처를 저장하므로 generate와 같은 픽스처를 한 조각으로 반환합니다.
+
+        Args:
+            prompt: 사용자 프롬프트 (호출마다 바뀌는 부분)
+            max_tokens: 최대 출력 토큰 수
+            temperature: 샘플링 온도
+            use_cache: False면 응답 캐시를 조회하지 않고 모델을 다시 호출
+            system: 호출 간 공통 지시문 (공급자 측 프롬프트 캐시 대상)
+
+        Returns:
+            TextStream (반복이 끝나면 result에 generate와 같은 형식의 결과)
+        """
+        # 스팬은 호출 시점의 컨텍스트에서 시작해 소비가 끝날 때 종료
+        started = get_tracer().start_span(
+            "llm.stream", provider=self.provider, model=self.model, prompt_chars=len(prompt),
+            system_chars=len(system or '')
+        )
+        return TextStream(self._stream_chunks(prompt, max_tokens, temperature, use_cache, system, started))
+
+    def _stream_chunks(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        use_cache: bool,
+        system: Optional[str],
+        started: Span
+    ) -> Generator[str, None, Dict[str, Any]]:
+        """텍스트 조각을 yield하고 전체 결과를 return하는 제너레이터 (캐시 저장/스팬 종료 포함)"""
+        tracer = get_tracer()
+        recorder = get_provider_recorder()
+        cache = self._response_cache(recorder)
+        cache_key = LLMCache.make_key(self.provider, self.model, temperature, max_tokens, prompt, system)
+
+        try:
+            if cache and use_cache:
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    started.set_attributes(cached=True, **cached.get("usage", {}))
+                    yield cached["text"]
+                    tracer.end_span(started)
+                    return dict(cached, cached=True)
+
+            if cache is None:
+                # 기록/재생/합성 모드: generate와 같은 픽스처 키 사용
+                result = self.generate(prompt, max_tokens, temperature, use_cache=False, system=system)
+                started.set_attributes(cached=False, **result.get("usage", {}))
+                yield result["text"]
+                tracer.end_span(started)
+                return result
+
+            stream_chunks = self._stream_anthropic if self.provider == 'anthropic' else self._stream_gemini
+            usage = {}
+            parts = []
+            start = time.perf_counter()
+
+            for text in stream_chunks(prompt, max_tokens, temperature, system, usage):
+                if not parts:
+                    started.set_attribute("first_chunk_ms", round((time.perf_counter() - start) * 1000, 1))
+                parts.append(text)
+                yield text
+
+            result = {"text": "".join(parts), "model": self.model, "usage": usage}
+            cache.put(cache_key, self.provider, self.model, result)
+
+            started.set_attributes(cached=False, chunks=len(parts), **usage)
+            tracer.end_span(started)
+            return dict(result, cached=False)
+
+        except BaseException as e:
+            tracer.end_span(started, e)
+            raise
+
+    # ------------------------------------------------------------------
+    # 메시지 배치 (비대화형 대량 분석용)
+    # ------------------------------------------------------------------
+
+    @property
+    def batch_backend(self) -> str:
+        """배치 처리 방식: 'anthropic' (Message Batches API) | 'local' (로컬 대체 엔드포인트)"""
+        recorder = get_provider_recorder()
+        if self.provider == 'anthropic' and recorder.mode == 'live' and not recorder.is_offline:
+            return 'anthropic'
+        return 'local'
+
+    def _batch_endpoint(self):
+        """client.messages.batches 또는 같은 인터페이스의 LocalBatchEndpoint"""
+        if self.batch_backend == 'anthropic':
+            return self._get_client().messages.batches
+
+        with self._lock:
+            if self._local_batches is None:
+                # 지연 임포트: 로컬 배치는 기록/재생/합성 모드나 Gemini에서만 필요
+                from llm_batch import LocalBatchEndpoint
+                self._local_batches = LocalBatchEndpoint(self)
+            return self._local_batches
+
+    def submit_batch(
+        self,
+        requests: List[Dict[str, str]],
+        max_tokens: int = 4096,
+        temperature: float = 0.3,
+        system: str = None
+    ) -> str:
+        """
+        프롬프트 묶음을 배치 작업 하나로 제출
+
+        Args:
+            requests: [{"custom_id": 영숫자/-/_ 64자 이내, "prompt": 사용자 프롬프트}, ...]
+            max_tokens: 최대 출력 토큰 수
+            temperature: 샘플링 온도
+            system: 모든 요청 공통 지시문 (배치 안에서도 프롬프트 캐시 적용)
+
+        Returns:
+            배치 ID
+        """
+        with span("llm.batch.submit", provider=self.provider, model=self.model,
+                  backend=self.batch_backend, requests=len(requests)) as s:
+            batch = self._batch_endpoint().create(requests=[
+                {
+                    "custom_id": request["custom_id"],
+                    "params": self._anthropic_request(request["prompt"], max_tokens, temperature, system)
+                }
+                for request in requests
+            ])
+            s.set_attribute("batch_id", batch.id)
+            return batch.id
+
+    def wait_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 60.0,
+        timeout: float = None,
+        on_progress: Callable[[Any], None] = None
+    ) -> Any:
+        """
+        배치가 끝날 때까지 주기적으로 상태 조회
+
+        Args:
+            batch_id: submit_batch가 반환한 ID
+            poll_interval: 조회 간격 (초)
+            timeout: 최대 대기 시간 (초, None이면 무제한)
+            on_progress: 조회할 때마다 batch 객체를 받는 콜백
+
+        Returns:
+            종료된 batch 객체 (processing_status == 'ended')
+        """
+        endpoint = self._batch_endpoint()
+        start = time.monotonic()
+
+        with span("llm.batch.wait", batch_id=batch_id, backend=self.batch_backend) as s:
+            polls = 0
+            while True:
+                batch = endpoint.retrieve(batch_id)
+                polls += 1
+                if on_progress:
+                    on_progress(batch)
+                if batch.processing_status == 'ended':
+                    break
+                if timeout is not None and time.monotonic() - start >= timeout:
+                    raise TimeoutError(f"Batch {batch_id} not finished after {timeout:.0f}s")
+                time.sleep(poll_interval)
+
+            s.set_attribute("polls", polls)
+            return batch
+
+    def batch_results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        종료된 배치의 요청별 결과
+
+        Returns:
+            {custom_id: generate와 같은 형식의 결과 | {"error": 메시지}}
+        """
+        results = {}
+        for entry in self._batch_endpoint().results(batch_id):
+            if entry.result.type == 'succeeded':
+                message = entry.result.message
+                results[entry.custom_id] = {
+                    "text": message.content[0].text,
+                    "model": self.model,
+                    "usage": _anthropic_usage(getattr(message, 'usage', None)),
+                    "cached": False,
+                }
+            else:
+                # errored / canceled / expired
+                error = getattr(entry.result, 'error', None)
+                detail = getattr(getattr(error, 'error', error), 'message', None)
+                results[entry.custom_id] = {"error": f"{entry.result.type}: {detail}" if detail else entry.result.type}
+        return results
+
+    def generate_batch(
+        self,
+        requests: List[Dict[str, str]],
+        max_tokens: int = 4096,
+        temperature: float = 0.3,
+        system: str = None,
+        use_cache: bool = True,
+        poll_interval: float = 60.0,
+        timeout: float = None,
+        batch_id: str = None,
+        on_submit: Callable[[str], None] = None,
+        on_progress: Callable[[Any], None] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        배치 제출 → 완료 대기 → 결과 수집 (응답 캐시 적중분은 제출하지 않음)
+
+        Args:
+            requests: [{"custom_id", "prompt"}, ...]
+            max_tokens: 최대 출력 토큰 수
+            temperature: 샘플링 온도
+            system: 모든 요청 공통 지시문
+            use_cache: False면 응답 캐시를 조회하지 않음 (새 응답은 캐시에 저장)
+            poll_interval: 상태 조회 간격 (초)
+            timeout: 최대 대기 시간 (초)
+            batch_id: 이미 제출한 배치에 다시 연결할 때 지정 (캐시 미적중 요청이 그 배치에 있어야 함)
+            on_submit: 새 배치를 제출한 직후 배치 ID를 받는 콜백 (재연결용 기록)
+            on_progress: 상태 조회마다 batch 객체를 받는 콜백
+
+        Returns:
+            {custom_id: generate와 같은 형식의 결과 | {"error": 메시지}}
+        """
+        cache = self._response_cache(get_provider_recorder())
+        cache_keys = {
+            request["custom_id"]: LLMCache.make_key(
+                self.provider, self.model, temperature, max_tokens, request["prompt"], system
+            )
+            for request in requests
+        }
+
+        results = {}
+        pending = []
+        for request in requests:
+            cached = cache.get(cache_keys[request["custom_id"]]) if cache and use_cache else None
+            if cached is not None:
+                results[request["custom_id"]] = dict(cached, cached=True)
+            else:
+                pending.append(request)
+
+        if not pending:
+            return results
+
+        if batch_id is None:
+            batch_id = self.submit_batch(pending, max_tokens, temperature, system)
+            if on_submit:
+                on_submit(batch_id)
+
+        self.wait_batch(batch_id, poll_interval, timeout, on_progress)
+
+        for custom_id, result in self.batch_results(batch_id).items():
+            if custom_id not in cache_keys:
+                continue
+            if cache and "error" not in result:
+                cache.put(cache_keys[custom_id], self.provider, self.model,
+                          {key: value for key, value in result.items() if key != "cached"})
+            results[custom_id] = result
+
+        for request in pending:
+            results.setdefault(request["custom_id"], {"error": "missing from batch results"})
+
+        return results
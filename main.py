@@ -6,85 +6,42 @@ Global Macro Intelligence Hub - Main Entry Point
 import argparse
 import os
 import sys
+import time
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, List, Any, Callable, Tuple, Generator, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
 import json
 
 from data_collector import DataCollector
 from critical_analyzer import CriticalAnalyzer
+from metadata_cache import get_metadata_cache
+from llm_client import LLMClient, TextStream
+from providers import configure_providers, PROVIDER_MODES
+from tracing import span, get_tracer, propagate
+from pipeline import Stage, StagePipeline, PipelineItem
+from run_manifest import RunManifest, BATCH_STAGES
+import snapshot_format
 from dotenv import load_dotenv
 
 # .env 파일 로드
 load_dotenv()
 
+# 배치 실행 옵션 기본값 (--resume 시 명령줄에 주지 않은 옵션은 매니페스트 값을 사용)
+BATCH_OPTION_DEFAULTS = {
+    "collect_workers": 4,
+    "llm_workers": 2,
+    "report_workers": 1,
+    "use_cache": True,
+    "pdf": False,
+    "message_batch": False,
+}
 
-class IntelligenceHub:
-    """전체 워크플로우를 관리하는 메인 클래스"""
-
-    def __init__(self):
-        """초기화"""
-        self.collector = DataCollector()
-        self.analyzer = CriticalAnalyzer()
-
-        # 보고서 디렉토리 생성
-        self.reports_dir = os.path.join(os.path.dirname(__file__), 'reports')
-        os.makedirs(self.reports_dir, exist_ok=True)
-
-    def get_company_name(self, ticker: str) -> str:
-        """
-        티커에서 회사명 추출
-
-        Args:
-            ticker: 종목 티커 (예: "005930.KS")
-
-        Returns:
-            회사명
-        """
-        # 주요 한국 종목 매핑
-        ticker_to_name = {
-            "005930.KS": "삼성전자",
-            "035720.KS": "카카오",
-            "000660.KS": "SK하이닉스",
-            "051910.KS": "LG화학",
-            "005380.KS": "현대차",
-            "006400.KS": "삼성SDI",
-            "035420.KS": "NAVER",
-            "207940.KS": "삼성바이오로직스",
-            "068270.KS": "셀트리온",
-            "028260.KS": "삼성물산",
-        }
-
-        return ticker_to_name.get(ticker, ticker.split('.')[0])
-
-    def create_enhanced_prompt(self, data: Dict[str, Any]) -> str:
-        """
-        신뢰도 점수를 포함한 향상된 프롬프트 생성
 
-        Args:
-            data: 분석할 데이터
-
-        Returns:
-            Claude API용 프롬프트
-        """
-        # 데이터 요약 추출
-        ticker = data.get('ticker', 'N/A')
-        stock_data = data.get('stock_data', {})
-        news = data.get('news', [])
-        disclosures = data.get('disclosures', [])
-
-        # 주가 데이터 포맷팅
-        price_data_str = self._format_price_data(stock_data)
-
-        # 뉴스 데이터 포맷팅
-        news_str = self._format_news_data(news)
-
-        # 공시 데이터 포맷팅
-        disclosure_str = self._format_disclosure_data(disclosures)
-
-        # 비판적 추론 프롬프트 생성 (신뢰도 점수 포함)
-        prompt = f"""
+# 비판적 추론 프레임워크 (분석 규칙 + 출력 형식 + 신뢰도 점수 기준)
+# 종목과 무관하게 고정된 접두사이므로 system 프롬프트로 보내 공급자 측 프롬프트 캐시를 적용
+CRITICAL_FRAMEWORK_PROMPT = """
 당신은 글로벌 매크로 투자 전문가이자 비판적 데이터 분석가입니다.
-다음 데이터를 **비판적 추론 프레임워크**에 따라 철저히 분석하세요.
+사용자가 제공하는 종목 데이터를 **비판적 추론 프레임워크**에 따라 철저히 분석하세요.
 
 ## 필수 분석 규칙:
 
@@ -105,23 +62,6 @@ class IntelligenceHub:
 
 ---
 
-## 분석 대상 데이터:
-
-### 종목 정보:
-- 티커: {ticker}
-- 회사명: {stock_data.get('company_name', 'N/A')}
-
-### 주가 데이터 (최근 7일):
-{price_data_str}
-
-### 뉴스 헤드라인:
-{news_str}
-
-### 공시 정보:
-{disclosure_str}
-
----
-
 ## 출력 형식 (반드시 준수):
 
 ### 1. 데이터-내러티브 괴리 분석
@@ -189,6 +129,102 @@ class IntelligenceHub:
 데이터가 불충분한 경우 "데이터 부족"이라고 명시하고, 신뢰도 점수에 반영하세요.
 """
 
+
+class IntelligenceHub:
+    """전체 워크플로우를 관리하는 메인 클래스"""
+
+    def __init__(self):
+        """초기화"""
+        self.collector = DataCollector()
+        self.analyzer = CriticalAnalyzer()
+        self.llm = LLMClient('anthropic', "claude-sonnet-4-20250514")
+        self.last_trace_id = None
+
+        # 보고서 디렉토리 생성
+        self.reports_dir = os.path.join(os.path.dirname(__file__), 'reports')
+        os.makedirs(self.reports_dir, exist_ok=True)
+
+    def get_company_name(self, ticker: str) -> str:
+        """
+        티커에서 회사명 추출
+
+        Args:
+            ticker: 종목 티커 (예: "005930.KS")
+
+        Returns:
+            회사명
+        """
+        # 주요 한국 종목 매핑
+        ticker_to_name = {
+            "005930.KS": "삼성전자",
+            "035720.KS": "카카오",
+            "000660.KS": "SK하이닉스",
+            "051910.KS": "LG화학",
+            "005380.KS": "현대차",
+            "006400.KS": "삼성SDI",
+            "035420.KS": "NAVER",
+            "207940.KS": "삼성바이오로직스",
+            "068270.KS": "셀트리온",
+            "028260.KS": "삼성물산",
+        }
+
+        if ticker in ticker_to_name:
+            return ticker_to_name[ticker]
+
+        # 수집 단계에서 채워진 메타데이터 캐시 사용 (네트워크 요청 없음)
+        cached_name = get_metadata_cache().get_company_name(ticker, fetch=False)
+        return cached_name or ticker.split('.')[0]
+
+    def create_enhanced_prompt(self, data: Dict[str, Any]) -> str:
+        """
+        신뢰도 점수를 포함한 향상된 프롬프트 생성
+
+        분석 규칙/출력 형식은 CRITICAL_FRAMEWORK_PROMPT(system)로 보내고,
+        여기서는 종목마다 바뀌는 주가/뉴스/공시 블록만 만듭니다.
+
+        Args:
+            data: 분석할 데이터
+
+        Returns:
+            Claude API용 사용자 프롬프트
+        """
+        # 데이터 요약 추출
+        ticker = data.get('ticker', 'N/A')
+        stock_data = data.get('stock_data', {})
+        news = data.get('news', [])
+        disclosures = data.get('disclosures', [])
+
+        # 주가 데이터 포맷팅
+        price_data_str = self._format_price_data(stock_data)
+
+        # 뉴스 데이터 포맷팅
+        news_str = self._format_news_data(news)
+
+        # 공시 데이터 포맷팅
+        disclosure_str = self._format_disclosure_data(disclosures)
+
+        # 종목별 데이터 프롬프트 (고정 프레임워크는 CRITICAL_FRAMEWORK_PROMPT로 별도 전달)
+        prompt = f"""
+## 분석 대상 데이터:
+
+### 종목 정보:
+- 티커: {ticker}
+- 회사명: {stock_data.get('company_name', 'N/A')}
+
+### 주가 데이터 (최근 7일):
+{price_data_str}
+
+### 뉴스 헤드라인:
+{news_str}
+
+### 공시 정보:
+{disclosure_str}
+
+---
+
+위 데이터를 비판적 추론 프레임워크의 필수 분석 규칙과 출력 형식에 따라 분석하세요.
+"""
+
         return prompt
 
     def _format_price_data(self, stock_data: Dict[str, Any]) -> str:
@@ -253,61 +289,49 @@ class IntelligenceHub:
 
         return "\n".join(lines) if lines else "[ERROR] 유효한 공시 없음"
 
-    def analyze_with_reliability(self, json_file_path: str) -> Dict[str, Any]:
-        """
-        신뢰도 점수를 포함한 분석 실행
-
-        Args:
-            json_file_path: 분석할 JSON 파일 경로
-
-        Returns:
-            분석 결과 딕셔너리
-        """
+    def _prepare_analysis(self, json_file_path: Union[str, Dict[str, Any]]) -> Tuple[Dict[str, Any], str]:
+        """수집 데이터 로드 + 신뢰도 점수 포함 프롬프트 생성"""
         print(f"\n{'='*80}")
         print(f"[START] Critical analysis (with reliability score)")
         print(f"{'='*80}\n")
 
-        # 1. 데이터 로드
-        data = self.analyzer.load_data(json_file_path)
+        # 1. 데이터 로드 (수집 직후에는 메모리의 딕셔너리를 그대로 사용)
+        if isinstance(json_file_path, dict):
+            data = json_file_path
+        else:
+            with span("file.read", kind=snapshot_format.format_of(json_file_path),
+                      bytes=os.path.getsize(snapshot_format.storage_path(json_file_path))):
+                data = self.analyzer.load_data(json_file_path)
 
         # 2. 향상된 프롬프트 생성
         print("[INFO] Creating critical reasoning prompt (with reliability score)...")
-        prompt = self.create_enhanced_prompt(data)
-
-        # 3. Claude API 호출
-        print("[INFO] Calling Claude API...")
-        try:
-            from anthropic import Anthropic
-            client = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
-
-            message = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=8192,  # 신뢰도 점수 포함으로 토큰 증가
-                temperature=0.3,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
-
-            analysis_text = message.content[0].text
-            print("[OK] Analysis complete!\n")
-
-        except Exception as e:
-            print(f"[ERROR] Claude API call failed: {str(e)}")
-            analysis_text = f"분석 실패: {str(e)}"
-
-        # 4. 결과 구성
-        result = {
+        with span("prompt.build", ticker=data.get('ticker')) as prompt_span:
+            prompt = self.create_enhanced_prompt(data)
+            prompt_span.set_attribute("chars", len(prompt))
+
+        return data, prompt
+
+    def _build_result(
+        self,
+        data: Dict[str, Any],
+        source_file: Optional[str],
+        analysis_text: str,
+        cached: bool,
+        usage: Dict[str, Any] = None,
+        error: str = None
+    ) -> Dict[str, Any]:
+        """분석 결과 딕셔너리 구성 (usage: 입력/출력/프롬프트 캐시 토큰 수, error: 모델 호출 실패 메시지)"""
+        return {
             "analyzed_at": datetime.now().isoformat(),
             "ticker": data.get('ticker', 'N/A'),
             "company_name": data.get('stock_data', {}).get('company_name', 'N/A'),
-            "source_file": json_file_path,
+            "source_file": source_file,
             "analysis": analysis_text,
+            "error": error,
             "metadata": {
                 "model": "claude-sonnet-4-20250514",
+                "cached": cached,
+                "usage": usage or {},
                 "framework": "Critical Reasoning Framework with Reliability Score",
                 "rules": [
                     "Data-Narrative Discrepancy Analysis",
@@ -318,7 +342,119 @@ class IntelligenceHub:
             }
         }
 
-        return result
+    def analyze_with_reliability(
+        self,
+        json_file_path: Union[str, Dict[str, Any]],
+        use_cache: bool = True,
+        source_file: str = None
+    ) -> Dict[str, Any]:
+        """
+        신뢰도 점수를 포함한 분석 실행
+
+        Args:
+            json_file_path: 분석할 JSON 파일 경로 또는 수집 데이터 딕셔너리
+            use_cache: False면 같은 프롬프트의 캐시된 응답이 있어도 모델을 다시 호출
+            source_file: 결과에 기록할 원본 파일 경로 (기본: json_file_path가 경로면 그 경로)
+
+        Returns:
+            분석 결과 딕셔너리 (모델 호출 실패 시 error에 오류 메시지, 성공 시 None)
+        """
+        data, prompt = self._prepare_analysis(json_file_path)
+
+        # 3. Claude API 호출
+        print("[INFO] Calling Claude API...")
+        try:
+            # 신뢰도 점수 포함으로 토큰 증가
+            message = self.llm.generate(
+                prompt, max_tokens=8192, temperature=0.3, use_cache=use_cache, system=CRITICAL_FRAMEWORK_PROMPT
+            )
+
+            analysis_text = message["text"]
+            cached = message.get("cached", False)
+            usage = message.get("usage", {})
+            error = None
+            print("[OK] Analysis complete! (cached response)\n" if cached else "[OK] Analysis complete!\n")
+
+        except Exception as e:
+            print(f"[ERROR] Claude API call failed: {str(e)}")
+            analysis_text = f"분석 실패: {str(e)}"
+            cached = False
+            usage = {}
+            error = str(e)
+
+        # 4. 결과 구성
+        return self._build_result(
+            data, self._source_file(json_file_path, source_file), analysis_text, cached, usage, error
+        )
+
+    def stream_analysis(
+        self,
+        json_file_path: Union[str, Dict[str, Any]],
+        use_cache: bool = True,
+        source_file: str = None
+    ) -> TextStream:
+        """
+        신뢰도 점수를 포함한 분석을 스트리밍으로 실행
+
+        반복하면 분석 텍스트 조각을 생성되는 대로 반환하고, 반복이 끝나면
+        result에 analyze_with_reliability와 같은 형식의 결과가 채워집니다.
+        모델 호출은 반복할 때 일어나므로, 단계별 트레이스에 llm.stream 구간이
+        포함되려면 호출한 쪽의 span 안에서 스트림을 끝까지 소비해야 합니다.
+
+        Args:
+            json_file_path: 분석할 JSON 파일 경로 또는 수집 데이터 딕셔너리
+            use_cache: False면 같은 프롬프트의 캐시된 응답이 있어도 모델을 다시 호출
+            source_file: 결과에 기록할 원본 파일 경로 (기본: json_file_path가 경로면 그 경로)
+
+        Returns:
+            TextStream
+        """
+        data, prompt = self._prepare_analysis(json_file_path)
+        source_file = self._source_file(json_file_path, source_file)
+        return TextStream(self._analysis_chunks(data, source_file, prompt, use_cache))
+
+    @staticmethod
+    def _source_file(json_file_path: Union[str, Dict[str, Any]], source_file: Optional[str]) -> Optional[str]:
+        """결과에 기록할 원본 파일 경로"""
+        if source_file is None and isinstance(json_file_path, str):
+            return json_file_path
+        return source_file
+
+    def _analysis_chunks(
+        self,
+        data: Dict[str, Any],
+        source_file: Optional[str],
+        prompt: str,
+        use_cache: bool
+    ) -> Generator[str, None, Dict[str, Any]]:
+        """분석 텍스트 조각을 yield하고 결과 딕셔너리를 return하는 제너레이터"""
+        print("[INFO] Calling Claude API (streaming)...")
+        parts = []
+        try:
+            llm_stream = self.llm.stream(
+                prompt, max_tokens=8192, temperature=0.3, use_cache=use_cache, system=CRITICAL_FRAMEWORK_PROMPT
+            )
+            for chunk in llm_stream:
+                parts.append(chunk)
+                yield chunk
+
+            analysis_text = llm_stream.result["text"]
+            cached = llm_stream.result.get("cached", False)
+            usage = llm_stream.result.get("usage", {})
+            error = None
+            print("\n[OK] Analysis complete! (cached response)\n" if cached else "\n[OK] Analysis complete!\n")
+
+        except Exception as e:
+            print(f"\n[ERROR] Claude API call failed: {str(e)}")
+            # 일부만 받은 경우에도 받은 내용은 보존
+            failure = f"\n\n분석 중단: {str(e)}" if parts else f"분석 실패: {str(e)}"
+            yield failure
+            analysis_text = "".join(parts) + failure
+            cached = False
+            usage = {}
+            error = str(e)
+
+        return self._build_result(data, source_file, analysis_text, cached, usage, error)
 
     def save_report(self, result: Dict[str, Any], ticker: str) -> str:
         """
@@ -383,78 +519,626 @@ class IntelligenceHub:
 """
 
         # 파일 저장
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        with span("file.write", kind="markdown") as write_span:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(report_content)
+            write_span.set_attribute("bytes", os.path.getsize(filepath))
 
         return filepath
 
-    def run(self, ticker: str) -> str:
+    def run(self, ticker: str, use_cache: bool = True, stream: bool = False) -> str:
         """
         전체 워크플로우 실행
 
         Args:
             ticker: 종목 티커 (예: "005930.KS")
+            use_cache: False면 LLM 응답 캐시를 건너뛰고 새로 분석
+            stream: True면 분석 텍스트를 생성되는 대로 콘솔에 출력
 
         Returns:
             최종 보고서 파일 경로
         """
-        company_name = self.get_company_name(ticker)
+        with span("pipeline.run", ticker=ticker) as root:
+            self.last_trace_id = root.trace_id
+
+            company_name = self.get_company_name(ticker)
+
+            print(f"\n{'='*80}")
+            print(f"[START] Global Macro Intelligence Hub")
+            print(f"{'='*80}")
+            print(f"[INFO] 종목: {company_name} ({ticker})")
+            print(f"[TIME] 시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"{'='*80}\n")
+
+            # 1단계: 데이터 수집
+            print("\n" + "="*80)
+            print("[DATA] 1단계: 데이터 수집")
+            print("="*80 + "\n")
+
+            data_result, data_file = self.collector.collect_snapshot(ticker)
+
+            print("\n[OK] 데이터 수집 완료:")
+            print(f"   - 주가 데이터: {len(data_result['stock_data'].get('data', []))}일")
+            print(f"   - 뉴스: {len(data_result['news'])}건")
+            print(f"   - 공시: {len(data_result['disclosures'])}건")
+
+            # 2단계: 비판적 분석
+            print("\n" + "="*80)
+            print("[SEARCH] 2단계: 비판적 분석 (신뢰도 점수 포함)")
+            print("="*80 + "\n")
+
+            # 수집 결과를 메모리에서 바로 분석 (JSON 파일은 백그라운드에서 저장 중)
+            with span("analyze", ticker=ticker):
+                if stream:
+                    analysis_stream = self.stream_analysis(data_result, use_cache=use_cache, source_file=data_file)
+                    for chunk in analysis_stream:
+                        print(chunk, end='', flush=True)
+                    analysis_result = analysis_stream.result
+                else:
+                    analysis_result = self.analyze_with_reliability(
+                        data_result, use_cache=use_cache, source_file=data_file
+                    )
+
+            # 3단계: 보고서 저장
+            print("\n" + "="*80)
+            print("[SAVE] 3단계: 최종 보고서 생성")
+            print("="*80 + "\n")
+
+            report_path = self.save_report(analysis_result, ticker)
+
+            print(f"[OK] 보고서 저장 완료: {report_path}")
+
+            # 완료 메시지
+            print(f"\n{'='*80}")
+            print("[COMPLETE] 전체 워크플로우 완료!")
+            print(f"{'='*80}")
+            print(f"\n[FILE] 최종 보고서 위치:")
+            print(f"   {report_path}")
+            print(f"\n[TIME] 완료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"{'='*80}\n")
+
+            return report_path
+
+
+    def _batch_collect(self, ticker: str, manifest: RunManifest) -> Dict[str, Any]:
+        """배치 수집 단계: 종목 데이터 수집 (시장 전체 공시 색인 사용)"""
+        artifacts = manifest.completed(ticker, 'collect')
+        if artifacts:
+            # 이전 실행에서 수집한 파일 재사용
+            data_file = artifacts['data_file']
+            return {"ticker": ticker, "data": self.analyzer.load_data(data_file), "data_file": data_file,
+                    "resumed": ["collect"]}
+
+        manifest.start(ticker, 'collect')
+        start = time.perf_counter()
+        with span("batch.collect", ticker=ticker):
+            data_result, data_file = self.collector.collect_snapshot(ticker, use_disclosure_index=True)
+
+        manifest.complete(ticker, 'collect', time.perf_counter() - start, data_file=data_file)
+        return {"ticker": ticker, "data": data_result, "data_file": data_file, "resumed": []}
+
+    def _batch_analyze(self, job: Dict[str, Any], manifest: RunManifest, use_cache: bool) -> Dict[str, Any]:
+        """배치 분석 단계: LLM 비판적 분석 (결과는 실행 디렉토리에 저장)"""
+        ticker = job['ticker']
+        analysis_result = self._completed_analysis(ticker, manifest)
+        if analysis_result:
+            # 이전 실행의 분석 결과 재사용 (LLM 재호출 없음)
+            return dict(job, analysis=analysis_result, resumed=job['resumed'] + ["analyze"])
+
+        manifest.start(ticker, 'analyze')
+        start = time.perf_counter()
+        with span("batch.analyze", ticker=ticker):
+            analysis_result = self.analyze_with_reliability(
+                job['data'], use_cache=use_cache, source_file=job['data_file']
+            )
 
-        print(f"\n{'='*80}")
-        print(f"[START] Global Macro Intelligence Hub")
-        print(f"{'='*80}")
-        print(f"[INFO] 종목: {company_name} ({ticker})")
-        print(f"[TIME] 시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"{'='*80}\n")
+        if analysis_result.get('error'):
+            raise RuntimeError(analysis_result['error'])
 
-        # 1단계: 데이터 수집
-        print("\n" + "="*80)
-        print("[DATA] 1단계: 데이터 수집")
-        print("="*80 + "\n")
+        self._save_analysis(ticker, analysis_result, manifest, time.perf_counter() - start)
+        return dict(job, analysis=analysis_result)
 
-        data_result = self.collector.collect_all_data(ticker)
+    @staticmethod
+    def _completed_analysis(ticker: str, manifest: RunManifest) -> Optional[Dict[str, Any]]:
+        """매니페스트에 완료로 기록된 분석 결과 (없으면 None)"""
+        artifacts = manifest.completed(ticker, 'analyze')
+        if not artifacts:
+            return None
+        return snapshot_format.load(artifacts['analysis_file'])
+
+    @staticmethod
+    def _save_analysis(ticker: str, analysis_result: Dict[str, Any], manifest: RunManifest, seconds: float):
+        """분석 결과를 실행 디렉토리에 저장하고 분석 단계 완료 기록 (형식은 snapshot_format 설정을 따름)"""
+        extension = snapshot_format.FORMAT_EXTENSIONS[snapshot_format.resolve_format()]
+        analysis_file = manifest.artifact_path(f"analysis_{ticker.replace('.', '_')}{extension}")
+        snapshot_format.dump(analysis_result, analysis_file)
+
+        manifest.complete(ticker, 'analyze', seconds, analysis_file=analysis_file)
+
+    def _batch_report(self, job: Dict[str, Any], manifest: RunManifest, pdf: bool) -> Dict[str, Any]:
+        """배치 보고서 단계: Markdown 보고서 저장 (+ 전문가급 PDF)"""
+        ticker = job['ticker']
+        manifest.start(ticker, 'report')
+        start = time.perf_counter()
+
+        with span("batch.report", ticker=ticker):
+            report_path = self.save_report(job['analysis'], ticker)
+
+            pdf_path = None
+            if pdf:
+                # 지연 임포트: fpdf/plotly는 PDF를 만들 때만 필요
+                from report_manager import ExpertReportManager
+                try:
+                    pdf_path = ExpertReportManager().create_expert_pdf(
+                        ticker=ticker,
+                        company_name=self.get_company_name(ticker),
+                        analysis_text=job['analysis']['analysis'],
+                        stock_data=job['data']['stock_data']
+                    )
+                except Exception as e:
+                    # Markdown 보고서는 이미 저장되었으므로 PDF 실패는 경고로만 처리
+                    print(f"[WARN] {ticker} PDF generation failed: {str(e)}")
+
+        manifest.complete(ticker, 'report', time.perf_counter() - start, report_path=report_path, pdf_path=pdf_path)
+        return dict(job, report_path=report_path, pdf_path=pdf_path)
+
+    def run_batch(
+        self,
+        tickers: List[str],
+        collect_workers: int = 4,
+        llm_workers: int = 2,
+        report_workers: int = 1,
+        use_cache: bool = True,
+        pdf: bool = False,
+        manifest: RunManifest = None
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 종목을 수집 → 분석 → 보고서 파이프라인으로 처리
 
-        print("\n[OK] 데이터 수집 완료:")
-        print(f"   - 주가 데이터: {len(data_result['stock_data'].get('data', []))}일")
-        print(f"   - 뉴스: {len(data_result['news'])}건")
-        print(f"   - 공시: {len(data_result['disclosures'])}건")
+        단계마다 작업자 풀이 따로 있어 N+1번 종목 수집, N번 종목 LLM 분석,
+        N-1번 종목 보고서 생성이 동시에 진행됩니다. 단계 사이 큐는 다음 단계 작업자 수만큼만
+        쌓이므로 LLM 단계가 느리면 수집이 그만큼 기다립니다.
 
-        # 2단계: 비판적 분석
-        print("\n" + "="*80)
-        print("[SEARCH] 2단계: 비판적 분석 (신뢰도 점수 포함)")
-        print("="*80 + "\n")
+        단계가 끝날 때마다 실행 매니페스트(runs/{run_id}/manifest.json)에 상태와 산출물을 기록하며,
+        기존 매니페스트를 넘기면 완료된 단계는 산출물을 재사용하고 나머지만 실행합니다.
 
-        # 방금 생성된 JSON 파일 찾기
-        data_dir = os.path.join(os.path.dirname(__file__), 'data')
-        import glob
-        json_files = glob.glob(os.path.join(data_dir, f"data_{ticker.replace('.', '_')}*.json"))
+        Args:
+            tickers: 종목 티커 리스트
+            collect_workers: 동시에 수집할 종목 수
+            llm_workers: 동시에 진행할 LLM 분석 수
+            report_workers: 동시에 생성할 보고서 수
+            use_cache: False면 LLM 응답 캐시를 건너뛰고 새로 분석
+            pdf: True면 보고서 단계에서 전문가급 PDF도 생성
+            manifest: 이어서 실행할 매니페스트 (None이면 새 실행 생성)
 
-        if not json_files:
-            print("[ERROR] 수집된 데이터 파일을 찾을 수 없습니다.")
-            return None
+        Returns:
+            종목별 결과 리스트 (입력 순서)
+            [{"ticker", "status": "ok"|"failed", "report_path", "pdf_path", "error", "cached",
+              "usage": {LLM 토큰 사용량}, "resumed": [재사용한 단계], "seconds": {단계: 소요 시간}}, ...]
+        """
+        tickers = list(dict.fromkeys(tickers))
 
-        latest_file = max(json_files, key=os.path.getmtime)
-        analysis_result = self.analyze_with_reliability(latest_file)
+        if manifest is None:
+            manifest = RunManifest.create(tickers, options={
+                "collect_workers": collect_workers,
+                "llm_workers": llm_workers,
+                "report_workers": report_workers,
+                "use_cache": use_cache,
+                "pdf": pdf,
+            })
 
-        # 3단계: 보고서 저장
-        print("\n" + "="*80)
-        print("[SAVE] 3단계: 최종 보고서 생성")
-        print("="*80 + "\n")
+        # 모든 단계가 끝난 종목은 파이프라인에 넣지 않음
+        remaining = [ticker for ticker in tickers if not manifest.is_complete(ticker)]
 
-        report_path = self.save_report(analysis_result, ticker)
+        print(f"\n{'='*80}")
+        print(f"[START] Batch analysis: {len(tickers)} tickers "
+              f"(collect: {collect_workers}, LLM: {llm_workers}, report: {report_workers} workers)")
+        print(f"[INFO] Run manifest: {manifest.path}")
+        if len(remaining) < len(tickers):
+            print(f"[INFO] Resuming: {len(tickers) - len(remaining)} tickers already complete, "
+                  f"{len(remaining)} remaining")
+        print(f"{'='*80}\n")
 
-        print(f"[OK] 보고서 저장 완료: {report_path}")
+        def on_result(item: PipelineItem):
+            if item.ok:
+                print(f"[OK] {item.key} report saved: {item.value['report_path']}")
+            else:
+                manifest.fail(item.key, item.failed_stage, item.error)
+                print(f"[ERROR] {item.key} {item.failed_stage} failed: {item.error}")
+
+        pipeline = StagePipeline(
+            [
+                Stage("collect", lambda ticker: self._batch_collect(ticker, manifest), workers=collect_workers),
+                Stage("analyze", lambda job: self._batch_analyze(job, manifest, use_cache), workers=llm_workers),
+                Stage("report", lambda job: self._batch_report(job, manifest, pdf), workers=report_workers),
+            ],
+            on_result=on_result
+        )
+
+        with span("pipeline.batch", tickers=len(tickers), run_id=manifest.run_id) as root:
+            self.last_trace_id = root.trace_id
+            items = {item.key: item for item in pipeline.run((ticker, ticker) for ticker in remaining)}
+            root.set_attributes(
+                succeeded=sum(item.ok for item in items.values()),
+                failed=sum(not item.ok for item in items.values()),
+                skipped=len(tickers) - len(remaining)
+            )
+
+        results = []
+        for ticker in tickers:
+            item = items.get(ticker)
+            if item is None:
+                results.append(self._completed_result(ticker, manifest))
+                continue
+
+            result = {"ticker": ticker, "status": "ok" if item.ok else "failed", "seconds": item.timings}
+            if item.ok:
+                result.update(
+                    report_path=item.value['report_path'],
+                    pdf_path=item.value['pdf_path'],
+                    cached=item.value['analysis']['metadata']['cached'],
+                    usage=item.value['analysis']['metadata'].get('usage', {}),
+                    resumed=item.value['resumed']
+                )
+            else:
+                result["error"] = f"{item.failed_stage}: {item.error}"
+            results.append(result)
+
+        print_batch_summary(results, pipeline.elapsed, pipeline.stage_stats)
+        print(f"[INFO] Run manifest: {manifest.path}")
+        if any(r['status'] != 'ok' for r in results):
+            print(f"[TIP] 실패한 종목만 다시 실행: python main.py --resume {manifest.run_id}\n")
+        return results
+
+    @staticmethod
+    def _completed_result(ticker: str, manifest: RunManifest) -> Dict[str, Any]:
+        """이전 실행에서 모든 단계를 마친 종목의 결과 행"""
+        artifacts = manifest.completed(ticker, 'report')
+        return {
+            "ticker": ticker, "status": "ok", "seconds": {}, "resumed": list(BATCH_STAGES),
+            "report_path": artifacts['report_path'], "pdf_path": artifacts.get('pdf_path'), "cached": None,
+        }
+
+    def run_message_batch(
+        self,
+        tickers: List[str],
+        collect_workers: int = 4,
+        report_workers: int = 1,
+        use_cache: bool = True,
+        pdf: bool = False,
+        poll_interval: float = None,
+        timeout: float = None,
+        manifest: RunManifest = None
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 종목의 분석을 LLM 메시지 배치 작업 하나로 처리 (야간 일괄 분석용)
+
+        1. 모든 종목 데이터를 병렬 수집하고 종목별 프롬프트 생성
+        2. 응답 캐시에 없는 프롬프트를 배치 하나로 제출하고 완료될 때까지 상태 조회
+           (Anthropic Message Batches: 동기 호출 속도 제한과 별도로 처리되고 토큰 단가가 절반)
+        3. 완료된 분석마다 save_report로 보고서 저장
+
+        대화형 응답 속도가 필요 없는 대신 처리량과 비용이 유리합니다. 제출한 배치 ID는 매니페스트에
+        기록하므로, 대기 중 중단되어도 --resume 시 다시 제출하지 않고 같은 배치의 결과를 가져옵니다.
+        기록/재생/합성 모드와 Gemini는 같은 인터페이스의 로컬 대체 엔드포인트(llm_batch)를 사용합니다.
+
+        Args:
+            tickers: 종목 티커 리스트
+            collect_workers: 동시에 수집할 종목 수
+            report_workers: 동시에 생성할 보고서 수
+            use_cache: False면 LLM 응답 캐시를 건너뛰고 모두 제출
+            pdf: True면 전문가급 PDF도 생성
+            poll_interval: 배치 상태 조회 간격 (초, 기본: Message Batches 60초 / 로컬 0.5초)
+            timeout: 배치 최대 대기 시간 (초, 초과 시 해당 종목은 미완료로 남고 --resume으로 이어받음)
+            manifest: 이어서 실행할 매니페스트 (None이면 새 실행 생성)
+
+        Returns:
+            run_batch와 같은 형식의 종목별 결과 리스트
+        """
+        tickers = list(dict.fromkeys(tickers))
+        backend = self.llm.batch_backend
+        if poll_interval is None:
+            poll_interval = 60.0 if backend == 'anthropic' else 0.5
+
+        if manifest is None:
+            manifest = RunManifest.create(tickers, options={
+                "message_batch": True,
+                "collect_workers": collect_workers,
+                "report_workers": report_workers,
+                "use_cache": use_cache,
+                "pdf": pdf,
+            })
+
+        remaining = [ticker for ticker in tickers if not manifest.is_complete(ticker)]
 
-        # 완료 메시지
         print(f"\n{'='*80}")
-        print("[COMPLETE] 전체 워크플로우 완료!")
-        print(f"{'='*80}")
-        print(f"\n[FILE] 최종 보고서 위치:")
-        print(f"   {report_path}")
-        print(f"\n[TIME] 완료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"[START] Message batch analysis: {len(tickers)} tickers (LLM batch backend: {backend})")
+        print(f"[INFO] Run manifest: {manifest.path}")
+        if len(remaining) < len(tickers):
+            print(f"[INFO] Resuming: {len(tickers) - len(remaining)} tickers already complete, "
+                  f"{len(remaining)} remaining")
         print(f"{'='*80}\n")
 
-        return report_path
+        jobs: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+        seconds: Dict[str, Dict[str, float]] = {ticker: {} for ticker in remaining}
+        busy = {stage: 0.0 for stage in BATCH_STAGES}
+        start = time.perf_counter()
+
+        def timed(stage: str, func: Callable[[], Any], ticker: str) -> Tuple[Any, Optional[str]]:
+            stage_start = time.perf_counter()
+            try:
+                return func(), None
+            except Exception as e:
+                return None, str(e)
+            finally:
+                seconds[ticker][stage] = time.perf_counter() - stage_start
+
+        with span("pipeline.message_batch", tickers=len(tickers), run_id=manifest.run_id, backend=backend) as root:
+            self.last_trace_id = root.trace_id
+
+            # 1. 수집 (종목 간 병렬)
+            collect = propagate(lambda ticker: timed("collect", lambda: self._batch_collect(ticker, manifest), ticker))
+            with ThreadPoolExecutor(max_workers=collect_workers) as executor:
+                for ticker, (job, error) in zip(remaining, executor.map(collect, remaining)):
+                    busy["collect"] += seconds[ticker]["collect"]
+                    if error:
+                        manifest.fail(ticker, 'collect', error)
+                        errors[ticker] = f"collect: {error}"
+                    else:
+                        jobs[ticker] = job
+
+            # 2. 분석 (이전 실행 결과는 재사용, 나머지는 배치 하나로 제출)
+            requests = []
+            request_tickers = {}
+            for ticker, job in jobs.items():
+                analysis_result = self._completed_analysis(ticker, manifest)
+                if analysis_result:
+                    job.update(analysis=analysis_result, resumed=job['resumed'] + ["analyze"])
+                    continue
+
+                with span("prompt.build", ticker=ticker) as prompt_span:
+                    prompt = self.create_enhanced_prompt(job['data'])
+                    prompt_span.set_attribute("chars", len(prompt))
+
+                # custom_id는 영숫자/-/_ 64자 이내
+                custom_id = ticker.replace('.', '_')[:64]
+                requests.append({"custom_id": custom_id, "prompt": prompt})
+                request_tickers[custom_id] = ticker
+                manifest.start(ticker, 'analyze')
+
+            if requests:
+                analyze_start = time.perf_counter()
+                llm_results = self._run_llm_batch(requests, manifest, use_cache, poll_interval, timeout)
+                analyze_seconds = time.perf_counter() - analyze_start
+                busy["analyze"] = analyze_seconds
+
+                for custom_id, ticker in request_tickers.items():
+                    seconds[ticker]["analyze"] = analyze_seconds
+                    llm_result = llm_results.get(custom_id) or {"error": "batch still in progress (use --resume)"}
+                    if "error" in llm_result:
+                        manifest.fail(ticker, 'analyze', llm_result["error"])
+                        errors[ticker] = f"analyze: {llm_result['error']}"
+                        jobs.pop(ticker)
+                        continue
+
+                    job = jobs[ticker]
+                    job['analysis'] = self._build_result(
+                        job['data'], job['data_file'], llm_result["text"],
+                        llm_result.get("cached", False), llm_result.get("usage")
+                    )
+                    self._save_analysis(ticker, job['analysis'], manifest, analyze_seconds)
+
+            # 3. 보고서 (종목 간 병렬)
+            report = propagate(lambda ticker: timed("report", lambda: self._batch_report(jobs[ticker], manifest, pdf), ticker))
+            report_tickers = list(jobs)
+            with ThreadPoolExecutor(max_workers=report_workers) as executor:
+                for ticker, (job, error) in zip(report_tickers, executor.map(report, report_tickers)):
+                    busy["report"] += seconds[ticker]["report"]
+                    if error:
+                        manifest.fail(ticker, 'report', error)
+                        errors[ticker] = f"report: {error}"
+                        jobs.pop(ticker)
+                    else:
+                        jobs[ticker] = job
+                        print(f"[OK] {ticker} report saved: {job['report_path']}")
+
+            root.set_attributes(
+                requests=len(requests),
+                succeeded=len(jobs),
+                failed=len(errors),
+                skipped=len(tickers) - len(remaining)
+            )
+
+        elapsed = time.perf_counter() - start
+
+        results = []
+        for ticker in tickers:
+            if ticker not in seconds:
+                results.append(self._completed_result(ticker, manifest))
+            elif ticker in errors:
+                results.append({"ticker": ticker, "status": "failed", "seconds": seconds[ticker], "error": errors[ticker]})
+            else:
+                job = jobs[ticker]
+                results.append({
+                    "ticker": ticker, "status": "ok", "seconds": seconds[ticker],
+                    "report_path": job['report_path'], "pdf_path": job['pdf_path'],
+                    "cached": job['analysis']['metadata']['cached'],
+                    "usage": job['analysis']['metadata'].get('usage', {}),
+                    "resumed": job['resumed'],
+                })
+
+        workers = {"collect": collect_workers, "analyze": 1, "report": report_workers}
+        stage_stats = {
+            stage: {
+                "workers": workers[stage],
+                "busy_seconds": busy[stage],
+                "items": sum(1 for ticker_seconds in seconds.values() if stage in ticker_seconds),
+                "utilization": busy[stage] / (workers[stage] * elapsed) if elapsed > 0 else 0.0,
+            }
+            for stage in BATCH_STAGES
+        }
+
+        print_batch_summary(results, elapsed, stage_stats)
+        print(f"[INFO] Run manifest: {manifest.path}")
+        if any(r['status'] != 'ok' for r in results):
+            print(f"[TIP] 실패/미완료 종목만 다시 실행: python main.py --resume {manifest.run_id}\n")
+        return results
+
+    def _run_llm_batch(
+        self,
+        requests: List[Dict[str, str]],
+        manifest: RunManifest,
+        use_cache: bool,
+        poll_interval: float,
+        timeout: Optional[float]
+    ) -> Dict[str, Dict[str, Any]]:
+        """분석 프롬프트 배치 제출/대기 (중단된 Message Batches 작업은 다시 제출하지 않고 재연결)"""
+        backend = self.llm.batch_backend
+        previous = manifest.get_meta('llm_batch')
+        # Message Batches 작업만 재연결: 공급자 쪽에 남아 있어 다른 프로세스에서도 결과를 가져올 수 있음
+        # 로컬 대체 엔드포인트(LocalBatchEndpoint)의 배치는 제출한 프로세스의 메모리에만 있으므로
+        # 프로세스가 끝나면 사라져 --resume에서 이어받을 수 없음 → 새로 제출
+        resumable = (
+            previous is not None
+            and previous.get('backend') == 'anthropic'
+            and backend == 'anthropic'
+        )
+        batch_id = previous['id'] if resumable else None
+        if batch_id:
+            print(f"[INFO] Re-attaching to submitted batch {batch_id}")
+
+        def on_submit(new_batch_id: str):
+            manifest.set_meta('llm_batch', {
+                "id": new_batch_id, "backend": backend,
+                "submitted_at": datetime.now().isoformat(), "requests": len(requests),
+            })
+            print(f"[INFO] Submitted {len(requests)} prompts as batch {new_batch_id} ({backend})")
+
+        def on_progress(batch: Any):
+            counts = batch.request_counts
+            print(f"[INFO] Batch {batch.id}: {batch.processing_status} "
+                  f"(succeeded {counts.succeeded}, errored {counts.errored}, processing {counts.processing})")
+
+        with span("analyze.batch", requests=len(requests), backend=backend):
+            try:
+                results = self.llm.generate_batch(
+                    requests,
+                    max_tokens=8192,
+                    temperature=0.3,
+                    system=CRITICAL_FRAMEWORK_PROMPT,
+                    use_cache=use_cache,
+                    poll_interval=poll_interval,
+                    timeout=timeout,
+                    batch_id=batch_id,
+                    on_submit=on_submit,
+                    on_progress=on_progress
+                )
+            except TimeoutError as e:
+                # 배치는 공급자 쪽에서 계속 처리되므로 매니페스트의 배치 ID로 나중에 결과를 가져옴
+                print(f"[WARN] {str(e)}")
+                return {}
+
+        # 결과를 모두 반영했으므로 다음 --resume은 실패한 종목만 새 배치로 제출
+        manifest.set_meta('llm_batch', None)
+        return results
+
+
+def print_batch_summary(results: List[Dict[str, Any]], elapsed: float, stage_stats: Dict[str, Dict[str, float]]):
+    """
+    배치 실행 결과 표 출력 (종목별 상태, 단계별 사용률, 전체 처리량)
+
+    Args:
+        results: run_batch 결과
+        elapsed: 전체 소요 시간 (초)
+        stage_stats: StagePipeline.stage_stats
+    """
+    stages = list(stage_stats)
+
+    print(f"\n{'='*80}")
+    print("[COMPLETE] 배치 분석 결과")
+    print(f"{'='*80}")
+    print(f"{'ticker':<12} {'status':<8} " + " ".join(f"{name + ' s':>10}" for name in stages) + "  detail")
+    print("-" * 80)
+
+    for r in results:
+        seconds = " ".join(
+            f"{r['seconds'][name]:>10.1f}" if name in r['seconds'] else f"{'-':>10}"
+            for name in stages
+        )
+        if r['status'] == 'ok':
+            detail = os.path.basename(r['report_path']) + (" (cached)" if r.get('cached') else "")
+            if r.get('resumed'):
+                detail += f" (resumed: {','.join(r['resumed'])})"
+        else:
+            detail = r.get('error', '')
+        print(f"{r['ticker']:<12} {r['status']:<8} {seconds}  {detail[:60]}")
+
+    print("-" * 80)
+    for name, stats in stage_stats.items():
+        print(f"   {name:<8} workers {stats['workers']:>2}  busy {stats['busy_seconds']:>7.1f}s  "
+              f"utilization {stats['utilization']:>5.0%}")
+
+    bottleneck = max(stage_stats, key=lambda name: stage_stats[name]['utilization'])
+    succeeded = sum(1 for r in results if r['status'] == 'ok')
+    throughput = len(results) / elapsed * 60 if elapsed > 0 else 0.0
+    print(f"[DATA] {succeeded}/{len(results)} succeeded in {elapsed:.1f}s "
+          f"({throughput:.1f} tickers/min, bottleneck: {bottleneck})")
+
+    # 이번 실행에서 실제로 호출한 분석만 집계 (응답 캐시 적중/이전 실행 재사용 제외)
+    usages = [
+        r['usage'] for r in results
+        if r.get('usage') and not r.get('cached') and 'analyze' not in r.get('resumed', [])
+    ]
+    if usages:
+        totals = {
+            key: sum(u.get(key) or 0 for u in usages)
+            for key in ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens", "output_tokens")
+        }
+        prompt_tokens = totals["input_tokens"] + totals["cache_creation_input_tokens"] + totals["cache_read_input_tokens"]
+        hit_rate = totals["cache_read_input_tokens"] / prompt_tokens if prompt_tokens else 0.0
+        print(f"[DATA] LLM tokens ({len(usages)} calls): input {totals['input_tokens']:,}  "
+              f"cache write {totals['cache_creation_input_tokens']:,}  cache read {totals['cache_read_input_tokens']:,} "
+              f"({hit_rate:.0%} of prompt)  output {totals['output_tokens']:,}")
+    print(f"{'='*80}\n")
+
+
+def load_watchlist_tickers(path: str) -> List[str]:
+    """
+    스크리너가 저장한 watchlist.json에서 티커 목록 읽기
+
+    Args:
+        path: watchlist JSON 파일 경로
+
+    Returns:
+        티커 리스트
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        watchlist = json.load(f)
+
+    return [stock['ticker'] for stock in watchlist.get('stocks', [])]
+
+
+def report_trace(trace_id: str, trace_file: str = None):
+    """
+    실행 트레이스의 단계별 소요 시간 표 출력 (및 JSONL 내보내기)
+
+    Args:
+        trace_id: IntelligenceHub.run의 트레이스 ID (None이면 출력하지 않음)
+        trace_file: 스팬을 추가 기록할 JSONL 파일 경로
+    """
+    if not trace_id:
+        return
+
+    tracer = get_tracer()
+    print(f"\n{'='*80}")
+    print("[TRACE] 단계별 소요 시간")
+    print(f"{'='*80}")
+    print(tracer.format_summary(trace_id))
+
+    if trace_file:
+        count = tracer.export_jsonl(trace_file, trace_id)
+        print(f"\n[OK] Trace exported: {trace_file} ({count} spans)")
 
 
 def main():
@@ -468,6 +1152,11 @@ def main():
   python main.py --ticker 005930.KS           # 삼성전자 분석
   python main.py --ticker 035720.KS           # 카카오 분석
   python main.py -t 000660.KS                 # SK하이닉스 분석 (축약형)
+  python main.py -t 005930.KS --no-llm-cache  # 캐시된 분석 무시하고 재분석
+  python main.py --tickers 005930.KS,000660.KS,035420.KS  # 여러 종목 동시 분석
+  python main.py --from-watchlist watchlist.json --llm-workers 3  # 스크리너 결과 일괄 분석
+  python main.py --resume                      # 중단된 마지막 배치 이어서 실행
+  python main.py --from-watchlist watchlist.json --message-batch  # 야간 일괄 분석 (LLM 배치 작업 1건)
 
 지원 종목:
   005930.KS  삼성전자
@@ -480,30 +1169,250 @@ def main():
         """
     )
 
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+
+    target.add_argument(
         '--ticker', '-t',
         type=str,
-        required=True,
         help='종목 티커 (예: 005930.KS)'
     )
 
+    target.add_argument(
+        '--tickers',
+        type=str,
+        nargs='+',
+        help='여러 종목 일괄 분석 (공백 또는 쉼표로 구분, 예: 005930.KS,000660.KS)'
+    )
+
+    target.add_argument(
+        '--from-watchlist',
+        type=str,
+        metavar='PATH',
+        help='스크리너가 저장한 watchlist.json의 종목 일괄 분석'
+    )
+
+    target.add_argument(
+        '--resume',
+        type=str,
+        nargs='?',
+        const='latest',
+        metavar='RUN_ID',
+        help='중단된 배치 실행 이어서 실행 (완료된 단계 건너뜀, 기본: 가장 최근 실행)'
+    )
+
+    parser.add_argument(
+        '--run-id',
+        type=str,
+        default=None,
+        help='새 배치 실행의 ID (runs/{RUN_ID}/manifest.json, 기본: 현재 시각)'
+    )
+
+    parser.add_argument(
+        '--collect-workers',
+        type=int,
+        default=None,
+        help='배치 모드에서 동시에 수집할 종목 수 (기본: 4)'
+    )
+
+    parser.add_argument(
+        '--llm-workers',
+        type=int,
+        default=None,
+        help='배치 모드에서 동시에 진행할 LLM 분석 수 (기본: 2)'
+    )
+
+    parser.add_argument(
+        '--message-batch',
+        action='store_true',
+        default=None,
+        help='배치 모드의 분석 프롬프트를 LLM 메시지 배치 작업 하나로 제출 (응답은 늦지만 비용/처리량 유리)'
+    )
+
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=None,
+        help='--message-batch 배치 상태 조회 간격 (초, 기본: Message Batches 60 / 로컬 0.5)'
+    )
+
+    parser.add_argument(
+        '--batch-timeout',
+        type=float,
+        default=None,
+        help='--message-batch 배치 최대 대기 시간 (초, 초과 시 미완료 종목은 --resume으로 이어받음, 기본: 제한 없음)'
+    )
+
+    parser.add_argument(
+        '--provider-mode',
+        choices=PROVIDER_MODES,
+        default=None,
+        help='외부 호출 모드: live(기본) / record(픽스처 기록) / replay(픽스처 재생, 네트워크 없음)'
+    )
+
+    parser.add_argument(
+        '--fixtures',
+        type=str,
+        default=None,
+        help='픽스처 디렉토리 (기본: fixtures/)'
+    )
+
+    parser.add_argument(
+        '--replay-latency',
+        type=str,
+        default=None,
+        help='replay 시 호출마다 주입할 지연 (초, 또는 "yfinance=0.3,http=0.1,llm=2")'
+    )
+
+    parser.add_argument(
+        '--report-workers',
+        type=int,
+        default=None,
+        help='배치 모드에서 동시에 생성할 보고서 수 (기본: 1)'
+    )
+
+    parser.add_argument(
+        '--pdf',
+        action='store_true',
+        default=None,
+        help='배치 모드에서 전문가급 PDF 보고서도 생성'
+    )
+
+    parser.add_argument(
+        '--no-llm-cache',
+        action='store_true',
+        default=None,
+        help='같은 프롬프트의 캐시된 분석이 있어도 모델을 다시 호출'
+    )
+
+    parser.add_argument(
+        '--no-stream',
+        action='store_true',
+        help='분석 텍스트를 스트리밍하지 않고 완료 후 한 번에 처리'
+    )
+
+    parser.add_argument(
+        '--trace-file',
+        type=str,
+        default=None,
+        help='단계별 트레이스 스팬을 추가 기록할 JSON Lines 파일'
+    )
+
+    parser.add_argument(
+        '--snapshot-format',
+        choices=['auto'] + list(snapshot_format.FORMAT_EXTENSIONS),
+        default=None,
+        help='data/, analysis/ 스냅샷 저장 형식 (기본: SNAPSHOT_FORMAT, 없으면 json / auto: 사용 가능한 가장 작은 형식)'
+    )
+
     args = parser.parse_args()
 
-    # API 키 확인
+    recorder = configure_providers(args.provider_mode, args.fixtures, args.replay_latency)
+
+    # 스냅샷 형식: 모든 저장 경로가 snapshot_format.resolve_format()으로 같은 설정을 읽음
+    if args.snapshot_format:
+        try:
+            snapshot_format.resolve_format(args.snapshot_format)
+        except ValueError as e:
+            print(f"[ERROR] {str(e)}")
+            sys.exit(1)
+        os.environ['SNAPSHOT_FORMAT'] = args.snapshot_format
+
+    # API 키 확인 (replay 모드는 기록된 응답만 사용)
     required_keys = ['DART_API_KEY', 'NEWS_API_KEY', 'ANTHROPIC_API_KEY']
     missing_keys = [key for key in required_keys if not os.getenv(key)]
 
-    if missing_keys:
+    if missing_keys and not recorder.is_offline:
         print("[ERROR] 다음 API 키가 .env 파일에 설정되지 않았습니다:")
         for key in missing_keys:
             print(f"   - {key}")
         print("\n.env 파일을 확인하고 필요한 API 키를 추가하세요.")
         sys.exit(1)
 
+    # 배치 대상 종목
+    manifest = None
+    if args.tickers:
+        tickers = [t.strip() for arg in args.tickers for t in arg.split(',') if t.strip()]
+    elif args.from_watchlist:
+        tickers = load_watchlist_tickers(args.from_watchlist)
+        if not tickers:
+            print(f"[ERROR] watchlist에 종목이 없습니다: {args.from_watchlist}")
+            sys.exit(1)
+    elif args.resume:
+        try:
+            manifest = RunManifest.load(None if args.resume == 'latest' else args.resume)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"[ERROR] 이어서 실행할 배치를 찾을 수 없습니다: {str(e)}")
+            sys.exit(1)
+        tickers = manifest.tickers
+        counts = manifest.counts()
+        print(f"[INFO] Resuming run {manifest.run_id}: {counts['complete']} complete, "
+              f"{counts['failed']} failed, {counts['pending']} pending")
+    else:
+        tickers = None
+
+    # 배치 옵션: 명령줄 값 > 이어서 실행하는 매니페스트에 기록된 값 > 기본값
+    saved_options = manifest.data.get('options', {}) if manifest else {}
+    given_options = {
+        "collect_workers": args.collect_workers,
+        "llm_workers": args.llm_workers,
+        "report_workers": args.report_workers,
+        "use_cache": None if args.no_llm_cache is None else not args.no_llm_cache,
+        "pdf": args.pdf,
+        "message_batch": args.message_batch,
+    }
+    options = {
+        name: value if value is not None else saved_options.get(name, BATCH_OPTION_DEFAULTS[name])
+        for name, value in given_options.items()
+    }
+
+    if tickers and manifest is None:
+        try:
+            manifest = RunManifest.create(tickers, run_id=args.run_id, options=options)
+        except FileExistsError as e:
+            print(f"[ERROR] {str(e)}")
+            sys.exit(1)
+
     # 워크플로우 실행
     try:
         hub = IntelligenceHub()
-        report_path = hub.run(args.ticker)
+
+        if tickers and options['message_batch']:
+            try:
+                results = hub.run_message_batch(
+                    tickers,
+                    collect_workers=options['collect_workers'],
+                    report_workers=options['report_workers'],
+                    use_cache=options['use_cache'],
+                    pdf=options['pdf'],
+                    poll_interval=args.poll_interval,
+                    timeout=args.batch_timeout,
+                    manifest=manifest
+                )
+            finally:
+                report_trace(hub.last_trace_id, args.trace_file)
+
+            sys.exit(0 if all(r['status'] == 'ok' for r in results) else 1)
+
+        if tickers:
+            try:
+                results = hub.run_batch(
+                    tickers,
+                    collect_workers=options['collect_workers'],
+                    llm_workers=options['llm_workers'],
+                    report_workers=options['report_workers'],
+                    use_cache=options['use_cache'],
+                    pdf=options['pdf'],
+                    manifest=manifest
+                )
+            finally:
+                report_trace(hub.last_trace_id, args.trace_file)
+
+            sys.exit(0 if all(r['status'] == 'ok' for r in results) else 1)
+
+        try:
+            report_path = hub.run(args.ticker, use_cache=options['use_cache'], stream=not args.no_stream)
+        finally:
+            report_trace(hub.last_trace_id, args.trace_file)
 
         if report_path:
             print(f"\n[DONE] 보고서를 확인하세요: {report_path}\n")
@@ -3,18 +3,32 @@ Global Macro Intelligence Hub - Market Watch
 시장 감시 및 주목할 만한 종목 추천 모듈
 """
 
-import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
+from rate_limiter import RateLimiter
+from providers import yf_history
+from price_store import get_price_store
+from price_cube import get_price_cube
+from indicator_state import get_indicator_state_store
+from dart_client import get_disclosure_index, attach_indexed_disclosures
+from data_collector import get_api_key
+
 
 class MarketWatch:
     """시장 감시 및 종목 추천 클래스"""
 
     def __init__(self):
         """초기화"""
+        # 로컬 일봉 저장소 (증분 갱신)
+        self.price_store = get_price_store()
+
+        # 종목별 지표 상태 (Wilder RSI, MA5/MA20 누적합)
+        self.indicator_states = get_indicator_state_store()
+
         # 주요 한국 종목 리스트 (KOSPI 100 + KOSDAQ 100 = 200개)
         self.kospi_stocks = {
             # KOSPI 100개
@@ -89,23 +103,22 @@ class MarketWatch:
             "049070.KQ": "인탑스", "060590.KQ": "유니퀘스트",
         }
 
-    def calculate_technical_indicators(self, ticker: str, days: int = 30) -> Dict[str, Any]:
+    def calculate_technical_indicators(self, ticker: str, days: int = 30, hist: pd.DataFrame = None) -> Dict[str, Any]:
         """
         기술적 지표 계산
 
         Args:
             ticker: 종목 티커
             days: 분석 기간 (일)
+            hist: 미리 조회된 일봉 데이터 (None이면 저장소에서 조회)
 
         Returns:
             기술적 지표 딕셔너리
         """
         try:
-            # 데이터 가져오기 (오늘 종가 포함)
-            stock = yf.Ticker(ticker)
-
-            # period 파라미터로 최신 데이터 가져오기
-            hist = stock.history(period="2mo", interval="1d")
+            if hist is None:
+                # 로컬 저장소 경유로 최근 2개월 데이터 가져오기 (오늘 종가 포함)
+                hist = self.price_store.get_history(ticker, period_days=62)
 
             if len(hist) < 2:
                 return None
@@ -121,14 +134,21 @@ class MarketWatch:
             avg_volume = hist['Volume'].tail(10).mean()
             volume_change = ((latest['Volume'] - avg_volume) / avg_volume) * 100 if avg_volume > 0 else 0
 
-            # 이동평균선 계산
-            hist['MA5'] = hist['Close'].rolling(window=5).mean()
-            hist['MA20'] = hist['Close'].rolling(window=20).mean()
+            # 지표 상태 갱신 (새 봉만 O(1)로 반영)
+            state = self.indicator_states.update_from_store(ticker, self.price_store, hist)
+
+            # 이동평균선 (상태가 충분하면 누적합 사용, 아니면 창 전체 재계산)
+            if state['ma20_prev'] is not None:
+                ma5_current, ma20_current = state['ma5'], state['ma20']
+                ma5_prev, ma20_prev = state['ma5_prev'], state['ma20_prev']
+            else:
+                hist['MA5'] = hist['Close'].rolling(window=5).mean()
+                hist['MA20'] = hist['Close'].rolling(window=20).mean()
 
-            ma5_current = hist['MA5'].iloc[-1]
-            ma20_current = hist['MA20'].iloc[-1]
-            ma5_prev = hist['MA5'].iloc[-2]
-            ma20_prev = hist['MA20'].iloc[-2]
+                ma5_current = hist['MA5'].iloc[-1]
+                ma20_current = hist['MA20'].iloc[-1]
+                ma5_prev = hist['MA5'].iloc[-2]
+                ma20_prev = hist['MA20'].iloc[-2]
 
             # 골든크로스/데드크로스 감지
             golden_cross = (ma5_prev <= ma20_prev) and (ma5_current > ma20_current)
@@ -141,8 +161,8 @@ class MarketWatch:
             distance_from_high = ((high_52w - latest['Close']) / high_52w) * 100
             distance_from_low = ((latest['Close'] - low_52w) / low_52w) * 100
 
-            # RSI 계산 (14일)
-            rsi = self._calculate_rsi(hist['Close'], period=14)
+            # RSI (14일, Wilder 평활 상태 우선)
+            rsi = state['rsi'] if state['rsi'] is not None else self._calculate_rsi(hist['Close'], period=14)
 
             return {
                 "ticker": ticker,
@@ -281,12 +301,65 @@ class MarketWatch:
 
         return min(max(score, 0), 100)  # 0-100 범위 제한
 
-    def get_watchlist(self, limit: int = 5) -> List[Dict[str, Any]]:
+    def _evaluate_ticker(self, ticker: str, name: str, hist: pd.DataFrame = None) -> Tuple[Dict[str, Any], str]:
+        """
+        단일 종목 지표 계산 및 추천 조건 판정
+
+        Args:
+            ticker: 종목 티커
+            name: 종목명
+            hist: 미리 조회된 일봉 데이터 (None이면 저장소에서 조회)
+
+        Returns:
+            (추천 항목 또는 None, 상태 메시지)
+        """
+        indicators = self.calculate_technical_indicators(ticker, hist=hist)
+
+        if not indicators:
+            return None, "[FAIL] Failed"
+
+        # 추천 조건: 5% 이상 상승 또는 거래량 50% 이상 증가
+        if (indicators['price_change_pct'] >= 5 or
+            indicators['volume_change_pct'] >= 50):
+
+            score = self.calculate_recommendation_score(indicators)
+            reason = self.generate_recommendation_reason(indicators)
+
+            entry = {
+                "ticker": ticker,
+                "company_name": name,
+                "current_price": indicators['current_price'],
+                "price_change_pct": indicators['price_change_pct'],
+                "volume_change_pct": indicators['volume_change_pct'],
+                "score": score,
+                "reason": reason,
+                "indicators": indicators
+            }
+            return entry, f"[RECOMMEND] Score: {score:.0f}"
+
+        return None, "[SKIP] Below threshold"
+
+    def get_watchlist(
+        self,
+        limit: int = 5,
+        concurrent: bool = True,
+        max_workers: int = 8,
+        calls_per_second: float = 5.0,
+        use_cube: bool = False,
+        include_disclosures: bool = False,
+        disclosure_days: int = 7
+    ) -> List[Dict[str, Any]]:
         """
         주목할 만한 종목 리스트 가져오기
 
         Args:
             limit: 반환할 종목 수
+            concurrent: True면 스레드 풀로 동시 조회
+            max_workers: 동시 조회 작업자 수
+            calls_per_second: 전체 작업자가 공유하는 초당 조회 한도
+            use_cube: True면 저장소를 묶음 갱신한 뒤 공유 가격 큐브에서 일봉을 읽음
+            include_disclosures: True면 시장 전체 DART 색인에서 종목별 주요 공시 추가
+            disclosure_days: 공시 조회 기간 (일)
 
         Returns:
             추천 종목 리스트
@@ -295,49 +368,74 @@ class MarketWatch:
         print("[WATCH] Market Watch - Monitoring market...")
         print("="*70 + "\n")
 
+        # 정렬 동점 시 원래 종목 순서를 유지하기 위한 순번
+        order = {ticker: i for i, ticker in enumerate(self.kospi_stocks)}
         watchlist = []
 
-        for ticker, name in self.kospi_stocks.items():
-            print(f"분석 중: {name} ({ticker})...", end=" ")
-
-            indicators = self.calculate_technical_indicators(ticker)
-
-            if indicators:
-                # 추천 조건: 5% 이상 상승 또는 거래량 50% 이상 증가
-                if (indicators['price_change_pct'] >= 5 or
-                    indicators['volume_change_pct'] >= 50):
-
-                    score = self.calculate_recommendation_score(indicators)
-                    reason = self.generate_recommendation_reason(indicators)
-
-                    watchlist.append({
-                        "ticker": ticker,
-                        "company_name": name,
-                        "current_price": indicators['current_price'],
-                        "price_change_pct": indicators['price_change_pct'],
-                        "volume_change_pct": indicators['volume_change_pct'],
-                        "score": score,
-                        "reason": reason,
-                        "indicators": indicators
-                    })
-
-                    print(f"[RECOMMEND] Score: {score:.0f}")
-                else:
-                    print("[SKIP] Below threshold")
+        # 큐브 사용 시: 묶음 갱신 후 종목별 일봉은 메모리 매핑 뷰로 조회 (네트워크 없음)
+        cube = None
+        if use_cube:
+            tickers = list(self.kospi_stocks.keys())
+            self.price_store.refresh_many(tickers)
+            cube = get_price_cube()
+            cube.sync_from_store(self.price_store, tickers)
+
+        if concurrent:
+            limiter = RateLimiter(0 if cube else calls_per_second)
+
+            def evaluate(ticker: str, name: str):
+                limiter.acquire()
+                hist = cube.history(ticker, period_days=62) if cube else None
+                return self._evaluate_ticker(ticker, name, hist=hist)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(evaluate, ticker, name): (ticker, name)
+                    for ticker, name in self.kospi_stocks.items()
+                }
+
+                # 완료되는 순서대로 수집
+                for future in as_completed(futures):
+                    ticker, name = futures[future]
+                    try:
+                        entry, status = future.result()
+                    except Exception as e:
+                        entry, status = None, f"[FAIL] {str(e)}"
+
+                    print(f"분석 완료: {name} ({ticker})... {status}")
+                    if entry:
+                        watchlist.append(entry)
+        else:
+            for ticker, name in self.kospi_stocks.items():
+                print(f"분석 중: {name} ({ticker})...", end=" ")
+
+                hist = cube.history(ticker, period_days=62) if cube else None
+                entry, status = self._evaluate_ticker(ticker, name, hist=hist)
+                print(status)
+                if entry:
+                    watchlist.append(entry)
+
+                # API 제한 고려 (개별 조회 시에만)
+                if cube is None:
+                    time.sleep(0.5)
+
+        # 점수 순으로 정렬 (동점이면 종목 리스트 순서)
+        watchlist.sort(key=lambda x: (-x['score'], order[x['ticker']]))
+        watchlist = watchlist[:limit]
+
+        # 주요 공시: 시장 전체 동기화 1회 후 종목별 로컬 조회 (종목별 DART 호출 없음)
+        if include_disclosures and watchlist:
+            index = get_disclosure_index(get_api_key('DART_API_KEY'))
+            if index:
+                attach_indexed_disclosures(watchlist, index, disclosure_days)
             else:
-                print("[FAIL] Failed")
-
-            # API 제한 고려
-            time.sleep(0.5)
-
-        # 점수 순으로 정렬
-        watchlist.sort(key=lambda x: x['score'], reverse=True)
+                print("[WARN] DART API key not configured, skipping disclosures")
 
         print(f"\n{'='*70}")
         print(f"[OK] 분석 완료: {len(watchlist)}개 종목 발견")
         print(f"{'='*70}\n")
 
-        return watchlist[:limit]
+        return watchlist
 
     def get_market_summary(self) -> Dict[str, Any]:
         """
@@ -348,8 +446,7 @@ class MarketWatch:
         """
         try:
             # KOSPI 지수
-            kospi = yf.Ticker("^KS11")
-            kospi_hist = kospi.history(period="5d")
+            kospi_hist = yf_history("^KS11", period="5d")
 
             if len(kospi_hist) >= 2:
                 kospi_current = kospi_hist['Close'].iloc[-1]
@@ -359,8 +456,7 @@ class MarketWatch:
                 kospi_current = kospi_prev = kospi_change = 0
 
             # KOSDAQ 지수
-            kosdaq = yf.Ticker("^KQ11")
-            kosdaq_hist = kosdaq.history(period="5d")
+            kosdaq_hist = yf_history("^KQ11", period="5d")
 
             if len(kosdaq_hist) >= 2:
                 kosdaq_current = kosdaq_hist['Close'].iloc[-1]
@@ -0,0 +1,156 @@
+"""
+Global Macro Intelligence Hub - Metadata Cache
+yfinance Ticker.info (회사명, 통화 등) 조회 결과를 디스크에 TTL 캐시하는 모듈
+"""
+
+import sqlite3
+import threading
+import json
+import os
+import time
+from typing import Dict, Any, Optional
+
+from providers import yf_info
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), 'cache', 'metadata.sqlite3')
+
+
+class TickerInfoCache:
+    """
+    종목 메타데이터 캐시
+
+    - ttl_seconds 이내의 항목은 네트워크 요청 없이 반환
+    - max_entries를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+    """
+
+    def __init__(self, cache_path: str = None, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 5000):
+        """
+        Args:
+            cache_path: SQLite 파일 경로 (기본: cache/metadata.sqlite3)
+            ttl_seconds: 캐시 유효 시간 (초, 기본 7일)
+            max_entries: 최대 보관 종목 수
+        """
+        self.cache_path = cache_path or DEFAULT_CACHE_PATH
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._fetch_locks = {}
+
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ticker_info (
+                    ticker TEXT PRIMARY KEY,
+                    info TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.cache_path, timeout=30)
+
+    def peek(self, ticker: str, allow_stale: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 메타데이터 조회 (네트워크 요청 없음)
+
+        Args:
+            ticker: 종목 티커
+            allow_stale: True면 TTL이 지난 항목도 반환
+
+        Returns:
+            info 딕셔너리 (없으면 None)
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT info, fetched_at FROM ticker_info WHERE ticker = ?", (ticker,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            info, fetched_at = row
+            if not allow_stale and (time.time() - fetched_at) >= self.ttl_seconds:
+                return None
+
+            conn.execute("UPDATE ticker_info SET accessed_at = ? WHERE ticker = ?", (time.time(), ticker))
+
+        return json.loads(info)
+
+    def put(self, ticker: str, info: Dict[str, Any]):
+        """메타데이터 저장 후 용량 초과분 정리"""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ticker_info (ticker, info, fetched_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (ticker, json.dumps(info, ensure_ascii=False, default=str), now, now)
+            )
+            conn.execute("""
+                DELETE FROM ticker_info WHERE ticker IN (
+                    SELECT ticker FROM ticker_info ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+    def get_info(self, ticker: str, refresh: bool = False) -> Dict[str, Any]:
+        """
+        종목 메타데이터 조회 (캐시 미스/만료 시 yfinance 호출)
+
+        Args:
+            ticker: 종목 티커
+            refresh: True면 캐시를 무시하고 새로 조회
+
+        Returns:
+            info 딕셔너리 (조회 실패 시 만료된 캐시 또는 빈 딕셔너리)
+        """
+        if not refresh:
+            info = self.peek(ticker, allow_stale=False)
+            if info is not None:
+                return info
+
+        # 같은 종목을 여러 스레드가 동시에 조회하면 한 번만 요청
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(ticker, threading.Lock())
+
+        with fetch_lock:
+            if not refresh:
+                info = self.peek(ticker, allow_stale=False)
+                if info is not None:
+                    return info
+
+            try:
+                info = yf_info(ticker)
+                self.put(ticker, info)
+                return info
+            except Exception as e:
+                print(f"   [WARN] {ticker} metadata fetch failed: {str(e)}")
+                return self.peek(ticker) or {}
+
+    def get_company_name(self, ticker: str, fetch: bool = True) -> Optional[str]:
+        """
+        회사명 조회 (longName → shortName 순)
+
+        Args:
+            ticker: 종목 티커
+            fetch: False면 캐시에 있는 경우에만 반환
+
+        Returns:
+            회사명 (없으면 None)
+        """
+        info = self.get_info(ticker) if fetch else self.peek(ticker)
+        if not info:
+            return None
+        return info.get('longName') or info.get('shortName')
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> TickerInfoCache:
+    """프로세스 공용 TickerInfoCache 반환"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = TickerInfoCache()
+        return _default_cache
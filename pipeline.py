@@ -0,0 +1,191 @@
+"""
+Global Macro Intelligence Hub - Stage Pipeline
+단계별 작업자 풀과 크기가 제한된 큐로 연결한 파이프라인 실행기
+
+수집 → 분석 → 보고서처럼 순서가 정해진 단계를 여러 항목에 대해 겹쳐 실행합니다.
+(N+1번 종목 수집, N번 종목 LLM 분석, N-1번 종목 보고서 생성이 동시에 진행)
+다음 단계 큐가 가득 차면 앞 단계 작업자가 대기하므로, 느린 단계가 있어도
+앞 단계가 무한정 앞서 나가지 않습니다 (backpressure).
+"""
+
+import queue
+import threading
+import time
+from typing import Dict, List, Any, Callable, Iterable, Optional, Tuple
+
+from tracing import propagate
+
+
+# 단계 종료 신호
+_DONE = object()
+
+
+class Stage:
+    """파이프라인 단계 정의"""
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1, queue_size: int = None):
+        """
+        Args:
+            name: 단계 이름 (결과의 소요 시간 키)
+            func: 항목 값을 받아 다음 단계로 넘길 값을 반환하는 함수
+            workers: 단계 작업자 스레드 수
+            queue_size: 이 단계 입력 큐 크기 (기본: workers, 가득 차면 앞 단계가 대기)
+        """
+        if workers < 1:
+            raise ValueError(f"Stage {name}: workers must be >= 1")
+
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.queue_size = queue_size or workers
+
+
+class PipelineItem:
+    """파이프라인을 통과하는 항목 (단계별 소요/대기 시간 기록)"""
+
+    def __init__(self, index: int, key: str, value: Any):
+        self.index = index
+        self.key = key
+        self.value = value
+        self.error: Optional[str] = None
+        self.failed_stage: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self.waits: Dict[str, float] = {}
+        self._enqueued_at = time.perf_counter()
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class StagePipeline:
+    """
+    단계 파이프라인 실행기
+
+    - 단계마다 독립된 작업자 풀과 입력 큐
+    - 한 단계에서 실패한 항목은 이후 단계를 건너뛰고 결과에 오류로 남음
+    - 단계별 작업 시간 합계로 병목 단계 확인 가능 (stage_stats)
+    """
+
+    def __init__(self, stages: List[Stage], on_result: Callable[[PipelineItem], None] = None):
+        """
+        Args:
+            stages: 실행 순서대로 나열한 단계
+            on_result: 항목이 마지막 단계를 통과하거나 실패했을 때 호출 (작업자 스레드에서 호출)
+        """
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+
+        self.stages = stages
+        self.on_result = on_result
+        self.stage_stats: Dict[str, Dict[str, float]] = {}
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def _finish(self, item: PipelineItem, results: List[PipelineItem]):
+        with self._lock:
+            results.append(item)
+        if self.on_result:
+            try:
+                self.on_result(item)
+            except Exception as e:
+                # 콜백 오류로 작업자가 멈추면 다음 단계가 종료 신호를 받지 못함
+                print(f"[WARN] Pipeline result callback failed for {item.key}: {str(e)}")
+
+    def _worker(
+        self,
+        position: int,
+        queues: List[queue.Queue],
+        remaining: List[int],
+        results: List[PipelineItem]
+    ):
+        stage = self.stages[position]
+        inbox = queues[position]
+        outbox = queues[position + 1] if position + 1 < len(self.stages) else None
+
+        try:
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    break
+
+                item.waits[stage.name] = time.perf_counter() - item._enqueued_at
+                start = time.perf_counter()
+                try:
+                    item.value = stage.func(item.value)
+                except BaseException as e:
+                    # SystemExit 등도 항목 실패로 처리 (작업자가 빠지면 앞 단계가 큐에서 멈춤)
+                    item.error = str(e) or type(e).__name__
+                    item.failed_stage = stage.name
+                finally:
+                    item.timings[stage.name] = time.perf_counter() - start
+                    with self._lock:
+                        stats = self.stage_stats[stage.name]
+                        stats["busy_seconds"] += item.timings[stage.name]
+                        stats["items"] += 1
+
+                if item.ok and outbox is not None:
+                    item._enqueued_at = time.perf_counter()
+                    # 다음 단계 큐가 가득 차면 여기서 대기 (backpressure)
+                    outbox.put(item)
+                else:
+                    self._finish(item, results)
+        finally:
+            # 이 단계의 마지막 작업자가 끝나면 다음 단계 작업자들에게 종료 신호 전달
+            # (작업자가 예외로 끝나도 run()의 join이 멈추지 않도록 항상 수행)
+            with self._lock:
+                remaining[position] -= 1
+                last = remaining[position] == 0
+            if last and outbox is not None:
+                for _ in range(self.stages[position + 1].workers):
+                    outbox.put(_DONE)
+
+    def run(self, inputs: Iterable[Tuple[str, Any]]) -> List[PipelineItem]:
+        """
+        모든 항목을 파이프라인으로 처리
+
+        Args:
+            inputs: (키, 첫 단계 입력 값) 목록
+
+        Returns:
+            입력 순서대로 정렬한 PipelineItem 리스트
+        """
+        queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        remaining = [stage.workers for stage in self.stages]
+        results: List[PipelineItem] = []
+        self.stage_stats = {
+            stage.name: {"workers": stage.workers, "busy_seconds": 0.0, "items": 0}
+            for stage in self.stages
+        }
+
+        threads = []
+        for position, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=propagate(self._worker),
+                    args=(position, queues, remaining, results),
+                    name=f"pipeline-{stage.name}-{n}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        start = time.perf_counter()
+
+        # 첫 단계 큐도 제한되므로 입력은 처리 속도에 맞춰 공급됨
+        for index, (key, value) in enumerate(inputs):
+            queues[0].put(PipelineItem(index, key, value))
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_DONE)
+
+        for thread in threads:
+            thread.join()
+
+        elapsed = time.perf_counter() - start
+        for stats in self.stage_stats.values():
+            # 작업자 수 대비 실제 작업 시간 비율 (1.0에 가까울수록 병목)
+            capacity = stats["workers"] * elapsed
+            stats["utilization"] = stats["busy_seconds"] / capacity if capacity > 0 else 0.0
+        self.elapsed = elapsed
+
+        return sorted(results, key=lambda item: item.index)
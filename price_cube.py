@@ -0,0 +1,414 @@
+"""
+Global Macro Intelligence Hub - Price Cube
+(종목 × 날짜 × 필드) float32 메모리 매핑 배열로 일봉을 프로세스 간 공유하는 모듈
+"""
+
+import numpy as np
+import pandas as pd
+import json
+import os
+import bisect
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+from price_loader import OHLCV_COLUMNS
+from price_store import PriceStore, get_price_store
+
+
+DEFAULT_CUBE_DIR = os.path.join(os.path.dirname(__file__), 'cache', 'cube')
+
+
+@contextmanager
+def _file_lock(path: str):
+    """프로세스 간 배타 잠금 (잠금 파일 기준, 블로킹)"""
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK은 약 10초 재시도 후 실패하므로 잠금을 얻을 때까지 반복
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class PriceCube:
+    """
+    메모리 매핑 가격 큐브
+
+    - 데이터 파일: cube_v{버전}.f32 (종목 × 날짜 용량 × 필드, C 순서)
+    - 인덱스 파일: index.json (종목/날짜 목록, 현재 데이터 파일, 유효 날짜 수)
+
+    읽는 쪽은 인덱스의 유효 날짜 수(n_dates)까지만 사용하므로, 새 날짜는 빈 슬롯에
+    먼저 기록한 뒤 인덱스를 원자적으로 교체(os.replace)하는 방식으로 추가됩니다.
+    이미 공개된 슬롯(장중 갱신된 마지막 날짜 등)은 제자리에서 고치지 않고, 파일을 복사한
+    새 버전에 기록한 뒤 인덱스를 교체합니다. 종목 구성이 바뀌거나 용량이 부족하거나
+    저장소 이력이 바뀌면(PriceStore revision) 저장소 전체 이력으로 새 버전을 만듭니다.
+    동기화는 잠금 파일(sync.lock)로 프로세스 간에도 한 번에 하나만 수행합니다.
+    같은 호스트의 여러 프로세스는 OS 페이지 캐시의 한 사본을 공유합니다.
+    """
+
+    FIELDS = OHLCV_COLUMNS
+    REFRESH_RETRIES = 3
+
+    def __init__(self, cube_dir: str = None, date_growth: int = 256):
+        """
+        Args:
+            cube_dir: 큐브 저장 디렉토리 (기본: cache/cube)
+            date_growth: 재작성 시 여유로 확보할 날짜 슬롯 수
+        """
+        self.cube_dir = cube_dir or DEFAULT_CUBE_DIR
+        self.date_growth = date_growth
+        self.index_path = os.path.join(self.cube_dir, 'index.json')
+        self.lock_path = os.path.join(self.cube_dir, 'sync.lock')
+
+        self._index = None
+        self._index_mtime = None
+        self._data = None
+        self._ticker_pos = {}
+        self._date_index = None
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cube_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> bool:
+        """
+        인덱스가 바뀌었으면 다시 매핑
+
+        Returns:
+            사용 가능한 큐브가 있는지 여부
+        """
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            return False
+
+        # os.replace로 교체되면 inode가 바뀜
+        mtime = (stat.st_ino, stat.st_mtime_ns)
+        if mtime == self._index_mtime and self._data is not None:
+            return True
+
+        for attempt in range(self.REFRESH_RETRIES):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+
+            data_path = os.path.join(self.cube_dir, index['data_file'])
+            shape = (len(index['tickers']), index['date_capacity'], len(index['fields']))
+
+            try:
+                data = np.memmap(data_path, dtype=np.float32, mode='r', shape=shape)
+                break
+            except FileNotFoundError:
+                # 인덱스를 읽은 사이 다른 프로세스가 두 번 이상 동기화해 파일이 정리됨 → 인덱스 재조회
+                if attempt == self.REFRESH_RETRIES - 1:
+                    raise
+                stat = os.stat(self.index_path)
+                mtime = (stat.st_ino, stat.st_mtime_ns)
+
+        self._data = data
+        self._index = index
+        self._index_mtime = mtime
+        self._ticker_pos = {t: i for i, t in enumerate(index['tickers'])}
+        self._date_index = pd.DatetimeIndex(pd.to_datetime(self.dates), name='Date')
+        return True
+
+    @property
+    def tickers(self) -> List[str]:
+        """큐브에 포함된 종목"""
+        return list(self._index['tickers']) if self._index else []
+
+    @property
+    def dates(self) -> List[str]:
+        """유효 날짜 목록 ('YYYY-MM-DD')"""
+        if not self._index:
+            return []
+        return self._index['dates'][:self._index['n_dates']]
+
+    def _start_position(self, period_days: int = None) -> int:
+        """period_days(달력일) 기준 시작 날짜 위치"""
+        if period_days is None:
+            return 0
+        start = (datetime.now() - timedelta(days=period_days)).strftime('%Y-%m-%d')
+        return bisect.bisect_left(self.dates, start)
+
+    def history(self, ticker: str, period_days: int = None) -> Optional[pd.DataFrame]:
+        """
+        종목 일봉 조회 (복사 없는 뷰)
+
+        Args:
+            ticker: 종목 티커
+            period_days: 반환할 기간 (달력일, None이면 전체)
+
+        Returns:
+            OHLCV DataFrame (큐브에 없는 종목이면 None)
+        """
+        if not self.refresh() or ticker not in self._ticker_pos:
+            return None
+
+        n_dates = self._index['n_dates']
+        start = self._start_position(period_days)
+        view = self._data[self._ticker_pos[ticker], start:n_dates, :]
+
+        frame = pd.DataFrame(
+            view,
+            index=self._date_index[start:],
+            columns=self.FIELDS,
+            copy=False
+        )
+        # 상장 전/거래 정지일(NaN) 제외
+        return frame[frame['Close'].notna()]
+
+    def field_matrix(self, field: str, tickers: List[str] = None, period_days: int = None) -> pd.DataFrame:
+        """
+        (날짜 × 종목) 필드 행렬 조회
+
+        Args:
+            field: 필드명 (예: 'Close')
+            tickers: 종목 리스트 (None이면 전체, 큐브에 없는 종목은 제외)
+            period_days: 반환할 기간 (달력일, None이면 전체)
+
+        Returns:
+            날짜 인덱스, 티커 컬럼의 DataFrame
+        """
+        if not self.refresh():
+            return pd.DataFrame()
+
+        tickers = [t for t in (tickers or self.tickers) if t in self._ticker_pos]
+        positions = [self._ticker_pos[t] for t in tickers]
+
+        n_dates = self._index['n_dates']
+        start = self._start_position(period_days)
+        field_pos = self.FIELDS.index(field)
+
+        # 전체 종목을 순서대로 요청하면 뷰, 부분 집합이면 해당 종목만 복사
+        if positions == list(range(len(self._ticker_pos))):
+            block = self._data[:, start:n_dates, field_pos]
+        else:
+            block = self._data[positions, start:n_dates, field_pos]
+
+        return pd.DataFrame(
+            block.T,
+            index=self._date_index[start:],
+            columns=tickers,
+            copy=False
+        )
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+
+    def _write_index(self, index: Dict[str, Any]):
+        """인덱스 원자적 교체"""
+        tmp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _publish(self, index: Dict[str, Any]):
+        """
+        새 버전 인덱스 공개 후 오래된 버전 파일 정리 (sync.lock 보유 중 호출)
+
+        직전 버전 파일은 남겨 두어, 교체 직전 인덱스를 읽고 아직 매핑하지 않은 프로세스도
+        파일을 열 수 있게 합니다. 그보다 오래된 파일만 삭제합니다.
+        (이미 매핑한 프로세스는 파일이 삭제돼도 기존 매핑을 계속 사용)
+        """
+        keep = {index['data_file']}
+        if self._index:
+            keep.add(self._index['data_file'])
+        self._write_index(index)
+
+        for name in os.listdir(self.cube_dir):
+            if name.startswith('cube_v') and name.endswith('.f32') and name not in keep:
+                try:
+                    os.remove(os.path.join(self.cube_dir, name))
+                except OSError:
+                    pass
+
+    def _rebuild(self, store: PriceStore, tickers: List[str], revisions: Dict[str, int]):
+        """저장소 전체 이력으로 새 버전 파일 생성"""
+        frames = {t: store.read(t) for t in tickers}
+        dates = sorted({d.strftime('%Y-%m-%d') for f in frames.values() for d in f.index})
+        date_pos = {d: i for i, d in enumerate(dates)}
+
+        version = (self._index['version'] + 1) if self._index else 1
+        data_file = f"cube_v{version}.f32"
+        capacity = len(dates) + self.date_growth
+        shape = (len(tickers), capacity, len(self.FIELDS))
+
+        data = np.memmap(os.path.join(self.cube_dir, data_file), dtype=np.float32, mode='w+', shape=shape)
+        data[:] = np.nan
+
+        for i, ticker in enumerate(tickers):
+            frame = frames[ticker]
+            if len(frame) == 0:
+                continue
+            rows = [date_pos[d.strftime('%Y-%m-%d')] for d in frame.index]
+            data[i, rows, :] = frame[self.FIELDS].to_numpy(dtype=np.float32)
+
+        data.flush()
+        del data
+
+        self._publish({
+            "version": version,
+            "data_file": data_file,
+            "tickers": tickers,
+            "fields": self.FIELDS,
+            "dates": dates,
+            "n_dates": len(dates),
+            "date_capacity": capacity,
+            "revisions": revisions,
+            "updated_at": datetime.now().isoformat()
+        })
+
+        print(f"   [OK] Price cube rebuilt: {len(tickers)} tickers x {len(dates)} dates")
+
+    def _append(self, store: PriceStore, tickers: List[str]) -> bool:
+        """
+        마지막 날짜 이후 봉을 빈 슬롯에 기록 후 인덱스 교체
+
+        마지막 기존 날짜의 값이 바뀌었으면(장중 갱신) 현재 파일을 복사한 새 버전에 기록합니다.
+
+        Returns:
+            성공 여부 (용량 부족 시 False)
+        """
+        index = self._index
+        n_dates = index['n_dates']
+        last_date = index['dates'][n_dates - 1] if n_dates else None
+
+        frames = {t: store.read(t, start=last_date) for t in tickers}
+        new_dates = sorted({
+            d.strftime('%Y-%m-%d') for f in frames.values() for d in f.index
+            if last_date is None or d.strftime('%Y-%m-%d') > last_date
+        })
+
+        if n_dates + len(new_dates) > index['date_capacity']:
+            return False
+
+        dates = index['dates'][:n_dates] + new_dates
+        date_pos = {d: i for i, d in enumerate(dates[max(n_dates - 1, 0):], start=max(n_dates - 1, 0))}
+
+        # 공개된 마지막 날짜 슬롯이 바뀌는지 확인
+        last_rows = {}
+        for ticker, frame in frames.items():
+            if last_date is not None and len(frame) > 0 and frame.index[0].strftime('%Y-%m-%d') == last_date:
+                last_rows[self._ticker_pos[ticker]] = frame[self.FIELDS].iloc[0].to_numpy(dtype=np.float32)
+
+        data_file = index['data_file']
+        shape = (len(index['tickers']), index['date_capacity'], len(self.FIELDS))
+        data = np.memmap(os.path.join(self.cube_dir, data_file), dtype=np.float32, mode='r+', shape=shape)
+
+        last_changed = any(
+            not np.array_equal(data[i, n_dates - 1, :], row, equal_nan=True) for i, row in last_rows.items()
+        )
+        if last_changed:
+            # 읽는 쪽이 매핑 중인 슬롯은 고치지 않고 복사본(새 버전)에 기록
+            del data
+            version = index['version'] + 1
+            data_file = f"cube_v{version}.f32"
+            shutil.copyfile(os.path.join(self.cube_dir, index['data_file']), os.path.join(self.cube_dir, data_file))
+            data = np.memmap(os.path.join(self.cube_dir, data_file), dtype=np.float32, mode='r+', shape=shape)
+            index = dict(index, version=version, data_file=data_file)
+
+        # 새 슬롯 초기화 후 기록
+        data[:, n_dates:len(dates), :] = np.nan
+        for ticker, frame in frames.items():
+            if len(frame) == 0:
+                continue
+            i = self._ticker_pos[ticker]
+            rows = [date_pos[d.strftime('%Y-%m-%d')] for d in frame.index]
+            data[i, rows, :] = frame[self.FIELDS].to_numpy(dtype=np.float32)
+
+        data.flush()
+        del data
+
+        self._publish(dict(index, dates=dates, n_dates=len(dates), updated_at=datetime.now().isoformat()))
+
+        print(f"   [OK] Price cube appended: {len(new_dates)} new dates"
+              f"{' (last date updated in new version)' if last_changed else ''}")
+        return True
+
+    def sync_from_store(self, store: PriceStore = None, tickers: List[str] = None):
+        """
+        로컬 일봉 저장소 내용을 큐브에 반영
+
+        Args:
+            store: 원본 PriceStore (None이면 공용 저장소)
+            tickers: 큐브 종목 구성 (None이면 기존 구성 유지)
+        """
+        store = store or get_price_store()
+
+        with self._lock, _file_lock(self.lock_path):
+            # 다른 프로세스가 먼저 동기화했을 수 있으므로 잠금 후 인덱스를 다시 읽음
+            self._index_mtime = None
+            self.refresh()
+            tickers = list(tickers) if tickers else self.tickers
+
+            if not tickers:
+                return
+
+            # 과거 봉이 바뀐 종목(분할/배당 재수집, 과거 봉 보충)이 있으면 전체 재작성
+            revisions = store.revisions(tickers)
+            if (
+                self._index is None
+                or tickers != self._index['tickers']
+                or revisions != self._index.get('revisions')
+                or not self._append(store, tickers)
+            ):
+                self._rebuild(store, tickers, revisions)
+
+            self._index_mtime = None
+            self.refresh()
+
+
+_default_cube = None
+_default_cube_lock = threading.Lock()
+
+
+def get_price_cube() -> PriceCube:
+    """프로세스 공용 PriceCube 반환"""
+    global _default_cube
+    with _default_cube_lock:
+        if _default_cube is None:
+            _default_cube = PriceCube()
+        return _default_cube
+
+
+def main():
+    """저장소의 전체 종목으로 큐브 동기화 (배치 작업용)"""
+    from screener import StockScreener
+
+    tickers = list(StockScreener().watch_stocks.keys())
+    store = get_price_store()
+
+    # 저장소 증분 갱신 후 큐브 반영
+    store.refresh_many(tickers)
+    get_price_cube().sync_from_store(store, tickers)
+
+
+if __name__ == "__main__":
+    main()
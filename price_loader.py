@@ -0,0 +1,138 @@
+"""
+Global Macro Intelligence Hub - Price Loader
+여러 종목의 일봉(OHLCV)을 묶음 단위로 한 번에 내려받는 모듈
+"""
+
+import pandas as pd
+from typing import Dict, List
+import time
+
+from providers import yf_download
+
+
+# yfinance history()와 동일한 컬럼 구성
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def _chunked(items: List[str], size: int) -> List[List[str]]:
+    """리스트를 size 크기의 묶음으로 분할"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _split_download_frame(frame: pd.DataFrame, tickers: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    yf.download 결과(다중 컬럼)를 종목별 DataFrame으로 분리
+
+    Args:
+        frame: yf.download 반환값
+        tickers: 요청한 티커 리스트
+
+    Returns:
+        {티커: OHLCV DataFrame} (데이터 없는 종목은 제외)
+    """
+    histories = {}
+
+    if frame is None or frame.empty:
+        return histories
+
+    for ticker in tickers:
+        if isinstance(frame.columns, pd.MultiIndex):
+            if ticker not in frame.columns.get_level_values(0):
+                continue
+            hist = frame[ticker]
+        else:
+            # 단일 종목 요청 시 구버전 yfinance는 단일 컬럼으로 반환
+            if len(tickers) != 1:
+                continue
+            hist = frame
+
+        hist = hist[[c for c in OHLCV_COLUMNS if c in hist.columns]]
+
+        # 거래가 없는 날(해당 종목만 NaN) 제거
+        hist = hist.dropna(subset=['Close'])
+
+        if len(hist) > 0:
+            histories[ticker] = hist
+
+    return histories
+
+
+def download_price_history(
+    tickers: List[str],
+    period: str = "2mo",
+    interval: str = "1d",
+    chunk_size: int = 50,
+    max_retries: int = 3,
+    retry_delay: float = 2.0,
+    start: str = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    여러 종목의 주가 데이터를 묶음 요청으로 수집
+
+    종목 수가 아니라 묶음(chunk) 수만큼만 네트워크 요청이 발생합니다.
+    묶음 단위로 실패 시 재시도하며, 재시도 후에도 실패한 종목은 결과에서 제외됩니다.
+    정상 응답에서 재시도 후에도 데이터가 없는 종목(상장폐지 등)은 더 이상 재시도하지 않습니다.
+
+    Args:
+        tickers: 종목 티커 리스트
+        period: 조회 기간 (예: "2mo")
+        interval: 봉 간격 (예: "1d")
+        chunk_size: 한 번에 요청할 종목 수
+        max_retries: 묶음별 최대 재시도 횟수
+        retry_delay: 재시도 간 대기 시간 (초, 시도마다 배수 증가)
+        start: 조회 시작일 ('YYYY-MM-DD', 지정 시 period 대신 사용)
+
+    Returns:
+        {티커: OHLCV DataFrame} 딕셔너리
+    """
+    histories = {}
+    chunks = _chunked(list(tickers), chunk_size)
+
+    for index, chunk in enumerate(chunks, 1):
+        pending = chunk
+        empty = set()
+        unavailable = []
+
+        for attempt in range(1, max_retries + 1):
+            try:
+                print(f"   [INFO] Batch download {index}/{len(chunks)} "
+                      f"({len(pending)} tickers, attempt {attempt})...")
+
+                # 시작일이 있으면 그 이후 봉만 요청
+                range_kwargs = {"start": start} if start else {"period": period}
+
+                frame = yf_download(
+                    tickers=pending,
+                    interval=interval,
+                    group_by='ticker',
+                    auto_adjust=True,
+                    threads=True,
+                    progress=False,
+                    **range_kwargs
+                )
+
+                loaded = _split_download_frame(frame, pending)
+                histories.update(loaded)
+
+                # 일부 종목만 누락된 경우 누락분만 다시 요청
+                # (재시도에서도 비어 있으면 데이터가 없는 종목으로 보고 제외)
+                missing = [t for t in pending if t not in loaded]
+                unavailable.extend(t for t in missing if t in empty)
+                pending = [t for t in missing if t not in empty]
+                empty.update(missing)
+                if not pending:
+                    break
+
+            except Exception as e:
+                print(f"   [WARN] Batch download failed: {str(e)}")
+
+            if attempt < max_retries:
+                time.sleep(retry_delay * attempt)
+
+        pending = unavailable + pending
+        if pending:
+            print(f"   [WARN] No data for {len(pending)} tickers: {', '.join(pending[:5])}"
+                  f"{' ...' if len(pending) > 5 else ''}")
+
+    print(f"   [OK] Batch download complete: {len(histories)}/{len(tickers)} tickers")
+    return histories
@@ -0,0 +1,377 @@
+"""
+Global Macro Intelligence Hub - Price Store
+종목별 일봉(OHLCV) 전체 이력을 로컬 SQLite에 보관하고 증분 갱신하는 모듈
+"""
+
+import pandas as pd
+import sqlite3
+import threading
+import math
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from price_loader import download_price_history, OHLCV_COLUMNS
+from providers import yf_history
+
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), 'cache', 'prices.sqlite3')
+
+# 겹치는 봉의 수정종가가 이 비율 이상 다르면 분할/배당으로 수정 기준이 바뀐 것으로 판단
+REBASE_TOLERANCE = 1e-4
+
+
+class PriceStore:
+    """
+    로컬 일봉 저장소 (읽기 경유 캐시)
+
+    - 처음 조회하는 종목은 initial_period만큼 내려받아 저장
+    - 이후에는 마지막 직전 저장일(기준 봉)부터 요청 (마지막 봉은 장중 갱신을 위해 다시 받음)
+    - 기준 봉의 수정종가가 저장값과 다르면(분할/배당) 종목 전체 이력을 다시 받아 교체
+    - max_age_seconds 이내에 갱신한 종목은 네트워크 요청 없이 저장본을 반환
+    - 마지막 저장일 이전 봉이 바뀌면(전체 교체/과거 봉 보충) 종목 revision 증가
+      (지표 상태/가격 큐브는 revision이 바뀌면 저장소 이력으로 다시 계산)
+    """
+
+    def __init__(self, db_path: str = None, initial_period: str = "1y", max_age_seconds: int = 900):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (기본: cache/prices.sqlite3)
+            initial_period: 신규 종목 최초 수집 기간
+            max_age_seconds: 재조회 없이 저장본을 사용할 최대 경과 시간 (초)
+        """
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self.initial_period = initial_period
+        self.max_age_seconds = max_age_seconds
+        self._write_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """스레드별로 새 연결 생성 (여러 스레드에서 동시 사용 가능)"""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        """테이블 생성"""
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS bars (
+                    ticker TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    open REAL, high REAL, low REAL, close REAL, volume REAL,
+                    PRIMARY KEY (ticker, date)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS fetch_log (
+                    ticker TEXT PRIMARY KEY,
+                    fetched_at REAL NOT NULL,
+                    revision INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+            # revision 컬럼 도입 전 파일
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(fetch_log)")}
+            if 'revision' not in columns:
+                conn.execute("ALTER TABLE fetch_log ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+
+    def last_date(self, ticker: str) -> Optional[str]:
+        """마지막 저장일 ('YYYY-MM-DD', 없으면 None)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(date) FROM bars WHERE ticker = ?", (ticker,)).fetchone()
+        return row[0] if row else None
+
+    def _anchor(self, ticker: str) -> Optional[Tuple[str, float]]:
+        """
+        증분 수집 기준 봉 (마지막 직전 저장 봉, 저장 봉이 하나면 그 봉)
+
+        Returns:
+            (날짜, 종가) (저장된 봉이 없으면 None)
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT date, close FROM bars WHERE ticker = ? ORDER BY date DESC LIMIT 2", (ticker,)
+            ).fetchall()
+        return tuple(rows[-1]) if rows else None
+
+    def _first_date(self, ticker: str) -> Optional[str]:
+        """최초 저장일 ('YYYY-MM-DD', 없으면 None)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT MIN(date) FROM bars WHERE ticker = ?", (ticker,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _is_rebased(anchor: Tuple[str, float], hist: pd.DataFrame) -> bool:
+        """새로 받은 기준 봉의 수정종가가 저장값과 다른지 여부 (기준 봉이 없으면 False)"""
+        date, close = anchor
+        if hist is None or len(hist) == 0:
+            return False
+
+        mask = hist.index.strftime('%Y-%m-%d') == date
+        if not mask.any():
+            return False
+
+        fetched = float(hist['Close'][mask].iloc[-1])
+        return not math.isclose(fetched, close, rel_tol=REBASE_TOLERANCE)
+
+    def revisions(self, tickers: List[str]) -> Dict[str, int]:
+        """
+        종목별 이력 revision (마지막 저장일 이전 봉이 바뀔 때마다 증가)
+
+        Returns:
+            {티커: revision} (저장 기록이 없는 종목은 0)
+        """
+        tickers = list(tickers)
+        result = dict.fromkeys(tickers, 0)
+        with self._connect() as conn:
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT ticker, revision FROM fetch_log WHERE ticker IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                result.update(rows)
+        return result
+
+    def revision(self, ticker: str) -> int:
+        """종목 이력 revision"""
+        return self.revisions([ticker])[ticker]
+
+    def _fetched_at(self, ticker: str) -> Optional[float]:
+        """마지막 네트워크 갱신 시각 (epoch 초)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT fetched_at FROM fetch_log WHERE ticker = ?", (ticker,)).fetchone()
+        return row[0] if row else None
+
+    def is_fresh(self, ticker: str) -> bool:
+        """max_age_seconds 이내에 갱신되었는지 여부"""
+        fetched_at = self._fetched_at(ticker)
+        return fetched_at is not None and (time.time() - fetched_at) < self.max_age_seconds
+
+    def read(self, ticker: str, start: str = None) -> pd.DataFrame:
+        """
+        저장된 일봉 조회
+
+        Args:
+            ticker: 종목 티커
+            start: 조회 시작일 ('YYYY-MM-DD', None이면 전체)
+
+        Returns:
+            yfinance history()와 같은 형태의 OHLCV DataFrame
+        """
+        query = "SELECT date, open, high, low, close, volume FROM bars WHERE ticker = ?"
+        params = [ticker]
+        if start:
+            query += " AND date >= ?"
+            params.append(start)
+        query += " ORDER BY date"
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        frame = pd.DataFrame(rows, columns=['Date'] + OHLCV_COLUMNS)
+        frame['Date'] = pd.to_datetime(frame['Date'])
+        return frame.set_index('Date')
+
+    def write(self, ticker: str, hist: pd.DataFrame, replace: bool = False):
+        """
+        일봉 저장 (같은 날짜는 덮어쓰기)
+
+        Args:
+            ticker: 종목 티커
+            hist: OHLCV DataFrame (DatetimeIndex)
+            replace: True면 기존 이력을 모두 지우고 hist로 교체 (수정 기준 변경 시)
+        """
+        rows = [
+            (
+                ticker,
+                date.strftime('%Y-%m-%d'),
+                float(row['Open']), float(row['High']), float(row['Low']),
+                float(row['Close']), float(row['Volume'])
+            )
+            for date, row in hist.iterrows()
+            if pd.notna(row['Close'])
+        ]
+
+        with self._write_lock, self._connect() as conn:
+            if replace:
+                conn.execute("DELETE FROM bars WHERE ticker = ?", (ticker,))
+                changed = True
+            else:
+                changed = self._changes_history(conn, ticker, rows)
+
+            conn.executemany(
+                "INSERT OR REPLACE INTO bars (ticker, date, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._log_fetch(conn, [ticker], revision_step=int(changed))
+
+    @staticmethod
+    def _changes_history(conn: sqlite3.Connection, ticker: str, rows: List[tuple]) -> bool:
+        """마지막 저장일 이전 봉을 새로 추가하거나 다른 종가로 바꾸는지 여부"""
+        last = conn.execute("SELECT MAX(date) FROM bars WHERE ticker = ?", (ticker,)).fetchone()[0]
+        earlier = [row for row in rows if last is not None and row[1] < last]
+        if not earlier:
+            return False
+
+        stored = dict(conn.execute(
+            "SELECT date, close FROM bars WHERE ticker = ? AND date >= ? AND date < ?",
+            (ticker, min(row[1] for row in earlier), last)
+        ).fetchall())
+        return any(
+            row[1] not in stored or not math.isclose(row[5], stored[row[1]], rel_tol=REBASE_TOLERANCE)
+            for row in earlier
+        )
+
+    @staticmethod
+    def _log_fetch(conn: sqlite3.Connection, tickers: List[str], revision_step: int = 0):
+        conn.executemany(
+            "INSERT INTO fetch_log (ticker, fetched_at, revision) VALUES (?, ?, ?) "
+            "ON CONFLICT(ticker) DO UPDATE SET fetched_at = excluded.fetched_at, "
+            "revision = revision + excluded.revision",
+            [(ticker, time.time(), revision_step) for ticker in tickers]
+        )
+
+    def mark_fetched(self, tickers: List[str]):
+        """데이터가 없던 종목도 갱신 시각 기록 (max_age_seconds 동안 다시 요청하지 않음)"""
+        if not tickers:
+            return
+        with self._write_lock, self._connect() as conn:
+            self._log_fetch(conn, tickers)
+
+    def _fetch_single(self, ticker: str, start: Optional[str]) -> pd.DataFrame:
+        """단일 종목 신규/증분 수집"""
+        if start:
+            return yf_history(ticker, start=start, interval="1d")
+        return yf_history(ticker, period=self.initial_period, interval="1d")
+
+    def _refresh_single(self, ticker: str):
+        """단일 종목 증분 갱신 (수정 기준이 바뀌었으면 전체 이력 교체)"""
+        anchor = self._anchor(ticker)
+        hist = self._fetch_single(ticker, anchor[0] if anchor else None)
+
+        if anchor and self._is_rebased(anchor, hist):
+            print(f"   [INFO] {ticker} adjusted prices changed (split/dividend), reloading full history")
+            hist = self._fetch_single(ticker, self._first_date(ticker))
+            self.write(ticker, hist, replace=True)
+        else:
+            self.write(ticker, hist)
+
+    def get_history(self, ticker: str, period_days: int = 62, refresh: bool = True) -> pd.DataFrame:
+        """
+        최근 period_days(달력일) 일봉 조회 (필요 시 증분 갱신)
+
+        Args:
+            ticker: 종목 티커
+            period_days: 반환할 기간 (달력일 기준)
+            refresh: False면 네트워크 요청 없이 저장본만 반환
+
+        Returns:
+            OHLCV DataFrame
+        """
+        if refresh and not self.is_fresh(ticker):
+            try:
+                self._refresh_single(ticker)
+            except Exception as e:
+                # 네트워크 실패 시 저장본으로 대체
+                print(f"   [WARN] {ticker} price refresh failed, using stored data: {str(e)}")
+
+        start = (datetime.now() - timedelta(days=period_days)).strftime('%Y-%m-%d')
+        return self.read(ticker, start=start)
+
+    def refresh_many(self, tickers: List[str], chunk_size: int = 50):
+        """
+        여러 종목 증분 갱신 (묶음 요청)
+
+        신규 종목은 initial_period만큼, 기존 종목은 기준 봉 날짜가 같은 종목끼리 묶어
+        그 날짜부터 내려받습니다. 기준 봉의 수정종가가 바뀐 종목은 전체 이력을 다시 받아
+        교체하고, 데이터가 없던 종목도 갱신 시각을 기록해 매번 다시 요청하지 않습니다.
+
+        Args:
+            tickers: 종목 티커 리스트
+            chunk_size: 묶음 요청당 종목 수
+        """
+        stale = [t for t in tickers if not self.is_fresh(t)]
+        anchors = {t: self._anchor(t) for t in stale}
+
+        # 기준 봉 날짜별 묶음 (신규 종목은 None)
+        groups: Dict[Optional[str], List[str]] = {}
+        for ticker in stale:
+            groups.setdefault(anchors[ticker][0] if anchors[ticker] else None, []).append(ticker)
+
+        rebased = []
+        for start, group in groups.items():
+            if start is None:
+                loaded = download_price_history(group, period=self.initial_period, chunk_size=chunk_size)
+            else:
+                loaded = download_price_history(group, start=start, chunk_size=chunk_size)
+
+            for ticker, hist in loaded.items():
+                if anchors[ticker] and self._is_rebased(anchors[ticker], hist):
+                    rebased.append(ticker)
+                else:
+                    self.write(ticker, hist)
+
+            self.mark_fetched([t for t in group if t not in loaded])
+
+        if rebased:
+            print(f"   [INFO] Adjusted prices changed for {len(rebased)} tickers (split/dividend), "
+                  f"reloading full history")
+            self._reload_full(rebased, chunk_size)
+
+    def _reload_full(self, tickers: List[str], chunk_size: int = 50):
+        """종목 전체 저장 기간을 다시 받아 이력 교체 (실패한 종목은 다음 갱신 때 재시도)"""
+        groups: Dict[str, List[str]] = {}
+        for ticker in tickers:
+            groups.setdefault(self._first_date(ticker), []).append(ticker)
+
+        for start, group in groups.items():
+            loaded = download_price_history(group, start=start, chunk_size=chunk_size)
+            for ticker, hist in loaded.items():
+                self.write(ticker, hist, replace=True)
+
+    def get_histories(
+        self,
+        tickers: List[str],
+        period_days: int = 62,
+        chunk_size: int = 50,
+        refresh: bool = True
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        여러 종목 일봉 조회 (묶음 요청으로 증분 갱신)
+
+        Args:
+            tickers: 종목 티커 리스트
+            period_days: 반환할 기간 (달력일 기준)
+            chunk_size: 묶음 요청당 종목 수
+            refresh: False면 네트워크 요청 없이 저장본만 반환
+
+        Returns:
+            {티커: OHLCV DataFrame} (데이터 없는 종목 제외)
+        """
+        if refresh:
+            self.refresh_many(tickers, chunk_size=chunk_size)
+
+        start = (datetime.now() - timedelta(days=period_days)).strftime('%Y-%m-%d')
+        histories = {}
+        for ticker in tickers:
+            hist = self.read(ticker, start=start)
+            if len(hist) > 0:
+                histories[ticker] = hist
+
+        return histories
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """프로세스 공용 PriceStore 반환"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = PriceStore()
+        return _default_store
@@ -0,0 +1,222 @@
+"""
+Global Macro Intelligence Hub - Providers
+외부 데이터 호출(yfinance, HTTP, LLM)을 기록/재생하는 공급자 계층
+
+모드 (환경변수 PROVIDER_MODE 또는 configure_providers):
+- live: 실제 호출 (기본)
+- record: 실제 호출 후 응답을 gzip 압축 픽스처로 저장
+- replay: 픽스처만 사용 (네트워크 없음), 호출마다 지정한 지연 시간 주입
+"""
+
+import yfinance as yf
+import pandas as pd
+import threading
+import hashlib
+import pickle
+import gzip
+import json
+import os
+import time
+from typing import Dict, Any, Callable, Optional
+
+from tracing import span
+
+
+PROVIDER_MODES = ('live', 'record', 'replay')
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+class FixtureMissingError(Exception):
+    """replay 모드에서 요청에 해당하는 픽스처가 없음"""
+
+
+def _parse_latency(value: Optional[str]) -> Dict[str, float]:
+    """
+    지연 시간 설정 파싱
+
+    '0.2' → 모든 종류 0.2초, 'yfinance=0.3,http=0.1,llm=2' → 종류별 지연
+    """
+    if not value:
+        return {}
+    if '=' not in value:
+        return {'*': float(value)}
+
+    latency = {}
+    for part in value.split(','):
+        kind, seconds = part.split('=', 1)
+        latency[kind.strip()] = float(seconds)
+    return latency
+
+
+class ProviderRecorder:
+    """
+    호출 기록/재생기
+
+    픽스처 경로: {fixture_dir}/{종류}/{키 해시 앞 2자리}/{키 해시}.pkl.gz
+    키는 호출 종류와 인자(JSON 직렬화)로 만들며, API 키 등 비밀 값은 호출하는 쪽에서 제외합니다.
+    """
+
+    def __init__(
+        self,
+        mode: str = None,
+        fixture_dir: str = None,
+        latency: Dict[str, float] = None,
+        backend: Callable[[str, Dict[str, Any]], Any] = None
+    ):
+        """
+        Args:
+            mode: 'live' | 'record' | 'replay' (기본: 환경변수 PROVIDER_MODE 또는 live)
+            fixture_dir: 픽스처 디렉토리 (기본: 환경변수 PROVIDER_FIXTURE_DIR 또는 fixtures/)
+            latency: replay 시 종류별 주입 지연 (초, '*'는 기본값)
+                     (기본: 환경변수 PROVIDER_REPLAY_LATENCY)
+            backend: 실제 호출 대신 응답을 만드는 함수 backend(kind, key)
+                     (합성 픽스처 생성용, live/record 모드에서만 사용)
+        """
+        self.mode = mode or os.getenv('PROVIDER_MODE', 'live')
+        if self.mode not in PROVIDER_MODES:
+            raise ValueError(f"Unknown provider mode: {self.mode} (choose from {', '.join(PROVIDER_MODES)})")
+
+        self.fixture_dir = fixture_dir or os.getenv('PROVIDER_FIXTURE_DIR') or DEFAULT_FIXTURE_DIR
+        self.latency = latency if latency is not None else _parse_latency(os.getenv('PROVIDER_REPLAY_LATENCY'))
+        self.backend = backend
+
+    @property
+    def is_replay(self) -> bool:
+        return self.mode == 'replay'
+
+    @property
+    def is_offline(self) -> bool:
+        """실제 외부 서비스를 호출하지 않는지 여부 (replay 또는 합성 backend)"""
+        return self.mode == 'replay' or self.backend is not None
+
+    @staticmethod
+    def make_key(kind: str, key: Dict[str, Any]) -> str:
+        """호출 종류 + 인자의 해시"""
+        payload = json.dumps({"kind": kind, "key": key}, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, kind: str, digest: str) -> str:
+        return os.path.join(self.fixture_dir, kind, digest[:2], f"{digest}.pkl.gz")
+
+    def _save(self, path: str, kind: str, key: Dict[str, Any], value: Any):
+        """픽스처 원자적 저장"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wb') as f:
+            pickle.dump({"kind": kind, "key": key, "recorded_at": time.time(), "value": value}, f)
+        os.replace(tmp_path, path)
+
+    def _load(self, path: str) -> Any:
+        with gzip.open(path, 'rb') as f:
+            return pickle.load(f)["value"]
+
+    def call(self, kind: str, key: Dict[str, Any], func: Callable[[], Any]) -> Any:
+        """
+        외부 호출 실행 (모드에 따라 기록/재생)
+
+        Args:
+            kind: 호출 종류 ('yfinance', 'http', 'llm' 등, 픽스처 하위 디렉토리명)
+            key: 호출을 식별하는 인자 (JSON 직렬화 가능)
+            func: 실제 호출 함수 (replay 모드에서는 호출하지 않음)
+
+        Returns:
+            호출 결과
+        """
+        if self.backend is not None and self.mode != 'replay':
+            func = lambda: self.backend(kind, key)
+
+        if self.mode == 'live':
+            return func()
+
+        path = self._path(kind, self.make_key(kind, key))
+
+        if self.mode == 'replay':
+            if not os.path.exists(path):
+                raise FixtureMissingError(f"No {kind} fixture for {json.dumps(key, ensure_ascii=False, default=str)[:200]}")
+
+            delay = self.latency.get(kind, self.latency.get('*', 0.0))
+            if delay > 0:
+                time.sleep(delay)
+            return self._load(path)
+
+        # record: 성공한 호출만 저장
+        value = func()
+        self._save(path, kind, key, value)
+        return value
+
+
+_default_recorder = None
+_default_recorder_lock = threading.Lock()
+
+
+def get_provider_recorder() -> ProviderRecorder:
+    """프로세스 공용 ProviderRecorder 반환"""
+    global _default_recorder
+    with _default_recorder_lock:
+        if _default_recorder is None:
+            _default_recorder = ProviderRecorder()
+        return _default_recorder
+
+
+def configure_providers(
+    mode: str = None,
+    fixture_dir: str = None,
+    latency: Any = None,
+    backend: Callable[[str, Dict[str, Any]], Any] = None
+) -> ProviderRecorder:
+    """
+    공용 기록/재생기 재설정
+
+    Args:
+        mode: 'live' | 'record' | 'replay'
+        fixture_dir: 픽스처 디렉토리
+        latency: replay 주입 지연 (초 단위 숫자, 종류별 딕셔너리 또는 'http=0.1,llm=2' 형식 문자열)
+        backend: 실제 호출 대신 응답을 만드는 함수 (합성 픽스처 생성용)
+
+    Returns:
+        새 ProviderRecorder
+    """
+    global _default_recorder
+    if isinstance(latency, (int, float)):
+        latency = {'*': float(latency)}
+    elif isinstance(latency, str):
+        latency = _parse_latency(latency)
+
+    with _default_recorder_lock:
+        _default_recorder = ProviderRecorder(mode, fixture_dir, latency, backend)
+        return _default_recorder
+
+
+# ----------------------------------------------------------------------
+# yfinance 공급자
+# ----------------------------------------------------------------------
+
+def yf_download(**kwargs: Any) -> pd.DataFrame:
+    """yf.download 기록/재생"""
+    tickers = kwargs.get('tickers')
+    with span("yfinance.download", tickers=len(tickers) if isinstance(tickers, (list, tuple)) else 1) as s:
+        data = get_provider_recorder().call('yfinance', {"op": "download", **kwargs}, lambda: yf.download(**kwargs))
+        s.set_attribute("rows", len(data))
+        return data
+
+
+def yf_history(ticker: str, **kwargs: Any) -> pd.DataFrame:
+    """yf.Ticker(ticker).history 기록/재생"""
+    with span("yfinance.history", ticker=ticker) as s:
+        data = get_provider_recorder().call(
+            'yfinance',
+            {"op": "history", "ticker": ticker, **kwargs},
+            lambda: yf.Ticker(ticker).history(**kwargs)
+        )
+        s.set_attribute("rows", len(data))
+        return data
+
+
+def yf_info(ticker: str) -> Dict[str, Any]:
+    """yf.Ticker(ticker).info 기록/재생"""
+    with span("yfinance.info", ticker=ticker):
+        return get_provider_recorder().call(
+            'yfinance',
+            {"op": "info", "ticker": ticker},
+            lambda: yf.Ticker(ticker).info or {}
+        )
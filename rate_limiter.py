@@ -0,0 +1,73 @@
+"""
+Global Macro Intelligence Hub - Rate Limiter
+여러 스레드가 공유하는 호출 속도 제한 모듈
+"""
+
+import threading
+import time
+from typing import Dict
+
+
+# 소스별 초당 호출 제한 (프로세스 전체가 공유)
+SOURCE_RATE_LIMITS = {
+    "price": 1.0,   # yfinance
+    "news": 0.5,    # Google News RSS
+    "dart": 2.0,    # OpenDART
+}
+
+
+class RateLimiter:
+    """
+    초당 호출 횟수 제한기 (스레드 안전)
+
+    호출마다 다음 허용 시각을 예약하므로, 작업자 수와 관계없이
+    전체 호출 속도가 calls_per_second를 넘지 않습니다.
+    """
+
+    def __init__(self, calls_per_second: float = 2.0):
+        """
+        Args:
+            calls_per_second: 초당 허용 호출 수 (0 이하면 제한 없음)
+        """
+        self.interval = 1.0 / calls_per_second if calls_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self):
+        """다음 호출 슬롯까지 대기"""
+        if self.interval <= 0:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        # 대기는 락 밖에서 수행 (다른 스레드의 예약을 막지 않음)
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_source_limiters: Dict[str, RateLimiter] = {}
+_source_limiters_lock = threading.Lock()
+
+
+def get_source_limiter(source: str) -> RateLimiter:
+    """
+    소스별 공용 RateLimiter 반환 (같은 소스를 쓰는 모든 호출 측이 한도를 공유)
+
+    Args:
+        source: SOURCE_RATE_LIMITS의 키 (예: 'dart')
+    """
+    with _source_limiters_lock:
+        if source not in _source_limiters:
+            _source_limiters[source] = RateLimiter(SOURCE_RATE_LIMITS[source])
+        return _source_limiters[source]
@@ -16,6 +16,8 @@ import plotly.graph_objects as go
 from dotenv import load_dotenv
 import re
 
+from tracing import span
+
 # .env 로드
 load_dotenv()
 
@@ -129,7 +131,7 @@ class ProfessionalPDFReport(FPDF):
 
             self.set_font('Arial', '', 10)
             self.set_text_color(0, 0, 0)
-            self.multi_cell(0, 7, str(value))
+            self.multi_cell(0, 7, str(value), new_x="LMARGIN", new_y="NEXT")
 
         # 박스 그리기
         y_end = self.get_y()
@@ -147,7 +149,7 @@ class ProfessionalPDFReport(FPDF):
             self.set_font('Arial', style, size)
 
         self.set_text_color(0, 0, 0)
-        self.multi_cell(0, 6, text)
+        self.multi_cell(0, 6, text, new_x="LMARGIN", new_y="NEXT")
 
     def add_warning_box(self, title: str, content: str):
         """경고 박스"""
@@ -192,7 +194,9 @@ class ExpertReportManager:
         """차트를 이미지로 저장"""
         try:
             image_path = os.path.join(self.temp_dir, filename)
-            fig.write_image(image_path, width=1000, height=500, scale=2)
+            with span("chart.image") as s:
+                fig.write_image(image_path, width=1000, height=500, scale=2)
+                s.set_attribute("bytes", os.path.getsize(image_path))
             return image_path
         except Exception as e:
             print(f"[WARN] Chart image save failed: {e}")
@@ -420,7 +424,7 @@ class ExpertReportManager:
                             pdf.ln(3)
                             pdf.set_font('Arial', 'B', 11)
                             pdf.set_text_color(52, 73, 94)
-                            pdf.multi_cell(0, 6, title)
+                            pdf.multi_cell(0, 6, title, new_x="LMARGIN", new_y="NEXT")
                             pdf.ln(2)
                         else:
                             # 본문
@@ -461,7 +465,9 @@ class ExpertReportManager:
         filename = f"EXPERT_REPORT_{company_name}_{timestamp}.pdf"
         filepath = os.path.join(self.reports_dir, filename)
 
-        pdf.output(filepath)
+        with span("file.write", kind="pdf") as write_span:
+            pdf.output(filepath)
+            write_span.set_attribute("bytes", os.path.getsize(filepath))
 
         # 임시 파일 정리
         if chart_fig:
@@ -636,11 +642,13 @@ class ExpertReportManager:
             # 앱 비밀번호에서 공백 제거
             app_password_clean = app_password.replace(' ', '')
 
-            server = smtplib.SMTP('smtp.gmail.com', 587)
-            server.starttls()
-            server.login(sender_email, app_password_clean)
-            server.sendmail(sender_email, recipient_email, msg.as_string())
-            server.quit()
+            message = msg.as_string()
+            with span("email.smtp", bytes=len(message)):
+                server = smtplib.SMTP('smtp.gmail.com', 587)
+                server.starttls()
+                server.login(sender_email, app_password_clean)
+                server.sendmail(sender_email, recipient_email, message)
+                server.quit()
 
             if status_callback:
                 status_callback("[OK] 이메일 전송 완료!")
@@ -704,14 +712,15 @@ class ExpertReportManager:
         """
         try:
             # 1. PDF 생성
-            pdf_path = self.create_expert_pdf(
-                ticker=ticker,
-                company_name=company_name,
-                analysis_text=analysis_text,
-                stock_data=stock_data,
-                chart_fig=chart_fig,
-                status_callback=status_callback
-            )
+            with span("report.pdf", ticker=ticker):
+                pdf_path = self.create_expert_pdf(
+                    ticker=ticker,
+                    company_name=company_name,
+                    analysis_text=analysis_text,
+                    stock_data=stock_data,
+                    chart_fig=chart_fig,
+                    status_callback=status_callback
+                )
 
             if not pdf_path or not os.path.exists(pdf_path):
                 return False
@@ -720,14 +729,16 @@ class ExpertReportManager:
             risk_score = self.calculate_risk_score(analysis_text)
 
             # 3. 이메일 전송
-            success = self.send_intelligent_email(
-                pdf_path=pdf_path,
-                company_name=company_name,
-                ticker=ticker,
-                analysis_text=analysis_text,
-                risk_score=risk_score,
-                status_callback=status_callback
-            )
+            with span("report.email", ticker=ticker) as email_span:
+                success = self.send_intelligent_email(
+                    pdf_path=pdf_path,
+                    company_name=company_name,
+                    ticker=ticker,
+                    analysis_text=analysis_text,
+                    risk_score=risk_score,
+                    status_callback=status_callback
+                )
+                email_span.set_attribute("sent", success)
 
             return success
 
@@ -0,0 +1,227 @@
+"""
+Global Macro Intelligence Hub - Run Manifest
+배치 실행의 종목별 단계 상태와 산출물 경로를 기록하는 체크포인트 모듈
+
+runs/{run_id}/manifest.json 에 단계가 끝날 때마다 원자적으로 저장하므로,
+중간에 중단된 배치도 완료된 단계는 건너뛰고 이어서 실행할 수 있습니다.
+"""
+
+import threading
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+
+DEFAULT_RUNS_DIR = os.path.join(os.path.dirname(__file__), 'runs')
+MANIFEST_FILENAME = 'manifest.json'
+BATCH_STAGES = ('collect', 'analyze', 'report')
+
+
+class RunManifest:
+    """
+    배치 실행 매니페스트 (스레드 안전)
+
+    종목별 단계 상태: pending → running → done | failed
+    done 상태라도 기록된 산출물 파일이 없어졌으면 다시 실행 대상이 됩니다.
+    """
+
+    def __init__(self, path: str, data: Dict[str, Any]):
+        """
+        Args:
+            path: manifest.json 경로
+            data: 매니페스트 내용 (create/load 사용 권장)
+        """
+        self.path = path
+        self.run_dir = os.path.dirname(path)
+        self.data = data
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(
+        cls,
+        tickers: List[str],
+        options: Dict[str, Any] = None,
+        run_id: str = None,
+        runs_dir: str = None
+    ) -> 'RunManifest':
+        """
+        새 배치 실행 매니페스트 생성
+
+        Args:
+            tickers: 대상 종목
+            options: 실행 옵션 (기록용)
+            run_id: 실행 ID (기본: 현재 시각 YYYYmmdd_HHMMSS)
+            runs_dir: 실행 기록 디렉토리 (기본: runs/)
+
+        Returns:
+            RunManifest
+        """
+        run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        run_dir = os.path.join(runs_dir or DEFAULT_RUNS_DIR, run_id)
+        path = os.path.join(run_dir, MANIFEST_FILENAME)
+
+        if os.path.exists(path):
+            raise FileExistsError(f"Run already exists: {run_id} (use --resume {run_id})")
+
+        now = datetime.now().isoformat()
+        data = {
+            "run_id": run_id,
+            "created_at": now,
+            "updated_at": now,
+            "stages": list(BATCH_STAGES),
+            "options": options or {},
+            "tickers": list(tickers),
+            "items": {
+                ticker: {"stages": {stage: {"status": "pending"} for stage in BATCH_STAGES}}
+                for ticker in tickers
+            },
+        }
+
+        manifest = cls(path, data)
+        os.makedirs(run_dir, exist_ok=True)
+        manifest.save()
+        return manifest
+
+    @classmethod
+    def load(cls, run: str = None, runs_dir: str = None) -> 'RunManifest':
+        """
+        기존 매니페스트 로드
+
+        Args:
+            run: 실행 ID, 실행 디렉토리 또는 manifest.json 경로 (None이면 가장 최근 실행)
+            runs_dir: 실행 기록 디렉토리 (기본: runs/)
+
+        Returns:
+            RunManifest
+        """
+        runs_dir = runs_dir or DEFAULT_RUNS_DIR
+
+        if run is None:
+            candidates = [
+                os.path.join(runs_dir, name, MANIFEST_FILENAME)
+                for name in (os.listdir(runs_dir) if os.path.isdir(runs_dir) else [])
+            ]
+            candidates = [path for path in candidates if os.path.exists(path)]
+            if not candidates:
+                raise FileNotFoundError(f"No batch runs found in {runs_dir}")
+            path = max(candidates, key=os.path.getmtime)
+        elif os.path.isfile(run):
+            path = run
+        elif os.path.isdir(run):
+            path = os.path.join(run, MANIFEST_FILENAME)
+        else:
+            path = os.path.join(runs_dir, run, MANIFEST_FILENAME)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        manifest = cls(path, data)
+        manifest._reset_interrupted()
+        return manifest
+
+    def _reset_interrupted(self):
+        """이전 실행이 중단되며 running으로 남은 단계를 pending으로 되돌림"""
+        for item in self.data["items"].values():
+            for stage in item["stages"].values():
+                if stage["status"] == "running":
+                    stage["status"] = "pending"
+
+    @property
+    def run_id(self) -> str:
+        return self.data["run_id"]
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self.data["tickers"])
+
+    def save(self):
+        """원자적 저장 (임시 파일 → os.replace)"""
+        self.data["updated_at"] = datetime.now().isoformat()
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        """실행 단위 부가 정보 조회 (예: 제출한 LLM 배치 ID)"""
+        with self._lock:
+            return self.data.get("meta", {}).get(key, default)
+
+    def set_meta(self, key: str, value: Any):
+        """실행 단위 부가 정보 기록 (즉시 저장)"""
+        with self._lock:
+            self.data.setdefault("meta", {})[key] = value
+            self.save()
+
+    def artifact_path(self, filename: str) -> str:
+        """실행 디렉토리 안 산출물 경로"""
+        return os.path.join(self.run_dir, filename)
+
+    def _update(self, ticker: str, stage: str, **fields: Any):
+        with self._lock:
+            item = self.data["items"].setdefault(
+                ticker, {"stages": {name: {"status": "pending"} for name in BATCH_STAGES}}
+            )
+            item["stages"][stage] = fields
+            self.save()
+
+    def start(self, ticker: str, stage: str):
+        """단계 시작 기록"""
+        self._update(ticker, stage, status="running", started_at=datetime.now().isoformat())
+
+    def complete(self, ticker: str, stage: str, seconds: float = None, **artifacts: Optional[str]):
+        """
+        단계 완료 기록
+
+        Args:
+            ticker: 종목 티커
+            stage: 단계 이름
+            seconds: 소요 시간
+            **artifacts: 산출물 경로 (예: data_file=..., report_path=...)
+        """
+        self._update(
+            ticker, stage,
+            status="done",
+            finished_at=datetime.now().isoformat(),
+            seconds=round(seconds, 3) if seconds is not None else None,
+            artifacts={name: path for name, path in artifacts.items() if path}
+        )
+
+    def fail(self, ticker: str, stage: str, error: str):
+        """단계 실패 기록"""
+        self._update(ticker, stage, status="failed", finished_at=datetime.now().isoformat(), error=error)
+
+    def completed(self, ticker: str, stage: str) -> Optional[Dict[str, str]]:
+        """
+        완료된 단계의 산출물 (재사용 가능한 경우만)
+
+        Returns:
+            산출물 경로 딕셔너리 (미완료이거나 산출물 파일이 없으면 None)
+        """
+        with self._lock:
+            entry = self.data["items"].get(ticker, {}).get("stages", {}).get(stage, {})
+            if entry.get("status") != "done":
+                return None
+            artifacts = dict(entry.get("artifacts", {}))
+
+        if all(os.path.exists(path) for path in artifacts.values()):
+            return artifacts
+        return None
+
+    def is_complete(self, ticker: str) -> bool:
+        """모든 단계가 완료되었는지 여부"""
+        return all(self.completed(ticker, stage) is not None for stage in self.data["stages"])
+
+    def counts(self) -> Dict[str, int]:
+        """종목 단위 상태 집계 {"complete", "failed", "pending"}"""
+        counts = {"complete": 0, "failed": 0, "pending": 0}
+        for ticker in self.data["tickers"]:
+            stages = self.data["items"].get(ticker, {}).get("stages", {}).values()
+            if self.is_complete(ticker):
+                counts["complete"] += 1
+            elif any(stage.get("status") == "failed" for stage in stages):
+                counts["failed"] += 1
+            else:
+                counts["pending"] += 1
+        return counts
@@ -3,14 +3,20 @@ Global Macro Intelligence Hub - Stock Screener
 순수 파이썬 수치 계산 기반 종목 스크리닝 (LLM 호출 없음)
 """
 
-import yfinance as yf
 import pandas as pd
 import json
 import os
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import time
 
+from price_store import get_price_store
+from price_cube import get_price_cube
+from indicator_state import get_indicator_state_store
+from dart_client import get_disclosure_index, attach_indexed_disclosures
+from data_collector import get_api_key
+from indicators import build_field_matrix, compute_screening_indicators
+
 
 class StockScreener:
     """
@@ -21,6 +27,12 @@ class StockScreener:
 
     def __init__(self):
         """초기화"""
+        # 로컬 일봉 저장소 (증분 갱신)
+        self.price_store = get_price_store()
+
+        # 종목별 지표 상태 (Wilder RSI)
+        self.indicator_states = get_indicator_state_store()
+
         # 주요 한국 종목 리스트 (KOSPI 100 + KOSDAQ 100 = 200개)
         self.watch_stocks = {
             # KOSPI 100개
@@ -119,23 +131,120 @@ class StockScreener:
             print(f"   [WARN] RSI calculation failed: {str(e)}")
             return 50.0  # 중립값
 
-    def analyze_stock(self, ticker: str, days: int = 20) -> Dict[str, Any]:
+    def check_conditions(self, volume_ratio: float, rsi: float) -> Tuple[bool, List[str]]:
+        """
+        주목 조건 체크
+
+        Args:
+            volume_ratio: 평균 대비 거래량 배수
+            rsi: RSI 값
+
+        Returns:
+            (주목 여부, 사유 리스트)
+        """
+        noteworthy = False
+        reasons = []
+
+        # 조건 1: 거래량이 평균 대비 2배 이상
+        if volume_ratio >= 2.0:
+            noteworthy = True
+            reasons.append(f"거래량 {volume_ratio:.1f}배 급증")
+
+        # 조건 2: RSI 30 이하 (과매도)
+        if rsi <= 30:
+            noteworthy = True
+            reasons.append(f"과매도 (RSI {rsi:.1f})")
+
+        # 조건 3: RSI 70 이상 (과매수)
+        if rsi >= 70:
+            noteworthy = True
+            reasons.append(f"과매수 (RSI {rsi:.1f})")
+
+        return noteworthy, reasons
+
+    def analyze_universe(self, histories: Dict[str, pd.DataFrame], days: int = 20) -> Dict[str, Dict[str, Any]]:
+        """
+        전 종목 일괄 분석 (벡터화 지표 엔진 사용)
+
+        Args:
+            histories: {티커: OHLCV DataFrame}
+            days: 평균 거래량 계산 기간
+
+        Returns:
+            {티커: analyze_stock과 동일한 형식의 분석 결과}
+        """
+        close = build_field_matrix(histories, 'Close')
+        volume = build_field_matrix(histories, 'Volume')
+
+        return self.analyze_matrices(close, volume, days=days)
+
+    def analyze_matrices(self, close: pd.DataFrame, volume: pd.DataFrame, days: int = 20) -> Dict[str, Dict[str, Any]]:
+        """
+        (날짜 × 종목) 종가/거래량 행렬로 전 종목 일괄 분석
+
+        Args:
+            close: 종가 행렬
+            volume: 거래량 행렬
+            days: 평균 거래량 계산 기간
+
+        Returns:
+            {티커: analyze_stock과 동일한 형식의 분석 결과}
+        """
+        if close.empty:
+            return {}
+
+        volume = volume.reindex(index=close.index, columns=close.columns)
+
+        table = compute_screening_indicators(
+            close.to_numpy(),
+            volume.to_numpy(),
+            list(close.columns),
+            rsi_period=14,
+            volume_window=days
+        )
+
+        # RSI: 전 종목 Wilder 상태를 새 봉만큼 일괄 갱신 (상태 로드/저장 각 1회)
+        states = self.indicator_states.update_many_from_store(list(table.index), self.price_store, close)
+
+        results = {}
+        for row in table.itertuples():
+            # 시드 구간(이력 부족)인 종목만 행렬 계산값 사용
+            state = states[row.Index]
+            rsi = state['rsi'] if state['rsi'] is not None else row.rsi
+
+            noteworthy, reasons = self.check_conditions(row.volume_ratio, rsi)
+            results[row.Index] = {
+                "ticker": row.Index,
+                "current_price": float(row.current_price),
+                "previous_close": float(row.previous_close),
+                "price_change_pct": float(row.price_change_pct),
+                "current_volume": int(row.current_volume),
+                "avg_volume_20d": float(row.avg_volume_20d),
+                "volume_change_pct": float(row.volume_change_pct),
+                "volume_ratio": float(row.volume_ratio),
+                "rsi": float(rsi),
+                "noteworthy": noteworthy,
+                "reasons": reasons
+            }
+
+        return results
+
+    def analyze_stock(self, ticker: str, days: int = 20, hist: pd.DataFrame = None) -> Dict[str, Any]:
         """
         개별 종목 분석 (순수 수치 계산)
 
         Args:
             ticker: 종목 티커
             days: 분석 기간
+            hist: 미리 수집된 일봉 데이터 (None이면 직접 조회)
 
         Returns:
             분석 결과 딕셔너리
         """
         try:
-            # 데이터 가져오기 (오늘 종가 포함)
-            stock = yf.Ticker(ticker)
-
-            # period 파라미터로 최신 데이터 가져오기
-            hist = stock.history(period="2mo", interval="1d")
+            if hist is None:
+                # 로컬 저장소 경유로 최근 2개월 데이터 가져오기 (오늘 종가 포함)
+                hist = self.price_store.get_history(ticker, period_days=62)
 
             if len(hist) < 2:
                 return None
@@ -161,27 +270,12 @@ class StockScreener:
             # 거래량이 평균 대비 몇 배인지
             volume_ratio = current_volume / avg_volume_20d if avg_volume_20d > 0 else 1.0
 
-            # 3. RSI 계산
-            rsi = self.calculate_rsi(hist['Close'], period=14)
+            # 3. RSI 계산 (Wilder 상태 우선, 상태가 없으면 창 전체 계산)
+            state = self.indicator_states.update_from_store(ticker, self.price_store, hist)
+            rsi = state['rsi'] if state['rsi'] is not None else self.calculate_rsi(hist['Close'], period=14)
 
             # 4. 주목 조건 체크
-            noteworthy = False
-            reasons = []
-
-            # 조건 1: 거래량이 평균 대비 2배 이상
-            if volume_ratio >= 2.0:
-                noteworthy = True
-                reasons.append(f"거래량 {volume_ratio:.1f}배 급증")
-
-            # 조건 2: RSI 30 이하 (과매도)
-            if rsi <= 30:
-                noteworthy = True
-                reasons.append(f"과매도 (RSI {rsi:.1f})")
-
-            # 조건 3: RSI 70 이상 (과매수)
-            if rsi >= 70:
-                noteworthy = True
-                reasons.append(f"과매수 (RSI {rsi:.1f})")
+            noteworthy, reasons = self.check_conditions(volume_ratio, rsi)
 
             return {
                 "ticker": ticker,
@@ -201,10 +295,24 @@ class StockScreener:
             print(f"   [WARN] Analysis failed: {str(e)}")
             return None
 
-    def screen_stocks(self) -> List[Dict[str, Any]]:
+    def screen_stocks(
+        self,
+        batch: bool = True,
+        chunk_size: int = 50,
+        use_cube: bool = True,
+        include_disclosures: bool = False,
+        disclosure_days: int = 7
+    ) -> List[Dict[str, Any]]:
         """
         전체 종목 스크리닝
 
+        Args:
+            batch: True면 전체 종목 주가를 묶음 요청으로 한 번에 수집 후 메모리에서 분석
+            chunk_size: 묶음 요청당 종목 수
+            use_cube: True면 공유 가격 큐브(메모리 매핑)에서 행렬을 읽어 분석
+            include_disclosures: True면 시장 전체 DART 색인에서 종목별 주요 공시 추가
+            disclosure_days: 공시 조회 기간 (일)
+
         Returns:
             주목할 종목 리스트
         """
@@ -219,10 +327,38 @@ class StockScreener:
 
         noteworthy_stocks = []
 
+        # 묶음 수집: 요청 횟수가 종목 수가 아닌 묶음 수에 비례
+        # 지표는 (날짜 × 종목) 행렬에서 한 번에 계산
+        universe_results = None
+        if batch:
+            tickers = list(self.watch_stocks.keys())
+
+            if use_cube:
+                # 저장소 증분 갱신 → 큐브 반영 → 큐브에서 행렬 직접 조회
+                self.price_store.refresh_many(tickers, chunk_size=chunk_size)
+                cube = get_price_cube()
+                cube.sync_from_store(self.price_store, tickers)
+
+                universe_results = self.analyze_matrices(
+                    cube.field_matrix('Close', tickers, period_days=62),
+                    cube.field_matrix('Volume', tickers, period_days=62)
+                )
+            else:
+                histories = self.price_store.get_histories(
+                    tickers,
+                    period_days=62,
+                    chunk_size=chunk_size
+                )
+                universe_results = self.analyze_universe(histories)
+            print()
+
         for ticker, name in self.watch_stocks.items():
             print(f"분석 중: {name} ({ticker})...", end=" ")
 
-            result = self.analyze_stock(ticker)
+            if universe_results is not None:
+                result = universe_results.get(ticker)
+            else:
+                result = self.analyze_stock(ticker)
 
             if result and result['noteworthy']:
                 result['company_name'] = name
@@ -233,8 +369,17 @@ class StockScreener:
             else:
                 print("[ERROR] 실패")
 
-            # API 제한 고려
-            time.sleep(0.5)
+            # API 제한 고려 (개별 조회 시에만)
+            if universe_results is None:
+                time.sleep(0.5)
+
+        # 주요 공시: 시장 전체 동기화 1회 후 종목별 로컬 조회 (종목별 DART 호출 없음)
+        if include_disclosures and noteworthy_stocks:
+            index = get_disclosure_index(get_api_key('DART_API_KEY'))
+            if index:
+                attach_indexed_disclosures(noteworthy_stocks, index, disclosure_days)
+            else:
+                print("[WARN] DART API key not configured, skipping disclosures")
 
         print(f"\n{'='*70}")
         print(f"[OK] 스크리닝 완료: {len(noteworthy_stocks)}개 종목 발견")
@@ -0,0 +1,291 @@
+"""
+Global Macro Intelligence Hub - Snapshot Format
+수집 데이터/분석 결과 스냅샷을 압축 형식으로 읽고 쓰는 모듈
+
+지원 형식 (파일 확장자로 구분):
+- .json        : 들여쓰기 JSON (기본값, 기존 형식)
+- .msgpack.zst : zstd 압축 msgpack (zstandard, msgpack 필요)
+- .json.gz     : gzip 압축 JSON (표준 라이브러리만 사용)
+
+압축 형식은 환경변수 SNAPSHOT_FORMAT 또는 main.py --snapshot-format으로 지정할 때만
+사용합니다 ('auto'는 사용 가능한 가장 작은 형식).
+
+일별 아카이브(archive/{prefix}_{YYYYmmdd}.{형식})에 묶인 스냅샷은
+'아카이브 경로#원래 파일명' 형태의 경로로 다른 파일과 똑같이 읽을 수 있습니다.
+
+사용 예:
+    python snapshot_format.py compact --days 7
+"""
+
+import argparse
+import threading
+import gzip
+import json
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import msgpack
+    import zstandard
+except ImportError:
+    msgpack = None
+    zstandard = None
+
+
+FORMAT_EXTENSIONS = {
+    "msgpack.zst": ".msgpack.zst",
+    "json.gz": ".json.gz",
+    "json": ".json",
+}
+ARCHIVE_DIRNAME = 'archive'
+ARCHIVE_MEMBER_SEP = '#'
+
+# {prefix}_..._{YYYYmmdd}_{HHMMSS}[_N].{형식}
+_TIMESTAMP_PATTERN = re.compile(r'_(\d{8})_\d{6}(?:_\d+)?$')
+
+# 같은 아카이브의 멤버를 연달아 읽을 때 압축 해제를 반복하지 않도록 최근 아카이브만 보관
+_archive_cache: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+_archive_cache_lock = threading.Lock()
+_ARCHIVE_CACHE_SIZE = 4
+
+
+def available_formats() -> List[str]:
+    """현재 환경에서 쓸 수 있는 형식 (선호 순)"""
+    formats = ["json.gz", "json"]
+    if msgpack is not None and zstandard is not None:
+        formats.insert(0, "msgpack.zst")
+    return formats
+
+
+def resolve_format(fmt: str = None) -> str:
+    """
+    저장 형식 결정
+
+    Args:
+        fmt: 형식 이름 (None이면 환경변수 SNAPSHOT_FORMAT, 없으면 json /
+             'auto'면 사용 가능한 가장 작은 형식)
+
+    Returns:
+        FORMAT_EXTENSIONS의 키
+    """
+    fmt = fmt or os.getenv('SNAPSHOT_FORMAT') or 'json'
+    if fmt == 'auto':
+        return available_formats()[0]
+    if fmt not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Unknown snapshot format: {fmt} (choose from {', '.join(FORMAT_EXTENSIONS)})")
+    if fmt not in available_formats():
+        raise ValueError(f"Snapshot format {fmt} requires: pip install zstandard msgpack")
+    return fmt
+
+
+def split_extension(path: str) -> Tuple[str, str]:
+    """
+    경로를 (확장자 제외 부분, 스냅샷 확장자)로 분리 (.msgpack.zst 같은 이중 확장자 처리)
+
+    Returns:
+        (base, ext) - 스냅샷 형식이 아니면 os.path.splitext 결과
+    """
+    for ext in sorted(FORMAT_EXTENSIONS.values(), key=len, reverse=True):
+        if path.endswith(ext):
+            return path[:-len(ext)], ext
+    return os.path.splitext(path)
+
+
+def format_of(path: str) -> Optional[str]:
+    """파일 경로의 스냅샷 형식 (스냅샷 파일이 아니면 None)"""
+    _, ext = split_extension(storage_path(path))
+    for fmt, fmt_ext in FORMAT_EXTENSIONS.items():
+        if ext == fmt_ext:
+            return fmt
+    return None
+
+
+def is_snapshot_file(path: str) -> bool:
+    """스냅샷 형식 파일 여부"""
+    return format_of(path) is not None
+
+
+def encode(obj: Any, fmt: str) -> bytes:
+    """객체를 형식에 맞는 바이트로 변환"""
+    if fmt == "msgpack.zst":
+        return zstandard.ZstdCompressor(level=10).compress(msgpack.packb(obj, use_bin_type=True))
+    if fmt == "json.gz":
+        payload = json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return gzip.compress(payload, compresslevel=6, mtime=0)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def decode(payload: bytes, fmt: str) -> Any:
+    """형식에 맞는 바이트를 객체로 변환"""
+    if fmt == "msgpack.zst":
+        if msgpack is None:
+            raise ImportError("Reading .msgpack.zst snapshots requires: pip install zstandard msgpack")
+        return msgpack.unpackb(zstandard.ZstdDecompressor().decompress(payload), raw=False)
+    if fmt == "json.gz":
+        return json.loads(gzip.decompress(payload).decode('utf-8'))
+    return json.loads(payload.decode('utf-8'))
+
+
+def dump(obj: Any, path: str) -> int:
+    """
+    스냅샷 원자적 저장 (임시 파일 → os.replace, 형식은 확장자로 결정)
+
+    Args:
+        obj: 저장할 객체 (JSON 호환)
+        path: 저장 경로
+
+    Returns:
+        저장한 바이트 수
+    """
+    fmt = format_of(path)
+    if fmt is None:
+        raise ValueError(f"Unknown snapshot extension: {path}")
+
+    payload = encode(obj, fmt)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return len(payload)
+
+
+def load(path: str) -> Any:
+    """
+    스냅샷 로드 (형식은 확장자로 판별, '아카이브#멤버' 경로 지원)
+
+    Args:
+        path: 스냅샷 파일 경로
+
+    Returns:
+        저장된 객체
+    """
+    if ARCHIVE_MEMBER_SEP in path:
+        archive_path, member = path.split(ARCHIVE_MEMBER_SEP, 1)
+        return _load_archive(archive_path)["members"][member]
+
+    with open(path, 'rb') as f:
+        payload = f.read()
+    return decode(payload, format_of(path) or "json")
+
+
+def storage_path(path: str) -> str:
+    """스냅샷이 실제로 저장된 파일 경로 ('아카이브#멤버' 경로는 아카이브 파일)"""
+    return path.split(ARCHIVE_MEMBER_SEP, 1)[0]
+
+
+def exists(path: str) -> bool:
+    """스냅샷 존재 여부 ('아카이브#멤버' 경로는 아카이브 파일 존재 여부)"""
+    return os.path.exists(storage_path(path))
+
+
+def _load_archive(archive_path: str) -> Dict[str, Any]:
+    stat = os.stat(archive_path)
+    key = (archive_path, stat.st_mtime_ns, stat.st_size)
+    with _archive_cache_lock:
+        if key in _archive_cache:
+            _archive_cache.move_to_end(key)
+            return _archive_cache[key]
+
+    with open(archive_path, 'rb') as f:
+        archive = decode(f.read(), format_of(archive_path))
+
+    with _archive_cache_lock:
+        _archive_cache[key] = archive
+        while len(_archive_cache) > _ARCHIVE_CACHE_SIZE:
+            _archive_cache.popitem(last=False)
+    return archive
+
+
+def snapshot_day(path: str) -> Optional[str]:
+    """파일명의 수집 날짜 (YYYYmmdd, 형식이 다르면 None)"""
+    base, _ = split_extension(os.path.basename(path))
+    match = _TIMESTAMP_PATTERN.search(base)
+    return match.group(1) if match else None
+
+
+def compact_directory(
+    directory: str,
+    prefix: str,
+    older_than_days: int = 7,
+    fmt: str = None
+) -> Dict[str, str]:
+    """
+    오래된 개별 스냅샷 파일을 일별 아카이브로 묶고 원본 삭제
+
+    Args:
+        directory: 스냅샷 디렉토리 (예: data/, analysis/)
+        prefix: 대상 파일명 접두사 (예: 'data', 'analysis')
+        older_than_days: 이 일수보다 오래된 날짜의 파일만 묶음 (오늘 파일은 항상 제외)
+        fmt: 아카이브 형식 (기본: resolve_format())
+
+    Returns:
+        {원래 경로: '아카이브 경로#원래 파일명'}
+    """
+    fmt = resolve_format(fmt)
+    cutoff = (datetime.now() - timedelta(days=max(older_than_days, 1))).strftime('%Y%m%d')
+
+    by_day: Dict[str, List[str]] = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if not name.startswith(f"{prefix}_") or not os.path.isfile(path) or not is_snapshot_file(path):
+            continue
+        day = snapshot_day(name)
+        if day and day <= cutoff:
+            by_day.setdefault(day, []).append(path)
+
+    archive_dir = os.path.join(directory, ARCHIVE_DIRNAME)
+    os.makedirs(archive_dir, exist_ok=True)
+
+    moved = {}
+    for day, paths in sorted(by_day.items()):
+        archive_path = os.path.join(archive_dir, f"{prefix}_{day}{FORMAT_EXTENSIONS[fmt]}")
+
+        # 같은 날짜 아카이브가 이미 있으면 합쳐서 다시 저장
+        archive = load(archive_path) if os.path.exists(archive_path) else {"date": day, "members": {}}
+        for path in paths:
+            archive["members"][os.path.basename(path)] = load(path)
+
+        size = dump(archive, archive_path)
+        before = sum(os.path.getsize(path) for path in paths)
+        for path in paths:
+            os.remove(path)
+            moved[path] = f"{archive_path}{ARCHIVE_MEMBER_SEP}{os.path.basename(path)}"
+
+        print(f"[OK] {day}: {len(paths)} files -> {archive_path} ({before:,} -> {size:,} bytes)")
+
+    return moved
+
+
+def main():
+    """압축/아카이브 CLI"""
+    parser = argparse.ArgumentParser(description='Snapshot compaction tool')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    compact_parser = subparsers.add_parser('compact', help='오래된 JSON 스냅샷을 일별 아카이브로 묶기')
+    compact_parser.add_argument('--days', type=int, default=7, help='이 일수보다 오래된 스냅샷만 묶음 (기본: 7)')
+    compact_parser.add_argument('--format', choices=['auto'] + list(FORMAT_EXTENSIONS), default=None,
+                                help='아카이브 형식 (기본: SNAPSHOT_FORMAT, 없으면 json / auto: 사용 가능한 가장 작은 형식)')
+
+    args = parser.parse_args()
+
+    if args.command == 'compact':
+        # 지연 임포트: 수집 스냅샷은 색인도 함께 갱신해야 함
+        from snapshot_store import get_snapshot_store
+
+        base_dir = os.path.dirname(__file__)
+        print(f"[INFO] Compacting snapshots older than {args.days} days ({resolve_format(args.format)})")
+
+        moved = get_snapshot_store().compact(older_than_days=args.days, fmt=args.format)
+        print(f"[OK] data/: {len(moved)} snapshots archived")
+
+        analysis_dir = os.path.join(base_dir, 'analysis')
+        if os.path.isdir(analysis_dir):
+            moved = compact_directory(analysis_dir, 'analysis', older_than_days=args.days, fmt=args.format)
+            print(f"[OK] analysis/: {len(moved)} results archived")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Global Macro Intelligence Hub - Snapshot Store
+수집 결과(data/)를 백그라운드에서 저장하고 종목/시각 색인으로 조회하는 모듈
+
+- 수집 직후 분석은 메모리의 결과를 바로 사용하고, 파일 저장은 작성 스레드가 처리
+- 과거 스냅샷 조회는 data/ 디렉토리 검색 대신 SQLite 색인 (ticker, collected_at) 사용
+- 파일 형식은 snapshot_format 참고 (기본: JSON, SNAPSHOT_FORMAT으로 압축 형식 선택, 일별 아카이브 지원)
+"""
+
+import sqlite3
+import threading
+import atexit
+import queue
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from tracing import span, propagate
+import snapshot_format
+
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(__file__), 'cache', 'snapshot_index.sqlite3')
+
+# data_{종목코드}_{YYYYmmdd_HHMMSS}[_N] (확장자 제외)
+_FILENAME_PATTERN = re.compile(r'^data_(.+)_(\d{8}_\d{6})(?:_\d+)?$')
+
+
+class SnapshotStore:
+    """
+    수집 스냅샷 저장소 (스레드 안전)
+
+    save()는 저장할 경로만 정해 즉시 반환하고, 실제 기록과 색인 등록은
+    작성 스레드가 순서대로 처리합니다. 색인에는 기록이 끝난 파일만 등록됩니다.
+    """
+
+    def __init__(self, data_dir: str = None, index_path: str = None, fmt: str = None):
+        """
+        Args:
+            data_dir: 스냅샷 디렉토리 (기본: data/)
+            index_path: 색인 SQLite 파일 경로 (기본: cache/snapshot_index.sqlite3)
+            fmt: 저장 형식 (기본: snapshot_format.resolve_format())
+        """
+        self.data_dir = data_dir or DEFAULT_DATA_DIR
+        self.index_path = index_path or DEFAULT_INDEX_PATH
+        self.fmt = snapshot_format.resolve_format(fmt)
+        self._lock = threading.Lock()
+        self._reserved = set()
+        self._queue = queue.Queue()
+        self._writer = None
+
+        os.makedirs(self.data_dir, exist_ok=True)
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    path TEXT PRIMARY KEY,
+                    ticker TEXT NOT NULL,
+                    collected_at TEXT NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_snapshots_ticker_time ON snapshots (ticker, collected_at)"
+            )
+            empty = conn.execute("SELECT 1 FROM snapshots LIMIT 1").fetchone() is None
+
+        if empty:
+            # 색인 도입 전에 쌓인 파일은 처음 한 번만 파일명으로 등록
+            self.rebuild_index()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.index_path, timeout=30)
+
+    def _reserve_path(self, ticker: str, output_file: str = None) -> str:
+        """저장 경로 확정 (같은 초에 같은 종목을 수집해도 파일이 겹치지 않도록 번호 추가)"""
+        if output_file is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            output_file = f"data_{ticker.replace('.', '_')}_{timestamp}{snapshot_format.FORMAT_EXTENSIONS[self.fmt]}"
+
+        base, ext = snapshot_format.split_extension(os.path.join(self.data_dir, output_file))
+        path = base + ext
+        with self._lock:
+            n = 1
+            while path in self._reserved or os.path.exists(path):
+                path = f"{base}_{n}{ext}"
+                n += 1
+            self._reserved.add(path)
+        return path
+
+    def save(self, result: Dict[str, Any], output_file: str = None) -> str:
+        """
+        수집 결과 저장 예약 (파일 기록은 백그라운드에서 수행)
+
+        Args:
+            result: DataCollector 수집 결과 (ticker, collected_at 포함)
+            output_file: 저장할 파일명 (None이면 data_{종목코드}_{시각}.{형식}, 형식은 확장자로 결정)
+
+        Returns:
+            저장될 파일 경로
+        """
+        path = self._reserve_path(result['ticker'], output_file)
+
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="snapshot-writer", daemon=True)
+                self._writer.start()
+
+        # 기록 스팬이 호출한 쪽 트레이스에 남도록 컨텍스트와 함께 전달
+        self._queue.put((propagate(self._write), path, result))
+        return path
+
+    def _write_loop(self):
+        while True:
+            write, path, result = self._queue.get()
+            try:
+                write(path, result)
+            except Exception as e:
+                print(f"[ERROR] Snapshot write failed: {path} ({str(e)})")
+            finally:
+                with self._lock:
+                    self._reserved.discard(path)
+                self._queue.task_done()
+
+    def _write(self, path: str, result: Dict[str, Any]):
+        """원자적 기록 후 색인 등록"""
+        with span("file.write", kind=snapshot_format.format_of(path)) as write_span:
+            size = snapshot_format.dump(result, path)
+            write_span.set_attribute("bytes", size)
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots (path, ticker, collected_at, size) VALUES (?, ?, ?, ?)",
+                (path, result['ticker'], result.get('collected_at') or datetime.now().isoformat(), size)
+            )
+
+    def flush(self):
+        """예약된 저장이 모두 끝날 때까지 대기"""
+        self._queue.join()
+
+    def find(
+        self,
+        ticker: str,
+        since: datetime = None,
+        until: datetime = None,
+        limit: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        종목 스냅샷 조회 (최신순)
+
+        Args:
+            ticker: 종목 티커
+            since: 이 시각 이후 수집분만
+            until: 이 시각 이전 수집분만
+            limit: 최대 개수
+
+        Returns:
+            [{"path", "ticker", "collected_at", "size"}, ...]
+        """
+        query = "SELECT path, ticker, collected_at, size FROM snapshots WHERE ticker = ?"
+        params: List[Any] = [ticker]
+        if since is not None:
+            query += " AND collected_at >= ?"
+            params.append(since.isoformat())
+        if until is not None:
+            query += " AND collected_at <= ?"
+            params.append(until.isoformat())
+        query += " ORDER BY collected_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return [
+            {"path": path, "ticker": t, "collected_at": collected_at, "size": size}
+            for path, t, collected_at, size in rows
+            if snapshot_format.exists(path)
+        ]
+
+    def latest(self, ticker: str) -> Optional[str]:
+        """
+        종목의 가장 최근 스냅샷 경로
+
+        Returns:
+            파일 경로 (없으면 None)
+        """
+        rows = self.find(ticker, limit=1)
+        return rows[0]["path"] if rows else None
+
+    def rebuild_index(self) -> int:
+        """
+        data/ 디렉토리와 일별 아카이브의 파일명으로 색인 재구성 (개별 파일 내용은 읽지 않음)
+
+        파일명의 종목코드는 '.'이 '_'로 바뀐 형태이므로 마지막 '_'를 '.'으로 되돌립니다.
+        (005930_KS → 005930.KS)
+
+        Returns:
+            등록한 스냅샷 수
+        """
+        rows = []
+        for name in os.listdir(self.data_dir):
+            path = os.path.join(self.data_dir, name)
+            if os.path.isfile(path) and snapshot_format.is_snapshot_file(path):
+                row = self._index_row(path, name, os.path.getsize(path))
+                if row:
+                    rows.append(row)
+
+        archive_dir = os.path.join(self.data_dir, snapshot_format.ARCHIVE_DIRNAME)
+        if os.path.isdir(archive_dir):
+            for name in os.listdir(archive_dir):
+                archive_path = os.path.join(archive_dir, name)
+                if not snapshot_format.is_snapshot_file(archive_path):
+                    continue
+                for member in snapshot_format.load(archive_path)["members"]:
+                    row = self._index_row(f"{archive_path}{snapshot_format.ARCHIVE_MEMBER_SEP}{member}", member, 0)
+                    if row:
+                        rows.append(row)
+
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM snapshots")
+            conn.executemany(
+                "INSERT OR REPLACE INTO snapshots (path, ticker, collected_at, size) VALUES (?, ?, ?, ?)", rows
+            )
+
+        return len(rows)
+
+    @staticmethod
+    def _index_row(path: str, name: str, size: int) -> Optional[tuple]:
+        base, _ = snapshot_format.split_extension(name)
+        match = _FILENAME_PATTERN.match(base)
+        if not match:
+            return None
+        code, timestamp = match.groups()
+        head, sep, tail = code.rpartition('_')
+        ticker = f"{head}.{tail}" if sep else code
+        collected_at = datetime.strptime(timestamp, '%Y%m%d_%H%M%S').isoformat()
+        return (path, ticker, collected_at, size)
+
+    def compact(self, older_than_days: int = 7, fmt: str = None) -> Dict[str, str]:
+        """
+        오래된 스냅샷을 일별 아카이브로 묶고 색인 경로 갱신
+
+        Args:
+            older_than_days: 이 일수보다 오래된 날짜의 스냅샷만 묶음
+            fmt: 아카이브 형식 (기본: 저장소 형식)
+
+        Returns:
+            {원래 경로: 아카이브 멤버 경로}
+        """
+        self.flush()
+        moved = snapshot_format.compact_directory(self.data_dir, 'data', older_than_days, fmt or self.fmt)
+
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "UPDATE snapshots SET path = ? WHERE path = ?",
+                [(new_path, old_path) for old_path, new_path in moved.items()]
+            )
+
+        return moved
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """프로세스 공용 SnapshotStore 반환 (종료 시 남은 저장을 마저 기록)"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = SnapshotStore()
+            atexit.register(_flush_default_store)
+        return _default_store
+
+
+def _flush_default_store():
+    if _default_store is not None:
+        _default_store.flush()
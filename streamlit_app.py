@@ -9,12 +9,12 @@ import plotly.express as px
 from datetime import datetime
 import json
 import os
-import glob
 from pathlib import Path
 
 from data_collector import DataCollector
 from main import IntelligenceHub
 from market_watch import MarketWatch
+from tracing import span, get_tracer
 
 # 페이지 설정
 st.set_page_config(
@@ -802,6 +802,16 @@ def main():
 
         st.markdown("---")
 
+        # LLM 응답 캐시 (같은 데이터로 다시 분석하면 저장된 응답 재사용)
+        st.checkbox(
+            "[CACHE] 동일 데이터 분석 결과 재사용",
+            value=True,
+            key="use_llm_cache",
+            help="해제하면 같은 프롬프트의 캐시된 분석이 있어도 AI를 다시 호출합니다."
+        )
+
+        st.markdown("---")
+
         # 최근 분석 목록
         st.markdown("### [HISTORY] 최근 분석 종목")
 
@@ -823,6 +833,27 @@ def main():
 
         st.markdown("---")
 
+        # 최근 실행 트레이스
+        if st.session_state.get('last_trace_id'):
+            trace_rows = get_tracer().summary(st.session_state.last_trace_id)
+            if trace_rows:
+                st.markdown("### [TRACE] 최근 실행 소요 시간")
+                st.dataframe(
+                    [
+                        {
+                            "span": row['name'],
+                            "count": row['count'],
+                            "total_ms": round(row['total_ms'], 1),
+                            "max_ms": round(row['max_ms'], 1),
+                            "errors": row['errors'],
+                        }
+                        for row in trace_rows
+                    ],
+                    hide_index=True,
+                    use_container_width=True
+                )
+                st.markdown("---")
+
         # 사용 가이드
         st.markdown("### [GUIDE] 사용 가이드")
         st.markdown("""
@@ -859,10 +890,10 @@ def main():
 
     with col_refresh:
         if st.button("[REFRESH] 시장 분석 새로고침", use_container_width=True):
-            with st.spinner("시장 분석 중... 약 30초 소요됩니다..."):
+            with st.spinner("시장 분석 중... (종목 동시 조회)"):
                 try:
                     watch = MarketWatch()
-                    watchlist = watch.get_watchlist(limit=5)
+                    watchlist = watch.get_watchlist(limit=5, concurrent=True, max_workers=8, use_cube=True)
                     st.session_state.market_watch_data = watchlist
                     st.session_state.market_watch_time = datetime.now()
                     st.success("[OK] 분석 완료!")
@@ -1040,28 +1071,33 @@ def main():
                 status_text = st.empty()
 
                 try:
-                    # 1. 데이터 수집
-                    status_text.text("1/3 데이터 수집 중...")
-                    progress_bar.progress(33)
+                    with span("app.analyze", ticker=ticker) as root:
+                        st.session_state.last_trace_id = root.trace_id
 
-                    collector = DataCollector()
-                    data_result = collector.collect_all_data(ticker)
+                        # 1. 데이터 수집
+                        status_text.text("1/3 데이터 수집 중...")
+                        progress_bar.progress(33)
 
-                    company_name = data_result['stock_data'].get('company_name', ticker)
+                        collector = DataCollector()
+                        data_result, data_file = collector.collect_snapshot(ticker)
 
-                    # 2. 분석
-                    status_text.text("2/3 비판적 분석 중...")
-                    progress_bar.progress(66)
+                        company_name = data_result['stock_data'].get('company_name', ticker)
 
-                    hub = IntelligenceHub()
+                        # 2. 분석
+                        status_text.text("2/3 비판적 분석 중...")
+                        progress_bar.progress(66)
 
-                    # 최신 데이터 파일 찾기
-                    data_dir = os.path.join(os.path.dirname(__file__), 'data')
-                    json_files = glob.glob(os.path.join(data_dir, f"data_{ticker.replace('.', '_')}*.json"))
+                        hub = IntelligenceHub()
 
-                    if json_files:
-                        latest_file = max(json_files, key=os.path.getmtime)
-                        analysis_result = hub.analyze_with_reliability(latest_file)
+                        # 수집 결과를 메모리에서 바로 분석 (분석 텍스트를 생성되는 대로 표시)
+                        with span("analyze", ticker=ticker):
+                            analysis_stream = hub.stream_analysis(
+                                data_result,
+                                use_cache=st.session_state.get('use_llm_cache', True),
+                                source_file=data_file
+                            )
+                            st.write_stream(analysis_stream)
+                            analysis_result = analysis_stream.result
 
                         # 3. 보고서 저장
                         status_text.text("3/3 보고서 생성 중...")
@@ -1083,7 +1119,8 @@ def main():
                             'company_name': company_name
                         }
 
-                        st.rerun()
+                    # 트레이스 스팬을 닫은 뒤 화면 갱신
+                    st.rerun()
 
                 except Exception as e:
                     status_text.error(f"[ERROR] 오류 발생: {str(e)}")
@@ -0,0 +1,259 @@
+"""
+Global Macro Intelligence Hub - Tracing
+수집 → 분석 → 보고서 단계별 소요 시간을 기록하는 경량 트레이싱 모듈
+
+사용 예:
+    with span("collect.news", ticker=ticker) as s:
+        ...
+        s.set_attribute("bytes", len(content))
+
+- 스팬은 contextvars로 부모/자식 관계를 추적 (스레드 풀 작업은 propagate()로 감싸 전달)
+- 완료된 스팬은 메모리에 보관하며 JSON Lines로 내보내기 가능
+- 환경변수 TRACE_EXPORT_PATH가 있으면 완료된 스팬을 해당 파일에 바로 추가 기록
+"""
+
+import contextvars
+import threading
+import json
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Iterator, Optional
+
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    """추적 구간 하나 (이름, 부모, 시작/종료 시각, 속성)"""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'start_time', 'end_time',
+                 '_start_perf', 'duration_ms', 'attributes', 'status', 'error')
+
+    def __init__(self, name: str, parent: 'Span' = None, attributes: Dict[str, Any] = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.start_time = time.time()
+        self.end_time = None
+        self._start_perf = time.perf_counter()
+        self.duration_ms = None
+        self.attributes = dict(attributes or {})
+        self.status = 'ok'
+        self.error = None
+
+    def set_attribute(self, key: str, value: Any):
+        """속성 추가 (ticker, bytes, tokens 등)"""
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any):
+        """여러 속성 추가"""
+        self.attributes.update(attributes)
+
+    def finish(self, error: BaseException = None):
+        """구간 종료"""
+        self.end_time = time.time()
+        self.duration_ms = (time.perf_counter() - self._start_perf) * 1000
+        if error is not None:
+            self.status = 'error'
+            self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class Tracer:
+    """
+    스팬 수집기 (스레드 안전)
+
+    완료된 스팬은 최근 max_spans개까지만 메모리에 보관합니다.
+    """
+
+    def __init__(self, max_spans: int = 10000, export_path: str = None):
+        """
+        Args:
+            max_spans: 메모리에 보관할 완료 스팬 수
+            export_path: 완료된 스팬을 즉시 추가 기록할 JSONL 파일 (기본: 환경변수 TRACE_EXPORT_PATH)
+        """
+        self.export_path = export_path or os.getenv('TRACE_EXPORT_PATH')
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """
+        추적 구간 컨텍스트 매니저 (예외는 기록 후 그대로 전달)
+
+        Args:
+            name: 구간 이름 (예: 'collect.price', 'llm.generate')
+            **attributes: 초기 속성
+
+        Returns:
+            Span (with 블록 안에서 set_attribute 가능)
+        """
+        current = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.finish(e)
+            raise
+        else:
+            current.finish()
+        finally:
+            _current_span.reset(token)
+            self._record(current)
+
+    def start_span(self, name: str, **attributes: Any) -> Span:
+        """
+        현재 컨텍스트를 바꾸지 않는 구간 시작 (제너레이터처럼 여러 번 나눠 실행되는 작업용)
+
+        Args:
+            name: 구간 이름
+            **attributes: 초기 속성
+
+        Returns:
+            Span (끝나면 end_span으로 종료)
+        """
+        return Span(name, _current_span.get(), attributes)
+
+    def end_span(self, started: Span, error: BaseException = None):
+        """start_span으로 시작한 구간 종료"""
+        started.finish(error)
+        self._record(started)
+
+    def _record(self, finished: Span):
+        with self._lock:
+            self._spans.append(finished)
+            if self.export_path:
+                self._append_jsonl(self.export_path, [finished])
+
+    @staticmethod
+    def _append_jsonl(path: str, spans: List[Span]):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            for s in spans:
+                f.write(json.dumps(s.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+    def get_spans(self, trace_id: str = None) -> List[Span]:
+        """완료된 스팬 목록 (trace_id 지정 시 해당 트레이스만, 시작 순)"""
+        with self._lock:
+            spans = list(self._spans)
+        if trace_id:
+            spans = [s for s in spans if s.trace_id == trace_id]
+        return sorted(spans, key=lambda s: s.start_time)
+
+    def export_jsonl(self, path: str, trace_id: str = None) -> int:
+        """
+        완료된 스팬을 JSON Lines 파일에 추가 기록
+
+        Args:
+            path: 출력 파일 경로
+            trace_id: 특정 트레이스만 내보낼 때 지정
+
+        Returns:
+            기록한 스팬 수
+        """
+        spans = self.get_spans(trace_id)
+        self._append_jsonl(path, spans)
+        return len(spans)
+
+    def summary(self, trace_id: str = None) -> List[Dict[str, Any]]:
+        """
+        구간 이름별 집계 (총 소요 시간 내림차순)
+
+        Args:
+            trace_id: 특정 트레이스만 집계할 때 지정
+
+        Returns:
+            [{"name", "count", "errors", "total_ms", "avg_ms", "max_ms"}, ...]
+        """
+        rows = {}
+        for s in self.get_spans(trace_id):
+            row = rows.setdefault(s.name, {"name": s.name, "count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+            row["count"] += 1
+            row["errors"] += s.status == 'error'
+            row["total_ms"] += s.duration_ms
+            row["max_ms"] = max(row["max_ms"], s.duration_ms)
+
+        result = sorted(rows.values(), key=lambda r: r["total_ms"], reverse=True)
+        for row in result:
+            row["avg_ms"] = row["total_ms"] / row["count"]
+        return result
+
+    def format_summary(self, trace_id: str = None) -> str:
+        """CLI 출력용 집계 표"""
+        rows = self.summary(trace_id)
+        if not rows:
+            return "(no spans recorded)"
+
+        width = max(len("span"), max(len(r["name"]) for r in rows))
+        lines = [
+            f"{'span':<{width}}  {'count':>5}  {'total ms':>10}  {'avg ms':>9}  {'max ms':>9}  {'err':>3}",
+            "-" * (width + 48),
+        ]
+        for r in rows:
+            lines.append(
+                f"{r['name']:<{width}}  {r['count']:>5}  {r['total_ms']:>10.1f}  "
+                f"{r['avg_ms']:>9.1f}  {r['max_ms']:>9.1f}  {r['errors']:>3}"
+            )
+        return "\n".join(lines)
+
+    def clear(self):
+        """보관 중인 스팬 삭제"""
+        with self._lock:
+            self._spans.clear()
+
+
+def current_span() -> Optional[Span]:
+    """현재 컨텍스트의 스팬 (없으면 None)"""
+    return _current_span.get()
+
+
+def propagate(func: Callable) -> Callable:
+    """
+    현재 스팬 컨텍스트를 스레드 풀 작업으로 전달하는 래퍼
+
+    executor.submit(propagate(func), *args) 형태로 사용하면
+    작업 안에서 만든 스팬이 제출한 쪽 스팬의 자식이 됩니다.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> Any:
+        return context.copy().run(func, *args, **kwargs)
+
+    return run
+
+
+_default_tracer = None
+_default_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """프로세스 공용 Tracer 반환"""
+    global _default_tracer
+    with _default_tracer_lock:
+        if _default_tracer is None:
+            _default_tracer = Tracer()
+        return _default_tracer
+
+
+def span(name: str, **attributes: Any):
+    """공용 Tracer의 추적 구간 (get_tracer().span 축약)"""
+    return get_tracer().span(name, **attributes)